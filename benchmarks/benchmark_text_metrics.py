@@ -0,0 +1,118 @@
+"""
+Benchmark get_text_statistics against the separate textstat calls it replaces.
+
+Usage:
+    python benchmarks/benchmark_text_metrics.py [text_file] [--repeat N]
+
+Both implementations run over the paragraphs of the text file. textstat's
+per-text caches and the word syllable cache of get_text_statistics are cleared
+before each timed run, so that every paragraph is computed from scratch, as it
+is at the start of an extraction run. The memoized times, with all caches
+filled by an earlier pass, are reported separately. The script also reports
+how many paragraphs produce different statistics.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import textstat
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from writing_feature_extractor.utils.text_metrics import (  # noqa: E402
+    calculate_dialogue_percentage,
+    combine_short_strings,
+    get_text_statistics,
+)
+from writing_feature_extractor.utils.syllables import (  # noqa: E402
+    count_word_syllables,
+)
+
+
+def get_text_statistics_textstat(text: str) -> dict[str]:
+    """The previous implementation: one textstat call per statistic."""
+    try:
+        text_statistics = dict()
+        text_statistics["dialogue_percentage"] = calculate_dialogue_percentage(text)
+        text_statistics["readability_ease"] = textstat.flesch_reading_ease(text)
+        text_statistics["readability_grade"] = textstat.flesch_kincaid_grade(text)
+        text_statistics["sentence_count"] = textstat.sentence_count(text)
+        text_statistics["word_count"] = textstat.lexicon_count(text, removepunct=True)
+        text_statistics["syllable_count"] = textstat.syllable_count(text)
+        text_statistics["average_words_per_sentence"] = (
+            text_statistics["word_count"] / text_statistics["sentence_count"]
+        )
+        text_statistics["average_syllables_per_word"] = (
+            text_statistics["syllable_count"] / text_statistics["word_count"]
+        )
+        return text_statistics
+    except Exception:
+        return dict()
+
+
+def clear_caches() -> None:
+    """Clear the caches of both implementations."""
+    textstat.textstat._cache_clear()
+    count_word_syllables.cache_clear()
+
+
+def time_run(
+    function, paragraphs: list[str], repeat: int, memoized: bool = False
+) -> float:
+    """
+    Return the best time of `repeat` runs of the function over all paragraphs.
+
+    The caches are cleared before each run, unless `memoized` is True, in which
+    case they are filled by an untimed run first and kept.
+    """
+    clear_caches()
+    if memoized:
+        for paragraph in paragraphs:
+            function(paragraph)
+    best = float("inf")
+    for _ in range(repeat):
+        if not memoized:
+            clear_caches()
+        start = time.perf_counter()
+        for paragraph in paragraphs:
+            function(paragraph)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("file", nargs="?", default="Death_Drive_73.txt")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with open(args.file) as f:
+        paragraphs = combine_short_strings(f.read().split("\n"))
+
+    mismatches = sum(
+        get_text_statistics(p) != get_text_statistics_textstat(p) for p in paragraphs
+    )
+    fused = time_run(get_text_statistics, paragraphs, args.repeat)
+    separate = time_run(get_text_statistics_textstat, paragraphs, args.repeat)
+    fused_memoized = time_run(
+        get_text_statistics, paragraphs, args.repeat, memoized=True
+    )
+    separate_memoized = time_run(
+        get_text_statistics_textstat, paragraphs, args.repeat, memoized=True
+    )
+
+    print(f"Paragraphs:            {len(paragraphs)}")
+    print(f"Mismatching results:   {mismatches}")
+    print(f"textstat calls:        {separate * 1000:.1f} ms")
+    print(f"get_text_statistics:   {fused * 1000:.1f} ms")
+    print(f"Speedup:               {separate / fused:.2f}x")
+    print("Memoized:")
+    print(f"textstat calls:        {separate_memoized * 1000:.1f} ms")
+    print(f"get_text_statistics:   {fused_memoized * 1000:.1f} ms")
+    print(f"Speedup:               {separate_memoized / fused_memoized:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,19 @@
+import os
 from argparse import Namespace
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterator
+
 from dotenv import load_dotenv
 
 from writing_feature_extractor.cli import parse_arguments
 from writing_feature_extractor.core.custom_exceptions import FeatureExtractorError
-from writing_feature_extractor.core.feature_config import load_feature_config
-from writing_feature_extractor.core.feature_extraction import extract_features
-from writing_feature_extractor.core.model_factory import ModelFactory
-from writing_feature_extractor.features.writing_feature_factory import (
-    WritingFeatureFactory,
-)
-from writing_feature_extractor.utils.generate_graph_from_csv import (
-    generate_graph_from_csv,
-)
 from writing_feature_extractor.utils.logger_config import get_logger
-from writing_feature_extractor.utils.save_results_to_csv import save_results_to_csv
-from writing_feature_extractor.utils.text_processing import (
-    load_text,
-    split_into_sections,
-)
+
+# The extraction and graph modules pull in langchain, pandas and matplotlib, so
+# each handler imports only what it uses, and --help or --graph start quickly.
+if TYPE_CHECKING:
+    from writing_feature_extractor.core.checkpoint import CheckpointJournal
+    from writing_feature_extractor.core.result_cache import ResultCache
 
 logger = get_logger(__name__)
 
@@ -42,25 +38,117 @@ def main() -> None:
 
 def handle_feature_extraction(args: Namespace) -> None:
     """Handle feature extraction from the input text."""
+    from writing_feature_extractor.utils.syllables import load_syllable_table
+
+    if args.syllable_table:
+        load_syllable_table(args.syllable_table)
+
+    if args.metrics_only:
+        return handle_metrics_only(args)
+
+    from writing_feature_extractor.core.prompt_cache import log_prompt_cache_stats
+
+    handle_llm_extraction(args)
+    log_prompt_cache_stats()
+
+
+def handle_llm_extraction(args: Namespace) -> None:
+    """Handle feature extraction with the LLM, in the mode given by the arguments."""
+    from writing_feature_extractor.core.batch_api import get_batch_client
+    from writing_feature_extractor.core.feature_config import load_feature_config
+    from writing_feature_extractor.core.feature_extraction import (
+        DEFAULT_PACKING_TOKEN_BUDGET,
+        extract_features,
+        extract_features_batch,
+    )
+    from writing_feature_extractor.core.model_factory import ModelFactory
+    from writing_feature_extractor.core.packing import create_packed_model
+    from writing_feature_extractor.core.rate_limiter import configure_rate_limit
+    from writing_feature_extractor.features.writing_feature_factory import (
+        WritingFeatureFactory,
+    )
+    from writing_feature_extractor.utils.save_results_to_csv import (
+        save_results_to_csv,
+    )
+    from writing_feature_extractor.utils.text_processing import (
+        load_text,
+        split_into_sections,
+    )
+
+    if args.requests_per_minute or args.tokens_per_minute:
+        configure_rate_limit(
+            args.provider,
+            args.model,
+            args.requests_per_minute,
+            args.tokens_per_minute,
+        )
 
-    text = load_text(args.file)
     features = load_feature_config(args.config)
 
     feature_collectors, DynamicFeatureModel = WritingFeatureFactory.get_dynamic_model(
         features
     )
 
-    llm = ModelFactory.get_llm_model(args.provider, args.model, DynamicFeatureModel)
-    logger.info(f"Obtained LLM model: {llm}")
-
-    # llm_2 = ModelFactory.get_llm_model(AvailableModels.GPT_3_5, DynamicFeatureModel)
+    if args.corpus:
+        return handle_corpus_extraction(args, feature_collectors, DynamicFeatureModel)
 
-    # llm_3 = ModelFactory.get_llm_model(
-    #     AvailableModels.MIXTRAL_8_22_INSTRUCT, DynamicFeatureModel
-    # )
+    if args.stream and not args.batch:
+        return handle_streaming_extraction(
+            args, feature_collectors, DynamicFeatureModel
+        )
 
+    text = load_text(args.file)
     sections = split_into_sections(text)
-    result = extract_features(sections, args.mode, feature_collectors, llm, [])
+
+    if args.batch:
+        batch_client = get_batch_client(args.provider, args.model)
+        result = extract_features_batch(
+            sections,
+            args.mode,
+            feature_collectors,
+            batch_client,
+            DynamicFeatureModel,
+            args.batch_poll_interval,
+        )
+    else:
+        with open_result_cache(args) as cache, open_checkpoint(args) as checkpoint:
+            llm = ModelFactory.get_llm_model(
+                args.provider,
+                args.model,
+                DynamicFeatureModel,
+                cache,
+                feature_collectors,
+            )
+            logger.info(f"Obtained LLM model: {llm}")
+
+            packed_llm = None
+            if args.pack_tokens:
+                packed_llm = ModelFactory.get_llm_model(
+                    args.provider,
+                    args.model,
+                    create_packed_model(DynamicFeatureModel),
+                )
+
+            # llm_2 = ModelFactory.get_llm_model(AvailableModels.GPT_3_5, DynamicFeatureModel)
+
+            # llm_3 = ModelFactory.get_llm_model(
+            #     AvailableModels.MIXTRAL_8_22_INSTRUCT, DynamicFeatureModel
+            # )
+
+            result = extract_features(
+                sections,
+                args.mode,
+                feature_collectors,
+                llm,
+                [],
+                concurrency=args.concurrency,
+                packed_llm=packed_llm,
+                packing_token_budget=args.pack_tokens or DEFAULT_PACKING_TOKEN_BUDGET,
+                checkpoint=checkpoint,
+                interactive=args.interactive,
+                flush_interval=args.flush_interval,
+            )
+            checkpoint.write_dead_letters(args.dead_letter_file)
 
     if result:
         feature_collectors, text_units, text_metrics = result
@@ -70,6 +158,116 @@ def handle_feature_extraction(args: Namespace) -> None:
             )
 
 
+def handle_streaming_extraction(
+    args: Namespace, feature_collectors: list, DynamicFeatureModel: type
+) -> None:
+    """Stream the input file through feature extraction, writing rows to the CSV file."""
+    from writing_feature_extractor.core.feature_extraction import (
+        stream_extract_features,
+    )
+    from writing_feature_extractor.core.model_factory import ModelFactory
+    from writing_feature_extractor.utils.save_results_to_csv import (
+        IncrementalCSVWriter,
+    )
+    from writing_feature_extractor.utils.text_processing import iter_sections
+
+    with open_result_cache(args) as cache, open_checkpoint(args) as checkpoint:
+        llm = ModelFactory.get_llm_model(
+            args.provider, args.model, DynamicFeatureModel, cache, feature_collectors
+        )
+        logger.info(f"Obtained LLM model: {llm}")
+
+        with IncrementalCSVWriter(
+            feature_collectors, args.csv_file, args.flush_interval
+        ) as writer:
+            processed = stream_extract_features(
+                iter_sections(args.file),
+                args.mode,
+                feature_collectors,
+                llm,
+                writer,
+                [],
+                concurrency=args.concurrency,
+                checkpoint=checkpoint,
+            )
+        checkpoint.write_dead_letters(args.dead_letter_file)
+    logger.info(f"Streamed {processed} text units to {args.csv_file}")
+
+
+def handle_corpus_extraction(
+    args: Namespace, feature_collectors: list, DynamicFeatureModel: type
+) -> None:
+    """Extract features from all books of a corpus, with one CSV file per book."""
+    from writing_feature_extractor.core.corpus import extract_corpus_features
+    from writing_feature_extractor.core.model_factory import ModelFactory
+    from writing_feature_extractor.utils.text_processing import find_text_files
+
+    file_paths = find_text_files(args.file)
+    logger.info(f"Found {len(file_paths)} books in {args.file}")
+
+    with open_result_cache(args) as cache:
+        llm = ModelFactory.get_llm_model(
+            args.provider, args.model, DynamicFeatureModel, cache, feature_collectors
+        )
+        logger.info(f"Obtained LLM model: {llm}")
+
+        extract_corpus_features(
+            file_paths,
+            args.output_dir,
+            args.mode,
+            feature_collectors,
+            llm,
+            [],
+            concurrency=args.concurrency,
+            max_active_books=args.max_active_books,
+            resume=args.resume,
+            retry_failed=args.retry_failed,
+        )
+
+
+def handle_metrics_only(args: Namespace) -> None:
+    """Compute the text metrics of a file, a directory or a glob, without any LLM."""
+    from writing_feature_extractor.core.metrics_only import extract_metrics_only
+    from writing_feature_extractor.utils.text_processing import (
+        find_text_files,
+        get_output_csv_file,
+    )
+
+    if not os.path.isfile(args.file):
+        file_paths = find_text_files(args.file)
+        os.makedirs(args.output_dir, exist_ok=True)
+        csv_files = [
+            get_output_csv_file(file_path, args.output_dir) for file_path in file_paths
+        ]
+    else:
+        file_paths = [args.file]
+        csv_files = [args.csv_file]
+
+    extract_metrics_only(file_paths, args.mode, csv_files, args.workers)
+
+
+def open_checkpoint(args: Namespace) -> "CheckpointJournal":
+    """Open the checkpoint journal of a run. --retry-failed implies --resume."""
+    from writing_feature_extractor.core.checkpoint import CheckpointJournal
+
+    return CheckpointJournal(args.checkpoint_file, args.resume, args.retry_failed)
+
+
+@contextmanager
+def open_result_cache(args: Namespace) -> Iterator["ResultCache | None"]:
+    """
+    Open the on-disk LLM result cache, unless it is disabled, and close it when
+    the run ends, so the access times of the last cache hits are written.
+    """
+    from writing_feature_extractor.core.result_cache import ResultCache
+
+    if args.no_cache:
+        yield None
+        return
+    with ResultCache(args.cache_dir, args.cache_size_mb * 1024 * 1024) as cache:
+        yield cache
+
+
 def handle_graph_generation(args: Namespace) -> None:
     """Handle graph generation from a saved CSV file."""
 
@@ -78,6 +276,11 @@ def handle_graph_generation(args: Namespace) -> None:
             "Please specify --bar-feature and --color-feature when using --graph"
         )
         return
+
+    from writing_feature_extractor.utils.generate_graph_from_csv import (
+        generate_graph_from_csv,
+    )
+
     generate_graph_from_csv(args.csv_file, args.bar_feature, args.color_feature)
 
 
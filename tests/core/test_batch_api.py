@@ -0,0 +1,225 @@
+import json
+import threading
+from enum import Enum
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from langchain_core.pydantic_v1 import BaseModel, Field
+
+from writing_feature_extractor.core.batch_api import (
+    AnthropicBatchClient,
+    OpenAIBatchClient,
+    get_batch_client,
+    run_batch,
+)
+from writing_feature_extractor.core.custom_exceptions import ModelError
+
+
+class MockEnum(str, Enum):
+    LOW = "low"
+    HIGH = "high"
+
+
+class MockModel(BaseModel):
+    """Mock feature model"""
+
+    mock_feature: MockEnum = Field(description="A mock feature for testing")
+
+
+def answer_for(prompt):
+    """The fake provider answers "high" for passages mentioning storms."""
+    if "fail" in prompt:
+        return None
+    return {"mock_feature": "high" if "storm" in prompt else "low"}
+
+
+class FakeBatchHandler(BaseHTTPRequestHandler):
+    """Minimal fake of the OpenAI and Anthropic batch endpoints."""
+
+    polls_before_done = 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, payload, content_type="application/json"):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self):
+        return self.rfile.read(int(self.headers["Content-Length"]))
+
+    def do_POST(self):
+        state = self.server.state
+        if self.path == "/v1/files":
+            body = self._read_body().decode()
+            content = body.split("\r\n\r\n", 2)[2].rsplit("\r\n--", 1)[0]
+            state["files"]["file-1"] = [json.loads(l) for l in content.splitlines()]
+            self._send({"id": "file-1"})
+        elif self.path == "/v1/batches":
+            request = json.loads(self._read_body())
+            state["openai_input"] = state["files"][request["input_file_id"]]
+            state["polls"] = 0
+            self._send({"id": "batch-1", "status": "validating"})
+        elif self.path == "/v1/messages/batches":
+            assert self.headers["anthropic-version"]
+            state["anthropic_input"] = json.loads(self._read_body())["requests"]
+            state["polls"] = 0
+            self._send({"id": "msgbatch-1", "processing_status": "in_progress"})
+        else:
+            self.send_error(404)
+
+    def do_GET(self):
+        state = self.server.state
+        host = f"http://{self.server.server_address[0]}:{self.server.server_address[1]}"
+        if self.path == "/v1/batches/batch-1":
+            state["polls"] += 1
+            done = state["polls"] > self.polls_before_done
+            self._send(
+                {
+                    "id": "batch-1",
+                    "status": "completed" if done else "in_progress",
+                    "output_file_id": "file-out" if done else None,
+                }
+            )
+        elif self.path == "/v1/files/file-out/content":
+            lines = []
+            for request in state["openai_input"]:
+                answer = answer_for(request["body"]["messages"][0]["content"])
+                if answer is None:
+                    lines.append(
+                        {
+                            "custom_id": request["custom_id"],
+                            "response": None,
+                            "error": {"message": "failed"},
+                        }
+                    )
+                    continue
+                message = {
+                    "tool_calls": [
+                        {
+                            "function": {
+                                "name": request["body"]["tools"][0]["function"]["name"],
+                                "arguments": json.dumps(answer),
+                            }
+                        }
+                    ]
+                }
+                lines.append(
+                    {
+                        "custom_id": request["custom_id"],
+                        "response": {
+                            "status_code": 200,
+                            "body": {"choices": [{"message": message}]},
+                        },
+                        "error": None,
+                    }
+                )
+            self._send("\n".join(json.dumps(l) for l in lines).encode())
+        elif self.path == "/v1/messages/batches/msgbatch-1":
+            state["polls"] += 1
+            done = state["polls"] > self.polls_before_done
+            self._send(
+                {
+                    "id": "msgbatch-1",
+                    "processing_status": "ended" if done else "in_progress",
+                    "results_url": (
+                        f"{host}/v1/messages/batches/msgbatch-1/results"
+                        if done
+                        else None
+                    ),
+                }
+            )
+        elif self.path == "/v1/messages/batches/msgbatch-1/results":
+            lines = []
+            for request in state["anthropic_input"]:
+                answer = answer_for(request["params"]["messages"][0]["content"])
+                if answer is None:
+                    result = {"type": "errored", "error": {"type": "api_error"}}
+                else:
+                    result = {
+                        "type": "succeeded",
+                        "message": {"content": [{"type": "tool_use", "input": answer}]},
+                    }
+                lines.append({"custom_id": request["custom_id"], "result": result})
+            self._send("\n".join(json.dumps(l) for l in lines).encode())
+        else:
+            self.send_error(404)
+
+
+@pytest.fixture
+def fake_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeBatchHandler)
+    server.state = {"files": {}}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def base_url(server):
+    return f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+TEXT_UNITS = ["A storm was coming.", "The cat slept.", "fail", "Another storm."]
+
+
+@pytest.mark.parametrize("client_class", [OpenAIBatchClient, AnthropicBatchClient])
+def test_run_batch_maps_results_back_in_order(fake_server, client_class):
+    client = client_class("test-model", api_key="key", base_url=base_url(fake_server))
+
+    results = run_batch(client, TEXT_UNITS, MockModel, poll_interval=0)
+
+    assert [r.mock_feature if r else None for r in results] == [
+        MockEnum.HIGH,
+        MockEnum.LOW,
+        None,
+        MockEnum.HIGH,
+    ]
+    assert fake_server.state["polls"] == 3
+
+
+def test_openai_requests_use_structured_output_tool(fake_server):
+    client = OpenAIBatchClient(
+        "test-model", api_key="key", base_url=base_url(fake_server)
+    )
+
+    run_batch(client, TEXT_UNITS[:1], MockModel, poll_interval=0)
+
+    body = fake_server.state["openai_input"][0]["body"]
+    assert body["model"] == "test-model"
+    assert body["tools"][0]["function"]["name"] == "MockModel"
+    assert body["tool_choice"]["function"]["name"] == "MockModel"
+    assert "A storm was coming." in body["messages"][0]["content"]
+
+
+def test_anthropic_requests_use_structured_output_tool(fake_server):
+    client = AnthropicBatchClient(
+        "test-model", api_key="key", base_url=base_url(fake_server)
+    )
+
+    run_batch(client, TEXT_UNITS[:1], MockModel, poll_interval=0)
+
+    params = fake_server.state["anthropic_input"][0]["params"]
+    assert params["tools"][0]["name"] == "MockModel"
+    assert "mock_feature" in params["tools"][0]["input_schema"]["properties"]
+    assert params["tool_choice"] == {"type": "tool", "name": "MockModel"}
+
+
+def test_unreachable_server_raises_model_error():
+    client = OpenAIBatchClient(
+        "test-model", api_key="key", base_url="http://127.0.0.1:9/v1"
+    )
+
+    with pytest.raises(ModelError):
+        run_batch(client, TEXT_UNITS, MockModel, poll_interval=0)
+
+
+def test_get_batch_client_unsupported_provider():
+    assert isinstance(get_batch_client("anthropic", "model"), AnthropicBatchClient)
+    with pytest.raises(ValueError):
+        get_batch_client("groq", "model")
@@ -0,0 +1,148 @@
+import asyncio
+import json
+
+import pytest
+
+from writing_feature_extractor.core.checkpoint import FAILED_VALUE, CheckpointJournal
+from writing_feature_extractor.core.custom_exceptions import FileOperationError
+
+
+def test_records_are_available_after_resume(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+
+    with CheckpointJournal(path) as checkpoint:
+        checkpoint.record(0, "First unit", {"mood": "happy", "pace": "fast"})
+        checkpoint.record(1, "Second unit", {"mood": "sad", "pace": "slow"})
+
+    with CheckpointJournal(path, resume=True) as checkpoint:
+        assert len(checkpoint) == 2
+        assert checkpoint.get(1, "Second unit", ["pace", "mood"]) == ["slow", "sad"]
+        # Changed content, missing unit or missing feature
+        assert checkpoint.get(1, "Edited unit", ["mood"]) is None
+        assert checkpoint.get(2, "Third unit", ["mood"]) is None
+        assert checkpoint.get(0, "First unit", ["mood", "suspense"]) is None
+
+
+def test_journal_is_discarded_without_resume(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    with CheckpointJournal(path) as checkpoint:
+        checkpoint.record(0, "First unit", {"mood": "happy"})
+
+    with CheckpointJournal(path) as checkpoint:
+        assert checkpoint.get(0, "First unit", ["mood"]) is None
+
+    with CheckpointJournal(path, resume=True) as checkpoint:
+        assert len(checkpoint) == 0
+
+
+def test_resume_ignores_truncated_record(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    record = {"index": 0, "sha256": CheckpointJournal.hash_text("A"), "values": {}}
+    path.write_text(json.dumps(record) + '\n{"index": 1, "sha2')
+
+    with CheckpointJournal(str(path), resume=True) as checkpoint:
+        assert len(checkpoint) == 1
+        checkpoint.record(1, "B", {"mood": "sad"})
+
+    with CheckpointJournal(str(path), resume=True) as checkpoint:
+        assert checkpoint.get(0, "A", []) == []
+        assert checkpoint.get(1, "B", ["mood"]) == ["sad"]
+
+
+def test_open_error(tmp_path):
+    with pytest.raises(FileOperationError):
+        CheckpointJournal(str(tmp_path / "missing" / "journal.jsonl"))
+
+
+def test_failed_units_keep_failed_values_unless_retried(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    with CheckpointJournal(path) as checkpoint:
+        checkpoint.record(0, "A", {"mood": "sad"})
+        checkpoint.record_failure(1, "B")
+        checkpoint.record_failure(2, "C")
+        # A later success replaces the failure
+        checkpoint.record(2, "C", {"mood": "happy"})
+
+    with CheckpointJournal(path, resume=True) as checkpoint:
+        assert [record["index"] for record in checkpoint.failed_units()] == [1]
+        assert checkpoint.get(1, "B", ["mood", "pace"]) == [FAILED_VALUE] * 2
+        assert checkpoint.get(2, "C", ["mood"]) == ["happy"]
+
+    with CheckpointJournal(path, resume=True, retry_failed=True) as checkpoint:
+        assert checkpoint.get(0, "A", ["mood"]) == ["sad"]
+        assert checkpoint.get(1, "B", ["mood"]) is None
+
+
+def test_write_dead_letters(tmp_path):
+    dead_letters = tmp_path / "failed.jsonl"
+    with CheckpointJournal(str(tmp_path / "journal.jsonl")) as checkpoint:
+        checkpoint.record_failure(3, "Lost unit")
+        checkpoint.record(4, "Fine unit", {"mood": "sad"})
+
+        assert checkpoint.write_dead_letters(str(dead_letters)) == 1
+
+    lines = dead_letters.read_text().splitlines()
+    assert [json.loads(line) for line in lines] == [{"index": 3, "text": "Lost unit"}]
+
+
+def test_write_dead_letters_without_failures(tmp_path):
+    dead_letters = tmp_path / "failed.jsonl"
+    with CheckpointJournal(str(tmp_path / "journal.jsonl")) as checkpoint:
+        checkpoint.record(4, "Fine unit", {"mood": "sad"})
+
+        assert checkpoint.write_dead_letters(str(dead_letters)) == 0
+
+    assert not dead_letters.exists()
+
+
+def test_dead_letters_are_removed_once_retried(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    dead_letters = tmp_path / "failed.jsonl"
+    with CheckpointJournal(path) as checkpoint:
+        checkpoint.record(0, "A", {"mood": "sad"})
+        checkpoint.record_failure(1, "B")
+        assert checkpoint.write_dead_letters(str(dead_letters)) == 1
+
+    with CheckpointJournal(path, retry_failed=True) as checkpoint:
+        assert checkpoint.get(1, "B", ["mood"]) is None
+        checkpoint.record(1, "B", {"mood": "happy"})
+        assert checkpoint.write_dead_letters(str(dead_letters)) == 0
+
+    assert not dead_letters.exists()
+
+
+def test_async_records_are_written_from_worker_threads(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+
+    async def record_all():
+        await asyncio.gather(
+            *(checkpoint.arecord(i, f"Unit {i}", {"mood": "sad"}) for i in range(20)),
+            checkpoint.arecord_failure(20, "Lost unit"),
+        )
+
+    with CheckpointJournal(path) as checkpoint:
+        asyncio.run(record_all())
+
+    with CheckpointJournal(path, resume=True) as checkpoint:
+        assert len(checkpoint) == 21
+        assert checkpoint.get(7, "Unit 7", ["mood"]) == ["sad"]
+        assert [record["index"] for record in checkpoint.failed_units()] == [20]
+
+
+def test_only_hashes_and_failures_are_kept_in_memory(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    with CheckpointJournal(path) as checkpoint:
+        for i in range(100):
+            checkpoint.record(i, f"Unité {i}", {"mood": f"mood {i}"})
+        checkpoint.record_failure(100, "Lost unit")
+
+        assert checkpoint._completed == {}
+        assert list(checkpoint._failed) == [100]
+        assert len(checkpoint) == 101
+
+    with CheckpointJournal(path, resume=True) as checkpoint:
+        assert len(checkpoint) == 101
+        assert all(isinstance(entry, tuple) for entry in checkpoint._completed.values())
+        # Values are read back from the journal, at the byte offset of the record
+        assert checkpoint.get(99, "Unité 99", ["mood"]) == ["mood 99"]
+        assert checkpoint.get(0, "Unité 0", ["mood"]) == ["mood 0"]
@@ -0,0 +1,161 @@
+import asyncio
+import csv
+from enum import Enum
+from typing import Union
+
+from langchain_core.pydantic_v1 import BaseModel, Field
+
+from writing_feature_extractor.core.corpus import extract_corpus_features
+from writing_feature_extractor.features.generic_feature import GenericFeature
+
+
+class MockEnum(str, Enum):
+    LOW = "low"
+    HIGH = "high"
+
+
+class MockModel(BaseModel):
+    mock_feature: Union[MockEnum, str] = Field(description="A mock feature")
+
+
+def write_book(tmp_path, name, paragraphs):
+    path = tmp_path / f"{name}.txt"
+    path.write_text("\n".join(paragraphs))
+    return str(path)
+
+
+def make_paragraphs(name, count):
+    return [
+        f"Book {name} paragraph {i} is {'high' if i % 2 else 'low'} and long enough."
+        for i in range(count)
+    ]
+
+
+def read_column(csv_file, column):
+    with open(csv_file, newline="") as f:
+        return [row[column] for row in csv.DictReader(f)]
+
+
+class RecordingLLM:
+    """Answers from the paragraph text, with later paragraphs finishing first."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def ainvoke(self, input):
+        self.calls.append(input.split(" paragraph")[0])
+        await asyncio.sleep(0.001 * (10 - int(input.split()[3])))
+        return MockModel(mock_feature="high" if " high " in input else "low")
+
+
+def test_extract_corpus_features_interleaves_books_fairly(tmp_path):
+    books = {name: make_paragraphs(name, 4) for name in ["a", "b", "c"]}
+    paths = [write_book(tmp_path, name, books[name]) for name in books]
+    feature = GenericFeature("Mock Feature", MockEnum, {})
+    llm = RecordingLLM()
+    output_dir = tmp_path / "results"
+
+    processed = extract_corpus_features(
+        paths, str(output_dir), "paragraph", [feature], llm, concurrency=2
+    )
+
+    assert processed == {path: 4 for path in paths}
+    # All books share the queue, round-robin
+    assert llm.calls[:6] == ["Book a", "Book b", "Book c"] * 2
+    for name in books:
+        csv_file = output_dir / f"{name}.csv"
+        assert read_column(csv_file, "Mock Feature") == ["0", "1", "0", "1"]
+        assert read_column(csv_file, "Length") == ["9"] * 4
+        assert (output_dir / f"{name}.checkpoint.jsonl").exists()
+    assert feature.results == []
+
+
+def test_extract_corpus_features_limits_active_books(tmp_path):
+    paths = [
+        write_book(tmp_path, name, make_paragraphs(name, 2)) for name in ["a", "b", "c"]
+    ]
+    llm = RecordingLLM()
+
+    extract_corpus_features(
+        paths,
+        str(tmp_path / "results"),
+        "paragraph",
+        [GenericFeature("Mock Feature", MockEnum, {})],
+        llm,
+        concurrency=1,
+        max_active_books=2,
+    )
+
+    # Book c only starts once book a is fully read
+    assert llm.calls == ["Book a", "Book b", "Book a", "Book b", "Book c", "Book c"]
+
+
+def test_extract_corpus_features_skips_unreadable_books(tmp_path):
+    paths = [
+        str(tmp_path / "missing.txt"),
+        write_book(tmp_path, "a", make_paragraphs("a", 2)),
+    ]
+
+    processed = extract_corpus_features(
+        paths,
+        str(tmp_path / "results"),
+        "section",
+        [GenericFeature("Mock Feature", MockEnum, {})],
+        RecordingLLM(),
+    )
+
+    assert processed == {paths[1]: 1}
+
+
+def test_extract_corpus_features_skips_undecodable_books(tmp_path):
+    undecodable = tmp_path / "latin1.txt"
+    undecodable.write_bytes("Un paragraphe déjà écrit.\n".encode("latin-1"))
+    paths = [
+        write_book(tmp_path, "a", make_paragraphs("a", 2)),
+        str(undecodable),
+        write_book(tmp_path, "b", make_paragraphs("b", 2)),
+    ]
+    output_dir = tmp_path / "results"
+
+    processed = extract_corpus_features(
+        paths,
+        str(output_dir),
+        "paragraph",
+        [GenericFeature("Mock Feature", MockEnum, {})],
+        RecordingLLM(),
+    )
+
+    assert processed == {paths[0]: 2, paths[2]: 2}
+    for name in ["a", "b"]:
+        assert read_column(output_dir / f"{name}.csv", "Mock Feature") == ["0", "1"]
+
+
+def test_extract_corpus_features_retries_dead_letters(tmp_path):
+    path = write_book(tmp_path, "a", make_paragraphs("a", 3))
+    output_dir = tmp_path / "results"
+    llm = RecordingLLM()
+    answer = llm.ainvoke
+
+    async def fail_second_paragraph(input):
+        if " paragraph 1 " in input:
+            raise ValueError("Invalid request")
+        return await answer(input)
+
+    llm.ainvoke = fail_second_paragraph
+    feature = GenericFeature("Mock Feature", MockEnum, {})
+    extract_corpus_features([path], str(output_dir), "paragraph", [feature], llm)
+
+    assert read_column(output_dir / "a.csv", "Mock Feature") == ["0", "-1", "0"]
+    dead_letters = (output_dir / "a.failed.jsonl").read_text().splitlines()
+    assert len(dead_letters) == 1
+
+    llm.ainvoke = answer
+    llm.calls = []
+    extract_corpus_features(
+        [path], str(output_dir), "paragraph", [feature], llm, retry_failed=True
+    )
+
+    # --retry-failed implies resume, so only the failed unit is requested again
+    assert llm.calls == ["Book a"]
+    assert read_column(output_dir / "a.csv", "Mock Feature") == ["0", "1", "0"]
+    assert not (output_dir / "a.failed.jsonl").exists()
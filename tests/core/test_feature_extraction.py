@@ -1,18 +1,27 @@
+import asyncio
 import pytest
-from unittest.mock import Mock, patch, call
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, Mock, patch, call
 from langchain_core.pydantic_v1 import BaseModel, Field
 from enum import Enum
 
 from writing_feature_extractor.core.feature_extraction import (
+    DEFAULT_TRIANGULATION_TIMEOUT,
+    acompute_metrics,
+    ainvoke_llms,
     process_feature_with_triangulation,
     extract_features,
     extract_features_paragraph_mode,
     extract_features_section_mode,
+    process_text_units,
+    stream_extract_features,
 )
+from writing_feature_extractor.core.checkpoint import CheckpointJournal
 from writing_feature_extractor.features.writing_feature import WritingFeature
 from writing_feature_extractor.features.result_collection_mode import (
     ResultCollectionMode,
 )
+from writing_feature_extractor.utils.text_metrics import get_text_statistics
 
 
 class MockEnum(str, Enum):
@@ -60,42 +69,231 @@ def test_process_feature_with_triangulation():
     assert feature.results == [1]  # MEDIUM is index 1 in MockEnum
 
 
-@patch("writing_feature_extractor.core.feature_extraction.process_text")
+def test_process_feature_with_triangulation_ignores_unknown_levels():
+    feature = MockFeature()
+    result = MockModel(mock_feature=MockEnum.HIGH)
+    triangulation_results = [
+        MockModel.construct(mock_feature="HIGH"),
+        MockModel.construct(mock_feature="unknown"),
+    ]
+
+    process_feature_with_triangulation(result, triangulation_results, feature)
+
+    assert feature.results == [2]
+
+
+@patch("writing_feature_extractor.core.feature_extraction.ainvoke_llms")
 @patch("writing_feature_extractor.core.feature_extraction.combine_short_strings")
-@patch("writing_feature_extractor.core.feature_extraction.get_text_statistics")
-@patch("writing_feature_extractor.core.feature_extraction.save_results_to_csv")
+@patch("writing_feature_extractor.core.feature_extraction.IncrementalCSVWriter")
 def test_extract_features_paragraph_mode(
-    mock_save_csv, mock_get_stats, mock_combine, mock_process_text
+    mock_writer_class, mock_combine, mock_ainvoke_llms
 ):
     feature = MockFeature()
     sections = ["This is a test paragraph.", "This is another test paragraph."]
     llm = Mock()
     mock_combine.return_value = sections  # Simulate the combine_short_strings function
+    mock_ainvoke_llms.return_value = (MockModel(mock_feature=MockEnum.HIGH), [])
 
-    extract_features_paragraph_mode(sections, [feature], llm)
+    _, text_units, text_metrics = extract_features_paragraph_mode(
+        sections, [feature], llm
+    )
 
-    assert mock_process_text.call_count == 4
-    mock_process_text.assert_has_calls(
-        [call(paragraph, [feature], llm, None) for paragraph in sections * 2]
+    assert mock_ainvoke_llms.call_count == 4
+    mock_ainvoke_llms.assert_has_calls(
+        [
+            call(paragraph, llm, None, DEFAULT_TRIANGULATION_TIMEOUT)
+            for paragraph in sections * 2
+        ]
     )
-    assert mock_get_stats.call_count == 4
-    assert mock_save_csv.call_count == 2
+    assert feature.results == [2, 2, 2, 2]
+    # The metrics come from the process pool, in the order of the text units
+    assert text_metrics == [get_text_statistics(text) for text in text_units]
+    # The CSV file is opened once and only new rows are appended per section
+    mock_writer_class.assert_called_once_with([feature], flush_interval=1)
+    writer = mock_writer_class.return_value.__enter__.return_value
+    assert writer.append_rows.call_count == 2
+
+
+def run_paragraph_mode_with_events(interactive):
+    """Run two sections in paragraph mode, and log LLM calls and section completions."""
+    events = []
+    sections = [
+        "First section, first paragraph with quite enough words.\nFirst section, second paragraph with quite enough words.",
+        "Second section, only paragraph with quite enough words.",
+    ]
+
+    async def ainvoke(input):
+        events.append(f"llm: {input.split(',')[0]}")
+        await asyncio.sleep(0.01)
+        return MockModel(mock_feature=MockEnum.LOW)
 
+    llm = Mock()
+    llm.ainvoke = ainvoke
+    feature = MockFeature()
+
+    with patch(
+        "writing_feature_extractor.core.feature_extraction.IncrementalCSVWriter"
+    ), patch("builtins.input", side_effect=lambda prompt: events.append("pause")):
+        extract_features_paragraph_mode(
+            sections,
+            [feature],
+            llm,
+            interactive=interactive,
+            on_section_complete=lambda k, paragraphs: events.append(
+                f"section {k}: {len(paragraphs)}"
+            ),
+        )
+
+    assert feature.results == [0, 0, 0]
+    return events
+
+
+def test_extract_features_paragraph_mode_overlaps_sections():
+    events = run_paragraph_mode_with_events(interactive=False)
+
+    # The second section is dispatched before the first one is saved
+    assert events.index("llm: Second section") < events.index("section 0: 2")
+    assert events[-1] == "section 1: 1"
+    assert "pause" not in events
 
-@patch("writing_feature_extractor.core.feature_extraction.process_text")
-@patch("writing_feature_extractor.core.feature_extraction.get_text_statistics")
-def test_extract_features_section_mode(mock_get_stats, mock_process_text):
+
+def test_extract_features_paragraph_mode_interactive():
+    events = run_paragraph_mode_with_events(interactive=True)
+
+    assert events == [
+        "llm: First section",
+        "llm: First section",
+        "section 0: 2",
+        "pause",
+        "llm: Second section",
+        "section 1: 1",
+        "pause",
+    ]
+
+
+@patch("writing_feature_extractor.core.feature_extraction.ainvoke_llms")
+@patch("writing_feature_extractor.utils.text_processing.combine_short_strings")
+def test_extract_features_section_mode(mock_combine, mock_ainvoke_llms):
     feature = MockFeature()
     sections = ["This is a test section.", "This is another test section."]
     llm = Mock()
+    mock_combine.return_value = sections
+    mock_ainvoke_llms.return_value = (MockModel(mock_feature=MockEnum.LOW), [])
+
+    _, text_units, text_metrics = extract_features_section_mode(
+        sections, [feature], llm
+    )
+
+    assert mock_ainvoke_llms.call_count == 2
+    mock_ainvoke_llms.assert_has_calls(
+        [
+            call(section, llm, None, DEFAULT_TRIANGULATION_TIMEOUT)
+            for section in sections
+        ]
+    )
+    assert text_metrics == [get_text_statistics(text) for text in sections]
+
+
+def test_acompute_metrics_submits_chunks_in_order():
+    text_units = [f"Paragraph number {i} has a few words in it." for i in range(5)]
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        with patch.object(executor, "submit", wraps=executor.submit) as submit:
+            metrics = asyncio.run(acompute_metrics(text_units, executor, chunk_size=2))
+
+    assert [len(c.args[1]) for c in submit.call_args_list] == [2, 2, 1]
+    assert metrics.rows() == [get_text_statistics(text) for text in text_units]
+
+
+def test_process_text_units_preserves_order():
+    feature = MockFeature()
+    values = [MockEnum.HIGH, MockEnum.LOW, MockEnum.MEDIUM, MockEnum.HIGH]
+    texts = [f"unit {i}" for i in range(len(values))]
+
+    async def ainvoke(input):
+        index = texts.index(input)
+        # Later units finish first
+        await asyncio.sleep(0.01 * (len(texts) - index))
+        return MockModel(mock_feature=values[index])
+
+    llm = Mock()
+    llm.ainvoke = ainvoke
 
-    extract_features_section_mode(sections, [feature], llm)
+    asyncio.run(process_text_units(texts, [feature], llm, concurrency=4))
 
-    assert mock_process_text.call_count == 2
-    mock_process_text.assert_has_calls(
-        [call(section, [feature], llm, None) for section in sections]
+    assert feature.results == [2, 0, 1, 2]
+
+
+def test_process_text_units_respects_concurrency_limit():
+    feature = MockFeature()
+    in_flight = 0
+    max_in_flight = 0
+
+    async def ainvoke(input):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return MockModel(mock_feature=MockEnum.LOW)
+
+    llm = Mock()
+    llm.ainvoke = ainvoke
+
+    asyncio.run(
+        process_text_units(
+            [f"unit {i}" for i in range(10)], [feature], llm, concurrency=3
+        )
     )
-    assert mock_get_stats.call_count == 2
+
+    assert max_in_flight == 3
+    assert feature.results == [0] * 10
+
+
+def test_process_text_units_records_error_on_failure():
+    feature = MockFeature()
+    llm = Mock()
+    llm.ainvoke = AsyncMock(side_effect=Exception("LLM failure"))
+
+    asyncio.run(process_text_units(["some text"], [feature], llm))
+
+    assert feature.results == [-1]
+
+
+def test_process_text_units_resumes_from_checkpoint(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    texts = [f"unit {i}" for i in range(4)]
+    values = [MockEnum.HIGH, MockEnum.LOW, MockEnum.MEDIUM, MockEnum.HIGH]
+
+    def make_ainvoke(fail_from):
+        async def ainvoke(input):
+            index = texts.index(input)
+            if index >= fail_from:
+                raise Exception("Rate limited")
+            return MockModel(mock_feature=values[index])
+
+        return ainvoke
+
+    llm = Mock()
+    llm.ainvoke = Mock(side_effect=make_ainvoke(fail_from=2))
+    with CheckpointJournal(path) as checkpoint:
+        asyncio.run(
+            process_text_units(
+                texts[2:], [MockFeature()], llm, checkpoint=checkpoint, start_index=2
+            )
+        )
+        asyncio.run(
+            process_text_units(texts[:2], [MockFeature()], llm, checkpoint=checkpoint)
+        )
+
+    feature = MockFeature()
+    llm.ainvoke = Mock(side_effect=make_ainvoke(fail_from=4))
+    with CheckpointJournal(path, retry_failed=True) as checkpoint:
+        asyncio.run(process_text_units(texts, [feature], llm, checkpoint=checkpoint))
+
+    # Only the units which failed in the first run are requested again
+    assert [c.kwargs["input"] for c in llm.ainvoke.call_args_list] == texts[2:]
+    assert feature.results == [2, 0, 1, 2]
 
 
 def test_extract_features_invalid_mode():
@@ -103,5 +301,136 @@ def test_extract_features_invalid_mode():
         extract_features([], "invalid_mode", [], Mock())
 
 
+def make_llm(value, delay=0.0, error=None):
+    async def ainvoke(input):
+        await asyncio.sleep(delay)
+        if error:
+            raise error
+        return MockModel(mock_feature=value)
+
+    llm = Mock()
+    llm.ainvoke = ainvoke
+    return llm
+
+
+def test_ainvoke_llms_runs_triangulation_members_concurrently():
+    llm = make_llm(MockEnum.MEDIUM, delay=0.1)
+    triangulation_llms = [
+        make_llm(MockEnum.LOW, delay=0.1),
+        make_llm(MockEnum.HIGH, delay=0.1),
+    ]
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        outcome = await ainvoke_llms("text", llm, triangulation_llms)
+        return outcome, loop.time() - start
+
+    (result, triangulation_results), elapsed = asyncio.run(run())
+
+    assert result.mock_feature == MockEnum.MEDIUM
+    assert [r.mock_feature for r in triangulation_results] == [
+        MockEnum.LOW,
+        MockEnum.HIGH,
+    ]
+    assert elapsed < 0.25
+
+
+def test_ainvoke_llms_drops_slow_and_failing_members():
+    llm = make_llm(MockEnum.MEDIUM)
+    triangulation_llms = [
+        make_llm(MockEnum.LOW, delay=5),
+        make_llm(MockEnum.LOW, error=Exception("member failure")),
+        make_llm(MockEnum.HIGH),
+    ]
+
+    result, triangulation_results = asyncio.run(
+        ainvoke_llms("text", llm, triangulation_llms, triangulation_timeout=0.05)
+    )
+
+    assert result.mock_feature == MockEnum.MEDIUM
+    assert [r.mock_feature for r in triangulation_results] == [MockEnum.HIGH]
+
+
+def test_ainvoke_llms_main_llm_failure():
+    llm = make_llm(MockEnum.MEDIUM, error=Exception("main failure"))
+
+    result, triangulation_results = asyncio.run(
+        ainvoke_llms("text", llm, [make_llm(MockEnum.HIGH)])
+    )
+
+    assert result is None
+    assert triangulation_results == []
+
+
+def test_stream_extract_features_writes_rows_in_order():
+    values = [MockEnum.HIGH, MockEnum.LOW, MockEnum.MEDIUM, MockEnum.HIGH]
+    sections = [f"Section number {i} has enough words in it." for i in range(4)]
+
+    async def ainvoke(input):
+        index = sections.index(input)
+        # Later units finish first
+        await asyncio.sleep(0.01 * (len(sections) - index))
+        return MockModel(mock_feature=values[index])
+
+    llm = Mock()
+    llm.ainvoke = ainvoke
+    writer = Mock()
+    feature = MockFeature()
+
+    processed = stream_extract_features(
+        iter(sections), "paragraph", [feature], llm, writer, concurrency=4
+    )
+
+    assert processed == 4
+    assert writer.write_row.call_args_list == [
+        call(section, [value], get_text_statistics(section))
+        for section, value in zip(sections, [2, 0, 1, 2])
+    ]
+    # Streamed results are not accumulated in memory
+    assert feature.results == []
+
+
+def test_stream_extract_features_bounds_pending_units():
+    read = 0
+    written = 0
+    max_pending = 0
+
+    def sections():
+        nonlocal read
+        for i in range(50):
+            read += 1
+            yield f"Section {i} is long enough to not be combined."
+
+    def write_row(text, values, metrics):
+        nonlocal written, max_pending
+        max_pending = max(max_pending, read - written)
+        written += 1
+
+    async def ainvoke(input):
+        # The first unit is slow, so the others wait in the reorder buffer
+        await asyncio.sleep(0.05 if input.startswith("Section 0 ") else 0)
+        return MockModel(mock_feature=MockEnum.LOW)
+
+    llm = Mock()
+    llm.ainvoke = ainvoke
+    writer = Mock()
+    writer.write_row = Mock(side_effect=write_row)
+
+    processed = stream_extract_features(
+        sections(),
+        "paragraph",
+        [MockFeature()],
+        llm,
+        writer,
+        concurrency=2,
+        max_pending=5,
+    )
+
+    assert processed == 50
+    assert written == 50
+    assert max_pending <= 5
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -0,0 +1,51 @@
+import csv
+
+from writing_feature_extractor.core.metrics_only import (
+    extract_metrics_file,
+    extract_metrics_only,
+)
+from writing_feature_extractor.utils.text_metrics import get_text_statistics
+
+MANUSCRIPT = (
+    'The storm rolled in over the hills before dawn. "Run," she said to nobody.\n'
+    "He stayed at the window and watched the rain come down for hours.\n"
+    "***\n"
+    "By morning the river had risen over the road and the bridge was gone."
+)
+
+
+def read_rows(csv_file):
+    with open(csv_file, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_extract_metrics_file_writes_metric_columns_only(tmp_path):
+    text_file = tmp_path / "book.txt"
+    text_file.write_text(MANUSCRIPT)
+    csv_file = tmp_path / "book.csv"
+
+    assert extract_metrics_file(str(text_file), "paragraph", str(csv_file)) == 3
+
+    rows = read_rows(csv_file)
+    stats = get_text_statistics(
+        "He stayed at the window and watched the rain come down for hours."
+    )
+    assert list(rows[0]) == ["Unit", "Length", *stats, "ColorMaps"]
+    assert rows[1]["readability_ease"] == str(stats["readability_ease"])
+    assert rows[1]["ColorMaps"] == "{}"
+
+
+def test_extract_metrics_only_skips_failed_files(tmp_path):
+    paths, csv_files = [], []
+    for name in ["one", "two"]:
+        (tmp_path / f"{name}.txt").write_text(MANUSCRIPT)
+        paths.append(str(tmp_path / f"{name}.txt"))
+        csv_files.append(str(tmp_path / f"{name}.csv"))
+    paths.append(str(tmp_path / "missing.txt"))
+    csv_files.append(str(tmp_path / "missing.csv"))
+
+    processed = extract_metrics_only(paths, "section", csv_files, max_workers=2)
+
+    assert processed == {paths[0]: 1, paths[1]: 1}
+    assert read_rows(csv_files[0]) == read_rows(csv_files[1])
+    assert not (tmp_path / "missing.csv").exists()
@@ -4,6 +4,10 @@ from langchain_core.pydantic_v1 import BaseModel
 
 from writing_feature_extractor.core.model_factory import ModelFactory
 from writing_feature_extractor.core.custom_exceptions import ModelError
+from writing_feature_extractor.core.rate_limiter import (
+    RateLimitedRunnable,
+    get_rate_limiter,
+)
 
 
 # Mock PydanticModel for testing
@@ -42,7 +46,10 @@ def test_register_decorator():
 
 def test_get_llm_model_registered_provider():
     result = ModelFactory.get_llm_model("openai", "gpt-3.5-turbo", MockPydanticModel)
-    assert result == "openai_model"
+    assert isinstance(result, RateLimitedRunnable)
+    assert result.runnable == "openai_model"
+    # All runnables of the same provider and model share one rate limiter
+    assert result.limiter is get_rate_limiter("openai", "gpt-3.5-turbo")
 
 
 def test_get_llm_model_unregistered_provider():
@@ -52,29 +59,29 @@ def test_get_llm_model_unregistered_provider():
 
 def test_create_openai_model():
     result = ModelFactory.get_llm_model("openai", "gpt-3.5-turbo", MockPydanticModel)
-    assert result == "openai_model"
+    assert result.runnable == "openai_model"
 
 
 def test_create_anthropic_model():
     result = ModelFactory.get_llm_model("anthropic", "claude-2", MockPydanticModel)
-    assert result == "anthropic_model"
+    assert result.runnable == "anthropic_model"
 
 
 def test_create_groq_model():
     result = ModelFactory.get_llm_model("groq", "mixtral-8x7b-32768", MockPydanticModel)
-    assert result == "groq_model"
+    assert result.runnable == "groq_model"
 
 
 def test_create_gemini_model():
     result = ModelFactory.get_llm_model("google", "gemini-pro", MockPydanticModel)
-    assert result == "google_model"
+    assert result.runnable == "google_model"
 
 
 def test_create_openrouter_model():
     result = ModelFactory.get_llm_model(
         "openrouter", "openai/gpt-3.5-turbo", MockPydanticModel
     )
-    assert result == "openrouter_model"
+    assert result.runnable == "openrouter_model"
 
 
 def test_model_creation_error():
@@ -84,3 +91,20 @@ def test_model_creation_error():
 
     with pytest.raises(ModelError, match="Failed to create error_provider model"):
         ModelFactory.get_llm_model("error_provider", "test_model", MockPydanticModel)
+
+
+def test_runnables_are_reused_per_pydantic_model():
+    creator = MagicMock(return_value="openai_model")
+    ModelFactory.register("openai")(creator)
+
+    first = ModelFactory.get_llm_model("openai", "gpt-4o", MockPydanticModel)
+    second = ModelFactory.get_llm_model("openai", "gpt-4o", MockPydanticModel)
+    ModelFactory.get_llm_model("openai", "gpt-4o-mini", MockPydanticModel)
+
+    assert first.runnable is second.runnable
+    assert creator.call_count == 2
+
+    # Registering a provider again discards its runnables
+    ModelFactory.register("openai")(creator)
+    ModelFactory.get_llm_model("openai", "gpt-4o", MockPydanticModel)
+    assert creator.call_count == 3
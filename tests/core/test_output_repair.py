@@ -0,0 +1,100 @@
+import json
+
+import pytest
+from langchain_core.exceptions import OutputParserException
+from langchain_core.runnables import RunnableLambda
+
+from writing_feature_extractor.core.output_repair import (
+    TolerantOutputParser,
+    create_tolerant_parser,
+    match_enum_value,
+    repair_json,
+)
+from writing_feature_extractor.core.packing import create_packed_model
+from writing_feature_extractor.features.aesthemos_features.five_point_scale.aethemos_rating import (
+    AethemosRating,
+)
+from writing_feature_extractor.features.pace_feature import PaceFeature
+from writing_feature_extractor.features.writing_feature_factory import (
+    WritingFeatureFactory,
+)
+
+PaceModel = WritingFeatureFactory.create_dynamic_model([PaceFeature()])
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        '{"pace": "fast"}',
+        'Here you go:\n```json\n{"pace": "fast"}\n```',
+        '{"pace": "fast",}',
+        "{“pace”: “fast”}",
+        'The answer is {"pace": "fast"}. Hope this helps!',
+    ],
+)
+def test_repair_json(text):
+    assert repair_json(text) == {"pace": "fast"}
+
+
+def test_repair_json_gives_up_on_garbage():
+    with pytest.raises(json.JSONDecodeError):
+        repair_json("I cannot rate this text.")
+
+
+@pytest.mark.parametrize(
+    "value, member",
+    [
+        ("very Strongly", AethemosRating.VERY_STRONGLY),
+        ("VERY_STRONGLY", AethemosRating.VERY_STRONGLY),
+        ("Not at all.", AethemosRating.NOT_AT_ALL),
+        ("Moderatly", AethemosRating.MODERATELY),
+        ("Extremely", None),
+    ],
+)
+def test_match_enum_value(value, member):
+    assert match_enum_value(value, AethemosRating) == member
+
+
+def test_tolerant_parser_maps_near_misses_to_enums():
+    parser = TolerantOutputParser(pydantic_object=PaceModel)
+
+    result = parser.parse('```json\n{"Pace": "Medium-Fast",}\n```')
+
+    assert result.pace == PaceFeature.Pace.MEDIUM_FAST
+
+
+def test_tolerant_parser_repairs_packed_models():
+    parser = TolerantOutputParser(pydantic_object=create_packed_model(PaceModel))
+
+    result = parser.parse(
+        '{"results": [{"paragraph_number": 1, "pace": "SLOW"},'
+        ' {"paragraph_number": 2, "pace": "very fast"},]}'
+    )
+
+    assert [item.pace for item in result.results] == [
+        PaceFeature.Pace.SLOW,
+        PaceFeature.Pace.VERY_FAST,
+    ]
+
+
+def test_fixing_llm_is_only_called_when_repair_fails():
+    calls = []
+
+    def fix(prompt):
+        calls.append(prompt)
+        return '{"pace": "slow"}'
+
+    parser = create_tolerant_parser(PaceModel, RunnableLambda(fix))
+
+    assert parser.parse('{"pace": "Fast",}').pace == PaceFeature.Pace.FAST
+    assert calls == []
+
+    assert parser.parse("The pace is slow.").pace == PaceFeature.Pace.SLOW
+    assert len(calls) == 1
+
+
+def test_fixing_parser_raises_when_the_fix_fails():
+    parser = create_tolerant_parser(PaceModel, RunnableLambda(lambda _: "No idea"))
+
+    with pytest.raises(OutputParserException):
+        parser.parse("No idea")
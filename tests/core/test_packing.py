@@ -0,0 +1,179 @@
+import asyncio
+import re
+from enum import Enum
+from typing import Union
+from unittest.mock import AsyncMock, Mock
+
+from langchain_core.pydantic_v1 import BaseModel, Field
+
+from writing_feature_extractor.core.feature_extraction import process_text_units
+from writing_feature_extractor.core.packing import (
+    create_packed_model,
+    estimate_tokens,
+    format_packed_input,
+    get_max_units_per_pack,
+    pack_text_units,
+    unpack_results,
+)
+from writing_feature_extractor.core.result_cache import CachedRunnable, ResultCache
+from writing_feature_extractor.features.generic_feature import GenericFeature
+
+
+class MockEnum(str, Enum):
+    LOW = "low"
+    HIGH = "high"
+
+
+class MockModel(BaseModel):
+    mock_feature: Union[MockEnum, str] = Field(description="A mock feature")
+
+
+PackedModel = create_packed_model(MockModel)
+
+
+def test_create_packed_model():
+    packed = PackedModel.parse_obj(
+        {"results": [{"paragraph_number": 1, "mock_feature": "high"}]}
+    )
+
+    assert packed.results[0].mock_feature == MockEnum.HIGH
+    item_schema = PackedModel.schema()["definitions"]["PackedFeatureItem"]
+    assert set(item_schema["properties"]) == {"paragraph_number", "mock_feature"}
+
+
+def test_pack_text_units_respects_token_budget():
+    text_units = ["a" * 400, "b" * 400, "c" * 400, "d" * 4000]
+    budget = 2 * (estimate_tokens("a" * 400) + 8)
+
+    assert pack_text_units(text_units, budget) == [[0, 1], [2], [3]]
+
+
+def test_pack_text_units_respects_max_units():
+    text_units = ["Short."] * 5
+
+    assert pack_text_units(text_units, 1000) == [[0, 1, 2, 3, 4]]
+    assert pack_text_units(text_units, 1000, max_units=2) == [[0, 1], [2, 3], [4]]
+
+
+def test_get_max_units_per_pack_shrinks_with_features():
+    assert get_max_units_per_pack(1) > get_max_units_per_pack(10) >= 1
+    assert get_max_units_per_pack(10, max_output_tokens=1024) < 10
+    assert get_max_units_per_pack(1000) == 1
+
+
+def test_format_packed_input_numbers_paragraphs():
+    packed_input = format_packed_input(["First.", "Second."])
+
+    assert "[Paragraph 1]\nFirst." in packed_input
+    assert "[Paragraph 2]\nSecond." in packed_input
+
+
+def test_unpack_results_handles_missing_and_duplicates():
+    packed = PackedModel.parse_obj(
+        {
+            "results": [
+                {"paragraph_number": 1, "mock_feature": "high"},
+                {"paragraph_number": 3, "mock_feature": "low"},
+                {"paragraph_number": 3, "mock_feature": "high"},
+                {"paragraph_number": 7, "mock_feature": "high"},
+            ]
+        }
+    )
+
+    results = unpack_results(packed, 4)
+
+    assert results[0].mock_feature == MockEnum.HIGH
+    assert results[1:] == [None, None, None]
+    assert unpack_results(None, 2) == [None, None]
+
+
+def test_process_text_units_with_packing_re_requests_missing_units():
+    feature = GenericFeature("Mock Feature", MockEnum, {})
+    text_units = [f"Unit {i} is {'high' if i % 2 else 'low'}." for i in range(5)]
+
+    async def packed_ainvoke(input):
+        paragraphs = re.findall(r"\[Paragraph (\d+)\]\n(.*)", input)
+        # The packed answer always leaves out the last paragraph
+        return PackedModel.parse_obj(
+            {
+                "results": [
+                    {
+                        "paragraph_number": int(number),
+                        "mock_feature": "high" if "high" in text else "low",
+                    }
+                    for number, text in paragraphs[:-1]
+                ]
+            }
+        )
+
+    async def single_ainvoke(input):
+        return MockModel(mock_feature="high" if "high" in input else "low")
+
+    packed_llm = Mock()
+    packed_llm.ainvoke = Mock(side_effect=packed_ainvoke)
+    llm = Mock()
+    llm.ainvoke = Mock(side_effect=single_ainvoke)
+
+    asyncio.run(
+        process_text_units(
+            text_units,
+            [feature],
+            llm,
+            packed_llm=packed_llm,
+            packing_token_budget=30,
+        )
+    )
+
+    assert feature.results == [0, 1, 0, 1, 0]
+    # Packs of two units: [0, 1], [2, 3], [4]
+    assert packed_llm.ainvoke.call_count == 3
+    assert [c.kwargs["input"] for c in llm.ainvoke.call_args_list] == [
+        text_units[1],
+        text_units[3],
+        text_units[4],
+    ]
+
+
+def answer_packed(input):
+    paragraphs = re.findall(r"\[Paragraph (\d+)\]\n(.*)", input)
+    return PackedModel.parse_obj(
+        {
+            "results": [
+                {
+                    "paragraph_number": int(number),
+                    "mock_feature": "high" if "high" in text else "low",
+                }
+                for number, text in paragraphs
+            ]
+        }
+    )
+
+
+def test_packed_results_are_cached_per_text_unit(tmp_path):
+    feature = GenericFeature("Mock Feature", MockEnum, {})
+    text_units = [f"Unit {i} is {'high' if i % 2 else 'low'}." for i in range(4)]
+    packed_llm = Mock()
+    packed_llm.ainvoke = AsyncMock(side_effect=answer_packed)
+    inner = Mock()
+    inner.ainvoke = AsyncMock(side_effect=AssertionError("not cached"))
+    cache = ResultCache(str(tmp_path))
+    llm = CachedRunnable(inner, cache, "provider", "model", MockModel)
+
+    asyncio.run(process_text_units(text_units, [feature], llm, packed_llm=packed_llm))
+    # Each unit is cached on its own: a later unpacked run hits the cache
+    cached = asyncio.run(llm.ainvoke(input=text_units[1]))
+    assert cached.mock_feature == MockEnum.HIGH
+
+    feature.results.clear()
+    asyncio.run(
+        process_text_units(
+            text_units + ["Unit 4 is high."], [feature], llm, packed_llm=packed_llm
+        )
+    )
+    cache.close()
+
+    assert feature.results == [0, 1, 0, 1, 1]
+    assert inner.ainvoke.call_count == 0
+    # Only the new unit is packed in the second run
+    assert packed_llm.ainvoke.call_count == 2
+    assert "[Paragraph 2]" not in packed_llm.ainvoke.call_args.kwargs["input"]
@@ -0,0 +1,91 @@
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+
+from writing_feature_extractor.core.prompt_cache import (
+    PromptCacheCallbackHandler,
+    PromptCacheStats,
+    get_cache_usage,
+)
+from writing_feature_extractor.core.rate_limiter import RateLimitedRunnable
+from writing_feature_extractor.core.result_cache import describe_prompt
+from writing_feature_extractor.prompt_templates.aesthemos_prompt import (
+    AESTHEMOS_INSTRUCTIONS,
+    aesthemos_chat_prompt,
+    aesthemos_prompt,
+)
+
+
+def anthropic_message(input_tokens, cache_read, cache_write):
+    return AIMessage(
+        content="",
+        response_metadata={
+            "usage": {
+                "input_tokens": input_tokens,
+                "output_tokens": 20,
+                "cache_read_input_tokens": cache_read,
+                "cache_creation_input_tokens": cache_write,
+            }
+        },
+    )
+
+
+def test_anthropic_formats_the_static_instructions_as_the_system_prompt():
+    chat_models = pytest.importorskip("langchain_anthropic.chat_models")
+
+    system, messages = chat_models._format_messages(
+        aesthemos_chat_prompt.format_messages(input="A passage.")
+    )
+
+    assert system == AESTHEMOS_INSTRUCTIONS
+    assert [message["role"] for message in messages] == ["user"]
+    assert "A passage." in messages[0]["content"]
+    assert "A passage." not in AESTHEMOS_INSTRUCTIONS
+
+
+def test_split_prompt_renders_the_original_text():
+    system, human = aesthemos_chat_prompt.format_messages(input="A passage.")
+
+    assert system.content + "\n" + human.content == aesthemos_prompt.format(
+        input="A passage."
+    )
+
+
+def test_chat_prompt_works_with_the_prompt_helpers():
+    chain = aesthemos_chat_prompt | (lambda messages: messages)
+
+    assert "AESTHEMOS" in describe_prompt(chain)
+    assert RateLimitedRunnable._estimate_prompt_tokens(chain) > 100
+
+
+def test_get_cache_usage():
+    assert get_cache_usage(anthropic_message(10, 500, 0)) == (510, 500, 0)
+    openai_message = AIMessage(
+        content="",
+        response_metadata={
+            "token_usage": {
+                "prompt_tokens": 1200,
+                "completion_tokens": 20,
+                "prompt_tokens_details": {"cached_tokens": 1024},
+            }
+        },
+    )
+    assert get_cache_usage(openai_message) == (1200, 1024, 0)
+    assert get_cache_usage(AIMessage(content="")) == (0, 0, 0)
+
+
+def test_callback_counts_hits_and_misses():
+    stats = PromptCacheStats()
+    handler = PromptCacheCallbackHandler(stats)
+
+    for message in [
+        anthropic_message(10, 0, 500),
+        anthropic_message(12, 500, 0),
+        anthropic_message(8, 500, 0),
+    ]:
+        handler.on_llm_end(LLMResult(generations=[[ChatGeneration(message=message)]]))
+
+    assert (stats.requests, stats.hits, stats.misses) == (3, 2, 1)
+    assert stats.cache_read_tokens == 1000
+    assert stats.cache_write_tokens == 500
+    assert "2 hits, 1 misses" in stats.summary()
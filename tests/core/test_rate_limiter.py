@@ -0,0 +1,134 @@
+import asyncio
+from email.utils import formatdate
+from time import time
+
+import pytest
+from langchain_core.prompts import PromptTemplate
+from langchain_core.runnables import RunnableLambda
+
+from writing_feature_extractor.core.rate_limiter import (
+    DEFAULT_RETRY_AFTER,
+    ESTIMATED_OUTPUT_TOKENS,
+    RateLimit,
+    RateLimitedRunnable,
+    RateLimiter,
+    TokenBucket,
+    configure_rate_limit,
+    get_rate_limiter,
+    get_retry_after,
+)
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers):
+        self.status_code = status_code
+        self.headers = headers
+
+
+class FakeAPIError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = FakeResponse(status_code, headers or {})
+
+
+class RateLimitError(Exception):
+    """Named like the rate limit errors of the provider SDKs."""
+
+
+def test_token_bucket_allows_a_burst_then_paces():
+    bucket = TokenBucket(per_minute=60)
+
+    assert bucket.reserve(60) == 0.0
+    assert bucket.reserve(30) == pytest.approx(30.0, abs=0.1)
+    # Waiting callers queue up behind earlier reservations
+    assert bucket.reserve(1) == pytest.approx(31.0, abs=0.1)
+
+
+def test_rate_limiter_waits_for_the_slowest_bucket():
+    limiter = RateLimiter(RateLimit(requests_per_minute=2, tokens_per_minute=600))
+
+    assert limiter.reserve(600) == 0.0
+    # One request left, but no tokens
+    assert limiter.reserve(60) == pytest.approx(6.0, abs=0.1)
+    # No requests left
+    assert limiter.reserve(1) == pytest.approx(30.0, abs=0.1)
+
+
+def test_rate_limiter_pause():
+    limiter = RateLimiter(RateLimit())
+
+    assert limiter.reserve(1000) == 0.0
+    limiter.pause(5)
+    assert limiter.reserve(1) == pytest.approx(5.0, abs=0.1)
+
+
+def test_get_retry_after():
+    assert get_retry_after(FakeAPIError(429, {"retry-after": "2"})) == 2.0
+    assert get_retry_after(FakeAPIError(429, {"retry-after-ms": "1500"})) == 1.5
+    http_date = formatdate(time() + 20, usegmt=True)
+    assert get_retry_after(FakeAPIError(429, {"retry-after": http_date})) == (
+        pytest.approx(20, abs=2)
+    )
+    assert get_retry_after(RateLimitError("slow down")) == DEFAULT_RETRY_AFTER
+    assert get_retry_after(FakeAPIError(500)) is None
+    assert get_retry_after(ValueError("invalid output")) is None
+
+
+def make_runnable(errors, max_retries=3):
+    calls = []
+
+    async def answer(prompt_value):
+        calls.append(prompt_value.to_string())
+        if errors:
+            raise errors.pop(0)
+        return "answer"
+
+    runnable = PromptTemplate.from_template("Rate the text: {input}") | RunnableLambda(
+        lambda x: x, afunc=answer
+    )
+    limiter = RateLimiter(RateLimit())
+    return RateLimitedRunnable(runnable, limiter, max_retries), limiter, calls
+
+
+def test_rate_limited_runnable_retries_after_rate_limit_errors():
+    limited, limiter, calls = make_runnable(
+        [FakeAPIError(429, {"retry-after": "0.05"}), RateLimitError("again")]
+    )
+    limiter_pause = []
+    limiter.pause = lambda seconds: limiter_pause.append(seconds)
+
+    assert asyncio.run(limited.ainvoke("Some text.")) == "answer"
+    assert calls == ["Rate the text: Some text."] * 3
+    assert limiter_pause == [0.05, DEFAULT_RETRY_AFTER]
+
+
+def test_rate_limited_runnable_raises_other_errors_and_exhausted_retries():
+    limited, _, calls = make_runnable([ValueError("bad output")])
+    with pytest.raises(ValueError):
+        asyncio.run(limited.ainvoke("Some text."))
+    assert len(calls) == 1
+
+    limited, limiter, calls = make_runnable(
+        [FakeAPIError(429, {"retry-after": "0"})] * 3, max_retries=2
+    )
+    with pytest.raises(FakeAPIError):
+        asyncio.run(limited.ainvoke("Some text."))
+    assert len(calls) == 3
+
+
+def test_rate_limited_runnable_estimates_tokens_from_the_rendered_prompt():
+    limited, _, _ = make_runnable([])
+    text = "word " * 100
+
+    # "Rate the text: " is 15 characters, about 4 tokens
+    assert limited.estimate_tokens(text) == 4 + 126 + ESTIMATED_OUTPUT_TOKENS
+
+
+def test_configure_rate_limit_per_provider_and_model():
+    configure_rate_limit("test_provider", requests_per_minute=100)
+    configure_rate_limit("test_provider", "fast-model", requests_per_minute=1000)
+
+    assert get_rate_limiter("test_provider", "fast-model").rate_limit == RateLimit(1000)
+    assert get_rate_limiter("test_provider", "other-model").rate_limit == RateLimit(100)
+    assert get_rate_limiter("unconfigured", "model").rate_limit == RateLimit()
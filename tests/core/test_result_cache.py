@@ -0,0 +1,307 @@
+import asyncio
+import json
+from enum import Enum
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from langchain_core.pydantic_v1 import BaseModel, Field
+from langchain_core.runnables import RunnableLambda
+
+from writing_feature_extractor.core.model_factory import (
+    ModelFactory,
+    create_non_tooling_chain,
+)
+from writing_feature_extractor.core.result_cache import (
+    CachedRunnable,
+    FeatureCachedRunnable,
+    ResultCache,
+)
+from writing_feature_extractor.features.generic_feature import GenericFeature
+from writing_feature_extractor.features.writing_feature_factory import (
+    WritingFeatureFactory,
+)
+
+
+class MockEnum(str, Enum):
+    LOW = "low"
+    HIGH = "high"
+
+
+class MockModel(BaseModel):
+    mock_feature: MockEnum = Field(description="A mock feature for testing")
+
+
+class OtherMockModel(BaseModel):
+    other_feature: MockEnum = Field(description="Another mock feature")
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    yield cache
+    cache.close()
+
+
+def test_put_and_get(cache):
+    assert cache.get("key") is None
+    cache.put("key", "value")
+    assert cache.get("key") == "value"
+    assert len(cache) == 1
+
+
+def test_cache_persists_across_instances(tmp_path):
+    first = ResultCache(str(tmp_path))
+    first.put("key", "value")
+    first.close()
+
+    second = ResultCache(str(tmp_path))
+    assert second.get("key") == "value"
+    second.close()
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResultCache(str(tmp_path), max_size_bytes=10)
+    cache.put("a", "aaaa")
+    cache.put("b", "bbbb")
+    cache.get("a")  # "b" is now the least recently used entry
+    cache.put("c", "cccc")
+
+    assert cache.get("a") == "aaaa"
+    assert cache.get("b") is None
+    assert cache.get("c") == "cccc"
+    cache.close()
+
+
+def test_cache_hits_do_not_write(cache):
+    cache.put("key", "value")
+    changes = cache._connection.total_changes
+
+    assert cache.get("key") == "value"
+    assert cache._connection.total_changes == changes
+
+
+def test_access_times_are_written_on_close(tmp_path):
+    first = ResultCache(str(tmp_path), max_size_bytes=10)
+    first.put("a", "aaaa")
+    first.put("b", "bbbb")
+    first.get("a")
+    first.close()
+
+    second = ResultCache(str(tmp_path), max_size_bytes=10)
+    second.put("c", "cccc")
+
+    assert second.get("a") == "aaaa"
+    assert second.get("b") is None
+    second.close()
+
+
+def test_context_manager_writes_access_times(tmp_path):
+    with ResultCache(str(tmp_path)) as cache:
+        cache.put("a", "aaaa")
+        cache.put("b", "bbbb")
+        cache.get("a")
+
+    with ResultCache(str(tmp_path)) as cache:
+        last_access = dict(
+            cache._connection.execute("SELECT key, last_access FROM results")
+        )
+
+    assert last_access["a"] > last_access["b"]
+
+
+def test_async_get_and_put(cache):
+    async def run():
+        await cache.aput("key", "value")
+        return await cache.aget("key")
+
+    assert asyncio.run(run()) == "value"
+
+
+def test_make_key_depends_on_all_parts():
+    assert ResultCache.make_key("a", "b") == ResultCache.make_key("a", "b")
+    assert ResultCache.make_key("a", "b") != ResultCache.make_key("ab", "")
+
+
+def test_cached_runnable_returns_cached_result(cache):
+    inner = Mock()
+    inner.invoke.return_value = MockModel(mock_feature=MockEnum.HIGH)
+    llm = CachedRunnable(inner, cache, "provider", "model", MockModel)
+
+    first = llm.invoke("some text")
+    second = llm.invoke("some text")
+
+    assert inner.invoke.call_count == 1
+    assert first == second
+    assert second.mock_feature == MockEnum.HIGH
+
+
+def test_cached_runnable_async(cache):
+    inner = Mock()
+    inner.ainvoke = AsyncMock(return_value=MockModel(mock_feature=MockEnum.LOW))
+    llm = CachedRunnable(inner, cache, "provider", "model", MockModel)
+
+    asyncio.run(llm.ainvoke(input="some text"))
+    result = asyncio.run(llm.ainvoke(input="some text"))
+    asyncio.run(llm.ainvoke(input="other text"))
+
+    assert inner.ainvoke.call_count == 2
+    assert result.mock_feature == MockEnum.LOW
+
+
+def test_cached_runnable_key_depends_on_model_and_schema(cache):
+    inner = Mock()
+    inner.invoke.return_value = MockModel(mock_feature=MockEnum.HIGH)
+
+    CachedRunnable(inner, cache, "provider", "model", MockModel).invoke("text")
+    CachedRunnable(inner, cache, "provider", "other-model", MockModel).invoke("text")
+    inner.invoke.return_value = OtherMockModel(other_feature=MockEnum.LOW)
+    CachedRunnable(inner, cache, "provider", "model", OtherMockModel).invoke("text")
+
+    assert inner.invoke.call_count == 3
+
+
+def test_cached_runnable_does_not_cache_errors(cache):
+    inner = Mock()
+    inner.invoke.side_effect = [
+        Exception("LLM failure"),
+        MockModel(mock_feature=MockEnum.HIGH),
+    ]
+    llm = CachedRunnable(inner, cache, "provider", "model", MockModel)
+
+    with pytest.raises(Exception):
+        llm.invoke("text")
+    assert llm.invoke("text").mock_feature == MockEnum.HIGH
+    assert len(cache) == 1
+
+
+def test_get_llm_model_wraps_with_cache(cache):
+    ModelFactory.register("cache_test_provider")(
+        lambda model_name, PydanticModel: Mock()
+    )
+
+    llm = ModelFactory.get_llm_model("cache_test_provider", "model", MockModel, cache)
+
+    assert isinstance(llm, CachedRunnable)
+
+
+def make_feature(name):
+    return GenericFeature(name, MockEnum, {})
+
+
+def make_feature_cached_llm(cache, features, responses):
+    """Build a FeatureCachedRunnable whose reduced models answer from responses."""
+    requested = []
+
+    def get_llm(subset):
+        labels = [feature.pydantic_feature_label for feature in subset]
+        Model = WritingFeatureFactory.create_dynamic_model(subset)
+        llm = Mock()
+
+        def invoke(input, config=None):
+            requested.append(labels)
+            return Model(**{label: responses[label] for label in labels})
+
+        llm.invoke = invoke
+        return llm
+
+    Model = WritingFeatureFactory.create_dynamic_model(features)
+    llm = FeatureCachedRunnable(features, cache, "provider", "model", Model, get_llm)
+    return llm, requested
+
+
+def test_feature_cached_runnable_requests_only_missing_features(cache):
+    responses = {"sadness": "high", "beauty": "low", "humor": "high"}
+    old_features = [make_feature("Sadness"), make_feature("Beauty")]
+    new_features = old_features + [make_feature("Humor")]
+
+    llm, requested = make_feature_cached_llm(cache, old_features, responses)
+    llm.invoke("text")
+    assert requested == [["sadness", "beauty"]]
+
+    llm, requested = make_feature_cached_llm(cache, new_features, responses)
+    result = llm.invoke("text")
+
+    assert requested == [["humor"]]
+    assert result.dict() == {
+        "sadness": MockEnum.HIGH,
+        "beauty": MockEnum.LOW,
+        "humor": MockEnum.HIGH,
+    }
+
+
+def test_feature_cached_runnable_full_hit_skips_llm(cache):
+    responses = {"sadness": "high"}
+    features = [make_feature("Sadness")]
+
+    llm, requested = make_feature_cached_llm(cache, features, responses)
+    llm.invoke("text")
+    llm.invoke("text")
+    asyncio.run(llm.ainvoke(input="text"))
+
+    assert requested == [["sadness"]]
+
+
+def test_feature_cached_runnable_stores_results_of_other_calls(cache):
+    responses = {"sadness": "high", "beauty": "low"}
+    features = [make_feature("Sadness"), make_feature("Beauty")]
+    llm, requested = make_feature_cached_llm(cache, features, responses)
+    DynamicFeatureModel = WritingFeatureFactory.create_dynamic_model(features)
+
+    assert asyncio.run(llm.aget_cached("text")) is None
+    asyncio.run(llm.astore("text", DynamicFeatureModel.parse_obj(responses)))
+    result = asyncio.run(llm.aget_cached("text"))
+
+    assert result.dict() == {"sadness": MockEnum.HIGH, "beauty": MockEnum.LOW}
+    assert requested == []
+
+
+def test_feature_cached_runnable_key_depends_on_levels(cache):
+    class OtherLevels(str, Enum):
+        LOW = "low"
+        MEDIUM = "medium"
+        HIGH = "high"
+
+    responses = {"sadness": "high"}
+    make_feature_cached_llm(cache, [make_feature("Sadness")], responses)[0].invoke(
+        "text"
+    )
+
+    features = [GenericFeature("Sadness", OtherLevels, {})]
+    llm, requested = make_feature_cached_llm(cache, features, responses)
+    llm.invoke("text")
+
+    assert requested == [["sadness"]]
+
+
+def test_non_tooling_features_stay_cached_when_a_feature_is_added(cache):
+    # Google and OpenRouter put the schema of all features in the prompt
+    responses = {"sadness": "high", "beauty": "low", "humor": "high"}
+    requested = []
+
+    def answer(prompt_value):
+        prompt = prompt_value.to_string()
+        requested.append([label for label in responses if f'"{label}"' in prompt])
+        return json.dumps(responses)
+
+    @ModelFactory.register("non_tooling_test_provider")
+    def create(model_name, PydanticModel):
+        return create_non_tooling_chain(RunnableLambda(answer), PydanticModel)
+
+    old_features = [make_feature("Sadness"), make_feature("Beauty")]
+    new_features = old_features + [make_feature("Humor")]
+    for features in (old_features, new_features):
+        llm = ModelFactory.get_llm_model(
+            "non_tooling_test_provider",
+            "model",
+            WritingFeatureFactory.create_dynamic_model(features),
+            cache,
+            features,
+        )
+        result = llm.invoke("text")
+
+    assert requested == [["sadness", "beauty"], ["humor"]]
+    assert result.dict() == {
+        "sadness": MockEnum.HIGH,
+        "beauty": MockEnum.LOW,
+        "humor": MockEnum.HIGH,
+    }
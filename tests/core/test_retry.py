@@ -0,0 +1,101 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from langchain_core.exceptions import OutputParserException
+
+from writing_feature_extractor.core.custom_exceptions import OutputValidationError
+from writing_feature_extractor.core.retry import (
+    ErrorKind,
+    RetryPolicy,
+    ainvoke_with_retry,
+    classify_error,
+    get_backoff_delay,
+)
+
+NO_DELAY = RetryPolicy(max_attempts=3, max_validation_attempts=2, base_delay=0.0)
+
+
+class FakeAPIError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class APITimeoutError(Exception):
+    """Named like the timeout errors of the provider SDKs."""
+
+
+@pytest.mark.parametrize(
+    "error, kind",
+    [
+        (FakeAPIError(429), ErrorKind.RATE_LIMIT),
+        (asyncio.TimeoutError(), ErrorKind.TIMEOUT),
+        (APITimeoutError(), ErrorKind.TIMEOUT),
+        (FakeAPIError(503), ErrorKind.SERVER),
+        (OutputParserException("bad tool call"), ErrorKind.VALIDATION),
+        (json.JSONDecodeError("bad json", "{", 0), ErrorKind.VALIDATION),
+        (FakeAPIError(401), ErrorKind.FATAL),
+        (ValueError("bad input"), ErrorKind.FATAL),
+    ],
+)
+def test_classify_error(error, kind):
+    assert classify_error(error) == kind
+
+
+def test_backoff_delay_grows_exponentially_up_to_the_maximum():
+    policy = RetryPolicy(base_delay=1.0, max_delay=5.0)
+
+    with patch("writing_feature_extractor.core.retry.random.uniform") as uniform:
+        uniform.side_effect = lambda low, high: high
+        assert [get_backoff_delay(attempt, policy) for attempt in range(4)] == [
+            1.0,
+            2.0,
+            4.0,
+            5.0,
+        ]
+
+
+def test_retries_transient_errors():
+    llm = Mock()
+    llm.ainvoke = AsyncMock(side_effect=[APITimeoutError(), FakeAPIError(502), "ok"])
+
+    assert asyncio.run(ainvoke_with_retry(llm, "text", NO_DELAY)) == "ok"
+    assert llm.ainvoke.call_count == 3
+
+
+def test_gives_up_after_max_attempts():
+    llm = Mock()
+    llm.ainvoke = AsyncMock(side_effect=APITimeoutError())
+
+    with pytest.raises(APITimeoutError):
+        asyncio.run(ainvoke_with_retry(llm, "text", NO_DELAY))
+    assert llm.ainvoke.call_count == 3
+
+
+def test_validation_failures_have_their_own_limit():
+    llm = Mock()
+    llm.ainvoke = AsyncMock(return_value=None)
+
+    with pytest.raises(OutputValidationError):
+        asyncio.run(ainvoke_with_retry(llm, "text", NO_DELAY))
+    assert llm.ainvoke.call_count == 2
+
+
+def test_fatal_errors_are_not_retried():
+    llm = Mock()
+    llm.ainvoke = AsyncMock(side_effect=FakeAPIError(401))
+
+    with pytest.raises(FakeAPIError):
+        asyncio.run(ainvoke_with_retry(llm, "text", NO_DELAY))
+    llm.ainvoke.assert_called_once_with(input="text")
+
+
+def test_rate_limit_errors_are_left_to_the_rate_limiter():
+    llm = Mock()
+    llm.ainvoke = AsyncMock(side_effect=FakeAPIError(429))
+
+    with pytest.raises(FakeAPIError):
+        asyncio.run(ainvoke_with_retry(llm, "text", NO_DELAY))
+    llm.ainvoke.assert_called_once_with(input="text")
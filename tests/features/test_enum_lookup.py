@@ -0,0 +1,41 @@
+from enum import Enum
+
+from writing_feature_extractor.features.enum_lookup import (
+    EnumLookup,
+    get_enum_lookup,
+    normalize_label,
+)
+
+
+class Agreement(str, Enum):
+    NOT_AT_ALL = "Not at all"
+    SOMEWHAT = "Somewhat"
+    VERY_STRONGLY = "Very strongly"
+
+
+def test_normalize_label():
+    assert normalize_label(" VERY_STRONGLY ") == "very strongly"
+
+
+def test_index_of_members_values_and_names():
+    lookup = EnumLookup(Agreement)
+    assert lookup.index_of(Agreement.SOMEWHAT) == 1
+    assert lookup.index_of("Very strongly") == 2
+    assert lookup.index_of("very-strongly") == 2
+    assert lookup.index_of("NOT_AT_ALL") == 0
+
+
+def test_index_of_no_match():
+    lookup = EnumLookup(Agreement)
+    assert lookup.index_of("Extremely") is None
+    assert lookup.index_of(None) is None
+    assert lookup.index_of(["Somewhat"]) is None
+
+
+def test_get_enum_lookup_is_built_once():
+    assert get_enum_lookup(Agreement) is get_enum_lookup(Agreement)
+    assert get_enum_lookup(Agreement).values == [
+        "Not at all",
+        "Somewhat",
+        "Very strongly",
+    ]
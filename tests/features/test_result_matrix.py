@@ -0,0 +1,113 @@
+from enum import Enum
+
+import numpy as np
+
+from writing_feature_extractor.features.mood_feature import MoodFeature
+from writing_feature_extractor.features.result_collection_mode import (
+    ResultCollectionMode,
+)
+from writing_feature_extractor.features.result_matrix import (
+    MISSING,
+    FeatureResults,
+    ResultMatrix,
+)
+from writing_feature_extractor.features.writing_feature import WritingFeature
+
+
+class Level(str, Enum):
+    LOW = "low"
+    HIGH = "high"
+
+
+class LevelFeature(WritingFeature):
+    @property
+    def pydantic_feature_label(self):
+        return "level"
+
+    @property
+    def pydantic_feature_type(self):
+        return Level
+
+    @property
+    def y_level_label(self):
+        return "Level"
+
+    @property
+    def pydantic_docstring(self):
+        return "The level of the text"
+
+
+def test_features_collect_into_matrix_columns():
+    level, mood = LevelFeature(), MoodFeature()
+    matrix = ResultMatrix([level, mood], capacity=4)
+
+    level.add_result(Level.HIGH)
+    level.add_result("unknown")
+    mood.add_result(MoodFeature.Mood.SAD)
+
+    assert isinstance(level.results, FeatureResults)
+    assert level.results == [1, -1]
+    assert mood.results == [MoodFeature.Mood.SAD]
+    assert len(matrix) == 2
+    assert matrix.data.dtype == np.int16
+    assert matrix.column(0).tolist() == [1, -1]
+    # Field name results are stored as their position in the enum
+    assert mood.results.array.tolist() == [1]
+    assert matrix.data[1, 1] == MISSING
+
+
+def test_field_name_values_outside_the_enum_extend_the_code_table():
+    mood = MoodFeature()
+    matrix = ResultMatrix([mood])
+
+    mood.add_result("ERROR")
+    mood.add_result("happy")
+    mood.add_result("ERROR")
+
+    assert mood.results == ["ERROR", MoodFeature.Mood.HAPPY, "ERROR"]
+    assert mood.results.array.tolist() == [6, 0, 6]
+    assert matrix.code_tables[0][6] == "ERROR"
+
+
+def test_matrix_grows_beyond_its_capacity():
+    level = LevelFeature()
+    matrix = ResultMatrix([level], capacity=2)
+
+    for i in range(5):
+        level.add_result(Level.HIGH if i % 2 else Level.LOW)
+
+    assert matrix.capacity >= 5
+    assert level.results == [0, 1, 0, 1, 0]
+    assert level.results[-1] == 0
+    assert level.results[1:3] == [1, 0]
+
+
+def test_clear_resets_a_column():
+    level = LevelFeature()
+    matrix = ResultMatrix([level])
+    level.add_result(Level.HIGH)
+
+    level.results.clear()
+
+    assert level.results == []
+    assert matrix.data[0, 0] == MISSING
+
+
+def test_mood_feature_instances_do_not_share_results():
+    first, second = MoodFeature(), MoodFeature()
+    first.add_result(MoodFeature.Mood.SAD)
+
+    assert second.results == []
+    assert first.result_collection_mode == ResultCollectionMode.FIELD_NAME
+
+
+def test_add_row_converts_and_columns_slice():
+    level, mood = LevelFeature(), MoodFeature()
+    matrix = ResultMatrix([level, mood])
+
+    matrix.add_row([Level.HIGH, "sad"])
+    matrix.add_row(["low", "ERROR"])
+    matrix.add_row([Level.HIGH, MoodFeature.Mood.TENSE])
+
+    assert matrix.decode_column(0) == [1, 0, 1]
+    assert mood.results[1:] == ["ERROR", MoodFeature.Mood.TENSE]
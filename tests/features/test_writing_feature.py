@@ -23,7 +23,8 @@ def mock_writing_feature():
     # Implement get_int_for_enum
     feature.get_int_for_enum = WritingFeature.get_int_for_enum.__get__(feature)
 
-    # Implement add_result
+    # Implement convert_result and add_result
+    feature.convert_result = WritingFeature.convert_result.__get__(feature)
     feature.add_result = WritingFeature.add_result.__get__(feature)
     type(feature).graph_y_tick_labels = WritingFeature.graph_y_tick_labels
     type(feature).graph_y_ticks = WritingFeature.graph_y_ticks
@@ -56,3 +57,19 @@ def test_graph_y_tick_labels(mock_writing_feature):
 def test_graph_y_ticks(mock_writing_feature):
     expected = [0, 1, 2]
     assert mock_writing_feature.graph_y_ticks == expected
+
+
+def test_add_result_converts_values_and_names(mock_writing_feature):
+    mock_writing_feature.add_result("b")
+    mock_writing_feature.add_result(" C ")
+    assert mock_writing_feature.results == [1, 2]
+
+
+def test_add_result_unknown_value(mock_writing_feature):
+    mock_writing_feature.add_result("d")
+    assert mock_writing_feature.results == [-1]
+
+
+def test_get_int_for_enum_unknown_value(mock_writing_feature):
+    with pytest.raises(ValueError):
+        mock_writing_feature.get_int_for_enum("d")
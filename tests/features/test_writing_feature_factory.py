@@ -142,3 +142,30 @@ def test_get_dynamic_model_error_handling():
 
 
 # Add more tests as needed to cover edge cases and error scenarios
+
+
+def test_get_dynamic_model_reuses_classes_for_the_same_config():
+    def make_config():
+        return [
+            FeatureConfigData(AvailableWritingFeatures.PACING, None, None),
+            FeatureConfigData("Tension", ["low", "high"], {"0": "#FFFFFF"}),
+        ]
+
+    first_collectors, FirstModel = WritingFeatureFactory.get_dynamic_model(
+        make_config()
+    )
+    first_collectors[1].add_result("high")
+    second_collectors, SecondModel = WritingFeatureFactory.get_dynamic_model(
+        make_config()
+    )
+
+    assert SecondModel is FirstModel
+    assert second_collectors[1].levels is first_collectors[1].levels
+    # The collectors of each job start empty
+    assert second_collectors[1] is not first_collectors[1]
+    assert second_collectors[1].results == []
+
+    _, OtherModel = WritingFeatureFactory.get_dynamic_model(
+        [FeatureConfigData("Tension", ["low", "medium", "high"], {})]
+    )
+    assert OtherModel is not FirstModel
@@ -17,6 +17,28 @@ def test_parse_arguments_default(monkeypatch):
     assert args.config == "feature_config.yaml"
     assert args.provider == "anthropic"
     assert args.model == "claude-3-haiku-20240307"
+    assert args.concurrency == 8
+    assert args.requests_per_minute is None
+    assert args.tokens_per_minute is None
+    assert args.cache_dir == ".feature_extractor_cache"
+    assert args.cache_size_mb == 512
+    assert not args.no_cache
+    assert not args.batch
+    assert args.batch_poll_interval == 60.0
+    assert args.pack_tokens is None
+    assert not args.stream
+    assert args.flush_interval == 1
+    assert args.checkpoint_file == "feature_extraction_checkpoint.jsonl"
+    assert not args.resume
+    assert not args.retry_failed
+    assert args.dead_letter_file == "failed_units.jsonl"
+    assert not args.interactive
+    assert args.syllable_table is None
+    assert not args.metrics_only
+    assert args.output_dir == "results"
+    assert not args.corpus
+    assert args.max_active_books == 8
+    assert args.workers is None
 
 
 def test_parse_arguments_custom(monkeypatch):
@@ -42,6 +64,11 @@ def test_parse_arguments_custom(monkeypatch):
             "openai",
             "--model",
             "gpt-4",
+            "--concurrency",
+            "16",
+            "--cache-dir",
+            "/tmp/cache",
+            "--no-cache",
         ],
     )
     args = parse_arguments()
@@ -55,6 +82,9 @@ def test_parse_arguments_custom(monkeypatch):
     assert args.config == "custom_config.yaml"
     assert args.provider == "openai"
     assert args.model == "gpt-4"
+    assert args.concurrency == 16
+    assert args.cache_dir == "/tmp/cache"
+    assert args.no_cache
 
 
 def test_parse_arguments_graph_without_features(monkeypatch):
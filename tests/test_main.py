@@ -5,8 +5,12 @@ from main import (
     main,
     handle_feature_extraction,
     handle_graph_generation,
+    open_result_cache,
 )
 from writing_feature_extractor.core.custom_exceptions import FeatureExtractorError
+from writing_feature_extractor.core.feature_extraction import (
+    DEFAULT_PACKING_TOKEN_BUDGET,
+)
 
 
 @pytest.fixture
@@ -20,6 +24,22 @@ def mock_args():
         config="test_config.yaml",
         provider="test_provider",
         model="test_model",
+        concurrency=4,
+        no_cache=True,
+        batch=False,
+        pack_tokens=None,
+        stream=False,
+        checkpoint_file="test_checkpoint.jsonl",
+        resume=False,
+        retry_failed=False,
+        dead_letter_file="test_failed_units.jsonl",
+        interactive=False,
+        flush_interval=1,
+        syllable_table=None,
+        metrics_only=False,
+        corpus=False,
+        requests_per_minute=None,
+        tokens_per_minute=None,
     )
 
 
@@ -59,14 +79,18 @@ def test_main_error_handling(mock_logger, mock_parse_args):
     mock_logger.error.assert_called_once_with("Feature extractor error: Test error")
 
 
-@patch("main.load_text")
-@patch("main.load_feature_config")
-@patch("main.WritingFeatureFactory.get_dynamic_model")
-@patch("main.ModelFactory.get_llm_model")
-@patch("main.split_into_sections")
-@patch("main.extract_features")
-@patch("main.save_results_to_csv")
+@patch("writing_feature_extractor.utils.text_processing.load_text")
+@patch("writing_feature_extractor.core.feature_config.load_feature_config")
+@patch(
+    "writing_feature_extractor.features.writing_feature_factory.WritingFeatureFactory.get_dynamic_model"
+)
+@patch("writing_feature_extractor.core.model_factory.ModelFactory.get_llm_model")
+@patch("writing_feature_extractor.utils.text_processing.split_into_sections")
+@patch("writing_feature_extractor.core.feature_extraction.extract_features")
+@patch("writing_feature_extractor.utils.save_results_to_csv.save_results_to_csv")
+@patch("writing_feature_extractor.core.checkpoint.CheckpointJournal")
 def test_handle_feature_extraction(
+    mock_checkpoint_class,
     mock_save_results,
     mock_extract_features,
     mock_split_sections,
@@ -93,7 +117,11 @@ def test_handle_feature_extraction(
     mock_load_config.assert_called_once_with(mock_args.config)
     mock_get_dynamic_model.assert_called_once_with(["feature1", "feature2"])
     mock_get_llm.assert_called_once_with(
-        mock_args.provider, mock_args.model, "DynamicModel"
+        mock_args.provider,
+        mock_args.model,
+        "DynamicModel",
+        None,
+        ["collector1", "collector2"],
     )
     mock_split_sections.assert_called_once_with("Test text")
     mock_extract_features.assert_called_once_with(
@@ -102,11 +130,185 @@ def test_handle_feature_extraction(
         ["collector1", "collector2"],
         "LLM",
         [],
+        concurrency=mock_args.concurrency,
+        packed_llm=None,
+        packing_token_budget=DEFAULT_PACKING_TOKEN_BUDGET,
+        checkpoint=mock_checkpoint_class.return_value.__enter__.return_value,
+        interactive=False,
+        flush_interval=1,
     )
+    mock_checkpoint_class.assert_called_once_with("test_checkpoint.jsonl", False, False)
+    checkpoint = mock_checkpoint_class.return_value.__enter__.return_value
+    checkpoint.write_dead_letters.assert_called_once_with("test_failed_units.jsonl")
     mock_save_results.assert_not_called()  # Because mock_args.save is False
 
 
-@patch("main.generate_graph_from_csv")
+@patch("writing_feature_extractor.utils.text_processing.load_text")
+@patch("writing_feature_extractor.core.feature_config.load_feature_config")
+@patch(
+    "writing_feature_extractor.features.writing_feature_factory.WritingFeatureFactory.get_dynamic_model"
+)
+@patch("writing_feature_extractor.core.model_factory.ModelFactory.get_llm_model")
+@patch("writing_feature_extractor.core.batch_api.get_batch_client")
+@patch("writing_feature_extractor.core.feature_extraction.extract_features_batch")
+@patch("writing_feature_extractor.core.feature_extraction.extract_features")
+def test_handle_feature_extraction_batch(
+    mock_extract_features,
+    mock_extract_features_batch,
+    mock_get_batch_client,
+    mock_get_llm,
+    mock_get_dynamic_model,
+    mock_load_config,
+    mock_load_text,
+    mock_args,
+):
+    mock_args.batch = True
+    mock_args.batch_poll_interval = 5.0
+    mock_load_text.return_value = "Section 1***Section 2"
+    mock_get_dynamic_model.return_value = (["collector1"], "DynamicModel")
+    mock_get_batch_client.return_value = "BatchClient"
+    mock_extract_features_batch.return_value = None
+
+    handle_feature_extraction(mock_args)
+
+    mock_get_batch_client.assert_called_once_with(mock_args.provider, mock_args.model)
+    mock_extract_features_batch.assert_called_once_with(
+        ["Section 1", "Section 2"],
+        mock_args.mode,
+        ["collector1"],
+        "BatchClient",
+        "DynamicModel",
+        5.0,
+    )
+    mock_get_llm.assert_not_called()
+    mock_extract_features.assert_not_called()
+
+
+@patch("writing_feature_extractor.utils.text_processing.load_text")
+@patch("writing_feature_extractor.core.feature_config.load_feature_config")
+@patch(
+    "writing_feature_extractor.features.writing_feature_factory.WritingFeatureFactory.get_dynamic_model"
+)
+@patch("writing_feature_extractor.core.model_factory.ModelFactory.get_llm_model")
+@patch("writing_feature_extractor.utils.text_processing.iter_sections")
+@patch("writing_feature_extractor.utils.save_results_to_csv.IncrementalCSVWriter")
+@patch("writing_feature_extractor.core.feature_extraction.stream_extract_features")
+@patch("writing_feature_extractor.core.feature_extraction.extract_features")
+@patch("writing_feature_extractor.core.checkpoint.CheckpointJournal")
+def test_handle_feature_extraction_stream(
+    mock_checkpoint_class,
+    mock_extract_features,
+    mock_stream_extract_features,
+    mock_writer_class,
+    mock_iter_sections,
+    mock_get_llm,
+    mock_get_dynamic_model,
+    mock_load_config,
+    mock_load_text,
+    mock_args,
+):
+    mock_args.stream = True
+    mock_args.flush_interval = 10
+    mock_args.resume = True
+    mock_args.retry_failed = True
+    mock_get_dynamic_model.return_value = (["collector1"], "DynamicModel")
+    mock_get_llm.return_value = "LLM"
+    mock_iter_sections.return_value = "SectionIterator"
+    writer = mock_writer_class.return_value.__enter__.return_value
+
+    handle_feature_extraction(mock_args)
+
+    mock_load_text.assert_not_called()
+    mock_iter_sections.assert_called_once_with(mock_args.file)
+    mock_writer_class.assert_called_once_with(["collector1"], mock_args.csv_file, 10)
+    mock_stream_extract_features.assert_called_once_with(
+        "SectionIterator",
+        mock_args.mode,
+        ["collector1"],
+        "LLM",
+        writer,
+        [],
+        concurrency=mock_args.concurrency,
+        checkpoint=mock_checkpoint_class.return_value.__enter__.return_value,
+    )
+    mock_checkpoint_class.assert_called_once_with("test_checkpoint.jsonl", True, True)
+    mock_extract_features.assert_not_called()
+
+
+@patch("writing_feature_extractor.core.feature_config.load_feature_config")
+@patch("writing_feature_extractor.core.model_factory.ModelFactory.get_llm_model")
+@patch("writing_feature_extractor.core.metrics_only.extract_metrics_only")
+def test_handle_feature_extraction_metrics_only(
+    mock_extract_metrics_only, mock_get_llm, mock_load_config, mock_args, tmp_path
+):
+    (tmp_path / "b.txt").write_text("Second manuscript.")
+    (tmp_path / "a.txt").write_text("First manuscript.")
+    (tmp_path / "notes.md").write_text("Not a manuscript.")
+    mock_args.file = str(tmp_path)
+    mock_args.metrics_only = True
+    mock_args.output_dir = str(tmp_path / "metrics")
+    mock_args.workers = 2
+
+    handle_feature_extraction(mock_args)
+
+    mock_extract_metrics_only.assert_called_once_with(
+        [str(tmp_path / "a.txt"), str(tmp_path / "b.txt")],
+        mock_args.mode,
+        [str(tmp_path / "metrics" / "a.csv"), str(tmp_path / "metrics" / "b.csv")],
+        2,
+    )
+    assert (tmp_path / "metrics").is_dir()
+    mock_load_config.assert_not_called()
+    mock_get_llm.assert_not_called()
+
+
+@patch("writing_feature_extractor.core.feature_config.load_feature_config")
+@patch(
+    "writing_feature_extractor.features.writing_feature_factory.WritingFeatureFactory.get_dynamic_model"
+)
+@patch("writing_feature_extractor.core.model_factory.ModelFactory.get_llm_model")
+@patch("writing_feature_extractor.core.corpus.extract_corpus_features")
+@patch("writing_feature_extractor.core.feature_extraction.extract_features")
+def test_handle_feature_extraction_corpus(
+    mock_extract_features,
+    mock_extract_corpus_features,
+    mock_get_llm,
+    mock_get_dynamic_model,
+    mock_load_config,
+    mock_args,
+    tmp_path,
+):
+    (tmp_path / "b.txt").write_text("Second book.")
+    (tmp_path / "a.txt").write_text("First book.")
+    mock_args.file = str(tmp_path / "*.txt")
+    mock_args.corpus = True
+    mock_args.output_dir = "corpus_results"
+    mock_args.max_active_books = 3
+    mock_get_dynamic_model.return_value = (["collector1"], "DynamicModel")
+    mock_get_llm.return_value = "LLM"
+
+    handle_feature_extraction(mock_args)
+
+    # One model for the whole corpus
+    mock_get_llm.assert_called_once()
+    mock_extract_corpus_features.assert_called_once_with(
+        [str(tmp_path / "a.txt"), str(tmp_path / "b.txt")],
+        "corpus_results",
+        mock_args.mode,
+        ["collector1"],
+        "LLM",
+        [],
+        concurrency=mock_args.concurrency,
+        max_active_books=3,
+        resume=False,
+        retry_failed=False,
+    )
+    mock_extract_features.assert_not_called()
+
+
+@patch(
+    "writing_feature_extractor.utils.generate_graph_from_csv.generate_graph_from_csv"
+)
 def test_handle_graph_generation(mock_generate_graph):
     args = Namespace(
         csv_file="test.csv", bar_feature="test_bar", color_feature="test_color"
@@ -126,3 +328,23 @@ def test_handle_graph_generation_error(mock_logger):
 
 if __name__ == "__main__":
     pytest.main()
+
+
+@patch("writing_feature_extractor.core.result_cache.ResultCache")
+def test_open_result_cache_closes_cache_on_error(mock_cache_class, mock_args):
+    mock_args.no_cache = False
+    mock_args.cache_dir = "test_cache"
+    mock_args.cache_size_mb = 1
+
+    with pytest.raises(FeatureExtractorError):
+        with open_result_cache(mock_args) as cache:
+            assert cache is mock_cache_class.return_value.__enter__.return_value
+            raise FeatureExtractorError("Test error")
+
+    mock_cache_class.assert_called_once_with("test_cache", 1024 * 1024)
+    mock_cache_class.return_value.__exit__.assert_called_once()
+
+
+def test_open_result_cache_disabled(mock_args):
+    with open_result_cache(mock_args) as cache:
+        assert cache is None
@@ -0,0 +1,88 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(__file__)), "main.py")
+# Importing everything up front took about 2 seconds. The lightweight startup
+# takes under 0.1 seconds, so this leaves ample room for slow machines.
+STARTUP_IMPORT_BUDGET_US = 500_000
+HEAVY_MODULES = ["langchain_core", "pandas", "matplotlib", "numpy", "textstat"]
+
+
+def run_with_importtime(args, cwd):
+    """Run main.py with -X importtime, and return the imported modules with
+    their cumulative import times in microseconds, and the total of the
+    top-level imports."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", MAIN_SCRIPT, *args],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    total = 0
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        modules[name.strip()] = int(cumulative)
+        if not name.startswith("  "):
+            total += int(cumulative)
+    return modules, total
+
+
+def test_help_imports_no_heavy_modules(tmp_path):
+    modules, total = run_with_importtime(["--help"], tmp_path)
+
+    assert [m for m in HEAVY_MODULES if m in modules] == []
+    assert total < STARTUP_IMPORT_BUDGET_US
+
+
+def test_graph_run_imports_no_llm_modules(tmp_path):
+    csv_file = tmp_path / "results.csv"
+    csv_file.write_text(
+        "Unit,Text,Length,Pace,Mood,ColorMaps\n"
+        '1,First,10,1,2,"{""Mood"": {""2"": ""#FF0000""}}"\n'
+        "2,Second,20,3,2,\n"
+    )
+
+    modules, _ = run_with_importtime(
+        [
+            "--graph",
+            "--csv-file",
+            str(csv_file),
+            "--bar-feature",
+            "Pace",
+            "--color-feature",
+            "Mood",
+        ],
+        tmp_path,
+    )
+
+    assert (tmp_path / "Pace_Mood_graph.png").exists()
+    assert "langchain_core" not in modules
+    assert "writing_feature_extractor.features.writing_feature_factory" not in modules
+
+
+def test_metrics_only_run_imports_no_llm_modules(tmp_path):
+    text_file = tmp_path / "book.txt"
+    text_file.write_text(
+        "The first paragraph has enough words to stand alone.\n"
+        "The second paragraph also has enough words to stand alone.\n"
+    )
+    csv_file = tmp_path / "metrics.csv"
+
+    modules, _ = run_with_importtime(
+        [str(text_file), "--metrics-only", "--csv-file", str(csv_file)], tmp_path
+    )
+
+    assert csv_file.exists()
+    assert "langchain_core" not in modules
+    assert "writing_feature_extractor.core.feature_extraction" not in modules
+
+
+if __name__ == "__main__":
+    pytest.main()
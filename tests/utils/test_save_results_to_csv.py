@@ -2,7 +2,13 @@ import pytest
 import csv
 import json
 from unittest.mock import mock_open, patch
-from writing_feature_extractor.utils.save_results_to_csv import save_results_to_csv
+from writing_feature_extractor.utils.save_results_to_csv import (
+    IncrementalCSVWriter,
+    save_results_to_csv,
+)
+from writing_feature_extractor.features.mood_feature import MoodFeature
+from writing_feature_extractor.features.pace_feature import PaceFeature
+from writing_feature_extractor.features.result_matrix import ResultMatrix
 from writing_feature_extractor.features.writing_feature import WritingFeature
 from writing_feature_extractor.core.custom_exceptions import FileOperationError
 
@@ -135,5 +141,85 @@ def test_save_results_to_csv_mismatched_lengths():
     assert csv_content[3][3] == ""
 
 
+def test_incremental_csv_writer_matches_save_results_to_csv(tmp_path):
+    feature_collectors = [
+        MockWritingFeature("Feature1", [1, 2]),
+        MockWritingFeature("Feature2", [3, 4]),
+    ]
+    text_metrics = [{"metric1": 10, "metric2": 20}, {"metric1": 30, "metric2": 40}]
+    text_units = ["Unit one", "Unit two words"]
+    saved_file = tmp_path / "saved.csv"
+    streamed_file = tmp_path / "streamed.csv"
+
+    save_results_to_csv(feature_collectors, text_metrics, text_units, str(saved_file))
+    with IncrementalCSVWriter(feature_collectors, str(streamed_file)) as writer:
+        writer.write_row(text_units[0], [1, 3], text_metrics[0])
+        # The row is on disk before the writer is closed
+        assert len(streamed_file.read_text().splitlines()) == 2
+        writer.write_row(text_units[1], [2, 4], text_metrics[1])
+
+    assert streamed_file.read_text() == saved_file.read_text()
+    assert writer.rows_written == 2
+
+
+def test_incremental_csv_writer_append_rows_matches_one_shot_save(tmp_path):
+    feature = MockWritingFeature("Feature1", [])
+    text_metrics = [{"metric1": i} for i in range(4)]
+    text_units = [f"Unit {i}" for i in range(4)]
+    saved_file = tmp_path / "saved.csv"
+    appended_file = tmp_path / "appended.csv"
+
+    with IncrementalCSVWriter([feature], str(appended_file)) as writer:
+        # Two sections of two text units each
+        for section_end in (2, 4):
+            feature.results = list(range(section_end))
+            writer.append_rows(text_units[:section_end], text_metrics[:section_end])
+    save_results_to_csv([feature], text_metrics, text_units, str(saved_file))
+
+    assert writer.rows_written == 4
+    assert appended_file.read_text() == saved_file.read_text()
+
+
+def test_incremental_csv_writer_append_rows_from_result_matrix(tmp_path):
+    pace, mood = PaceFeature(), MoodFeature()
+    matrix = ResultMatrix([pace, mood])
+    csv_file = tmp_path / "matrix.csv"
+
+    with IncrementalCSVWriter([pace, mood], str(csv_file)) as writer:
+        matrix.add_row(["fast", "sad"])
+        writer.append_rows(["Unit 0"], [{"metric1": 0}])
+        pace.add_result(PaceFeature.Pace.SLOW)
+        writer.append_rows(["Unit 0", "Unit 1"], [{"metric1": 0}, {"metric1": 1}])
+
+    with open(csv_file) as f:
+        rows = list(csv.DictReader(f))
+    assert [(row[pace.y_level_label], row["Mood"]) for row in rows] == [
+        ("5", "sad"),
+        ("1", ""),
+    ]
+
+
+def test_incremental_csv_writer_flush_interval():
+    m = mock_open()
+    with patch("builtins.open", m):
+        with IncrementalCSVWriter(
+            [MockWritingFeature("Feature1", [])], "test.csv", flush_interval=3
+        ) as writer:
+            for i in range(7):
+                writer.write_row(f"Unit {i}", [i], {"metric1": i})
+            assert m.return_value.flush.call_count == 2
+
+    m.assert_called_once_with("test.csv", "w", newline="")
+
+
+def test_incremental_csv_writer_open_error(tmp_path):
+    writer = IncrementalCSVWriter(
+        [MockWritingFeature("Feature1", [])], str(tmp_path / "missing" / "test.csv")
+    )
+
+    with pytest.raises(FileOperationError):
+        writer.open()
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -0,0 +1,87 @@
+import pytest
+
+from writing_feature_extractor.core.custom_exceptions import FileOperationError
+from writing_feature_extractor.utils.syllables import (
+    SyllableTable,
+    build_syllable_table,
+    count_word_syllables,
+    count_word_syllables_with_pyphen,
+    get_syllable_table_path,
+    load_syllable_table,
+    normalize_word,
+)
+from writing_feature_extractor.utils.text_metrics import count_text
+
+
+@pytest.fixture
+def syllable_table(tmp_path):
+    path = str(tmp_path / "syllables.tsv")
+    build_syllable_table(
+        ["Beautiful", "a", "READ(1)", "read", "ab", "abc", "zebra", "don't"], path
+    )
+    yield path
+    load_syllable_table(None)
+
+
+def test_build_syllable_table_is_sorted_and_normalized(syllable_table):
+    with open(syllable_table, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+
+    assert lines == sorted(lines)
+    assert [line.split("\t")[0] for line in lines] == [
+        "a",
+        "ab",
+        "abc",
+        "beautiful",
+        "dont",
+        "read",
+        "zebra",
+    ]
+
+
+def test_syllable_table_lookup(syllable_table):
+    table = SyllableTable(syllable_table)
+
+    for word in ["a", "ab", "abc", "beautiful", "dont", "read", "zebra"]:
+        assert table.get(word) == count_word_syllables_with_pyphen(word)
+    for word in ["", "aa", "abcd", "b", "zzz", "über"]:
+        assert table.get(word) is None
+    table.close()
+
+
+def test_empty_syllable_table(tmp_path):
+    path = tmp_path / "empty.tsv"
+    path.write_bytes(b"")
+
+    assert SyllableTable(str(path)).get("word") is None
+
+
+def test_missing_syllable_table_raises_file_operation_error(tmp_path):
+    with pytest.raises(FileOperationError):
+        SyllableTable(str(tmp_path / "missing.tsv"))
+
+
+def test_count_word_syllables_uses_loaded_table(tmp_path):
+    path = tmp_path / "syllables.tsv"
+    # A table entry which differs from pyphen shows that the table is used
+    path.write_bytes(b"zebra\t7\n")
+    text = "The zebra ran past the zebra."
+    pyphen_syllables = count_text(text).syllables
+
+    load_syllable_table(str(path))
+    try:
+        assert get_syllable_table_path() == str(path)
+        assert count_word_syllables("zebra") == 7
+        assert count_word_syllables("ran") == count_word_syllables_with_pyphen("ran")
+        zebra = count_word_syllables_with_pyphen("zebra")
+        assert count_text(text).syllables == pyphen_syllables + 2 * (7 - zebra)
+    finally:
+        load_syllable_table(None)
+
+    assert get_syllable_table_path() is None
+    assert count_word_syllables("zebra") == count_word_syllables_with_pyphen("zebra")
+
+
+def test_normalize_word():
+    assert normalize_word("READ(2)") == "read"
+    assert normalize_word("Don't") == "dont"
@@ -1,8 +1,15 @@
+import numpy as np
 import pytest
+import textstat
 from writing_feature_extractor.utils.text_metrics import (
     calculate_dialogue_percentage,
     combine_short_strings,
+    MetricsBatch,
+    compute_metrics_batch,
+    count_text,
     get_text_statistics,
+    iter_combine_short_strings,
+    split_into_chunks,
 )
 
 
@@ -34,6 +41,38 @@ def test_combine_short_strings():
     assert combine_short_strings(empty_list) == []
 
 
+def test_combine_short_strings_does_not_modify_input():
+    strings = ["", "", "Hello", "", "This is", "a test"]
+    original = list(strings)
+
+    assert combine_short_strings(strings, minimum_words=3) == [
+        "Hello This is",
+        "a test",
+    ]
+    assert strings == original
+
+
+def test_combine_short_strings_long_input():
+    strings = ["word"] * 200_000
+
+    combined = combine_short_strings(strings, minimum_words=3)
+
+    assert len(combined) == 66_667
+    assert combined[0] == "word word word"
+    assert combined[-1] == "word word"
+
+
+def test_iter_combine_short_strings_matches_combine_short_strings():
+    strings = ["Hello", "This is", "a test", "of combining", "short strings"]
+    combined = iter_combine_short_strings(iter(strings), minimum_words=3)
+
+    assert list(combined) == combine_short_strings(list(strings), minimum_words=3)
+    assert list(iter_combine_short_strings(["", "One two three", ""], 3)) == [
+        "One two three"
+    ]
+    assert list(iter_combine_short_strings([])) == []
+
+
 def test_get_text_statistics():
     sample_text = 'This is a sample text. It has two sentences. And some dialogue: "Hello, world!"'
     stats = get_text_statistics(sample_text)
@@ -59,6 +98,64 @@ def test_get_text_statistics():
     assert isinstance(stats["average_syllables_per_word"], float)
 
 
+@pytest.mark.parametrize(
+    "text",
+    [
+        'This is a sample text. It has two sentences. And some dialogue: "Hello, world!"',
+        "Version 3.5 shipped, e.g. yesterday... Really?! Yes. No.",
+        "A well-known singer-songwriter didn't arrive; she'd left (early) at 10:30.",
+        '"Run," she said. "Now!" He didn\'t move. "Please" -- nothing.',
+        "no punctuation at all in this lowercase sentence",
+    ],
+)
+def test_get_text_statistics_matches_textstat(text):
+    stats = get_text_statistics(text)
+
+    assert stats["dialogue_percentage"] == calculate_dialogue_percentage(text)
+    assert stats["sentence_count"] == textstat.sentence_count(text)
+    assert stats["word_count"] == textstat.lexicon_count(text, removepunct=True)
+    assert stats["syllable_count"] == textstat.syllable_count(text)
+    assert stats["readability_ease"] == pytest.approx(
+        textstat.flesch_reading_ease(text), abs=0.01
+    )
+    assert stats["readability_grade"] == pytest.approx(
+        textstat.flesch_kincaid_grade(text), abs=0.1
+    )
+
+
+def test_compute_metrics_batch_matches_get_text_statistics():
+    text_units = [
+        'This is a sample text. It has two sentences. And some dialogue: "Hello, world!"',
+        "",
+        "Version 3.5 shipped, e.g. yesterday... Really?! Yes. No.",
+        '"Run," she said. "Now!" He didn\'t move. "Please" -- nothing.',
+    ]
+
+    metrics = compute_metrics_batch(text_units)
+
+    assert len(metrics) == 4
+    assert isinstance(metrics.columns["syllable_count"], np.ndarray)
+    assert metrics.rows() == [get_text_statistics(text) for text in text_units]
+    assert metrics.row(1) == {}
+
+
+def test_metrics_batch_concatenate_chunks():
+    text_units = ["One short sentence here.", "", "Two. Sentences here!", "Last one."]
+
+    chunks = split_into_chunks(text_units, 3)
+    metrics = MetricsBatch.concatenate([compute_metrics_batch(c) for c in chunks])
+
+    assert [len(chunk) for chunk in chunks] == [3, 1]
+    assert metrics.rows() == compute_metrics_batch(text_units).rows()
+    assert len(MetricsBatch.concatenate([])) == 0
+
+
+def test_count_text_dialogue_with_unclosed_quote():
+    counts = count_text('"One" and "two" and "three')
+
+    assert counts.dialogue_characters == len('"One"') + len('"two"')
+
+
 def test_get_text_statistics_empty_text():
     empty_text = ""
     stats = get_text_statistics(empty_text)
@@ -67,8 +164,11 @@ def test_get_text_statistics_empty_text():
 
 
 def test_get_text_statistics_error_handling(mocker):
-    # Mock textstat to raise an exception
-    mocker.patch("textstat.flesch_reading_ease", side_effect=Exception("Mocked error"))
+    # Mock the counting pass to raise an exception
+    mocker.patch(
+        "writing_feature_extractor.utils.text_metrics.count_text",
+        side_effect=Exception("Mocked error"),
+    )
 
     sample_text = "This is a sample text."
     stats = get_text_statistics(sample_text)
@@ -1,5 +1,9 @@
 import pytest
 from writing_feature_extractor.utils.text_processing import (
+    find_text_files,
+    get_output_csv_file,
+    iter_lines,
+    iter_sections,
     load_text,
     split_into_sections,
     split_into_paragraphs,
@@ -28,6 +32,27 @@ def test_split_into_sections():
     assert split_into_sections(test_text) == expected_sections
 
 
+@pytest.mark.parametrize("chunk_size", [1, 2, 5, 1024])
+def test_iter_sections_matches_split_into_sections(tmp_path, chunk_size):
+    test_file = tmp_path / "test.txt"
+    test_text = "Section 1\n***\nSection 2\n******\nSection 3 * ** end***"
+    test_file.write_text(test_text)
+
+    sections = list(iter_sections(str(test_file), chunk_size))
+
+    assert sections == split_into_sections(test_text)
+
+
+def test_iter_sections_file_not_found():
+    with pytest.raises(FileOperationError):
+        list(iter_sections("nonexistent_file.txt"))
+
+
+@pytest.mark.parametrize("text", ["", "one line", "a\nb\n\nc", "\nends with newline\n"])
+def test_iter_lines_matches_split(text):
+    assert list(iter_lines(text)) == text.split("\n")
+
+
 def test_split_into_paragraphs():
     test_section = "Paragraph 1\n\nParagraph 2\nStill paragraph 2\n\nParagraph 3\nParagraph 4\nParagraph 5"
     expected_paragraphs = [
@@ -45,3 +70,18 @@ def test_split_into_paragraphs():
         "Short 4",
     ]
     assert split_into_paragraphs(test_section_short) == expected_paragraphs_short
+
+
+def test_find_text_files_in_directory_or_glob(tmp_path):
+    for name in ["b.txt", "a.txt", "notes.md"]:
+        (tmp_path / name).write_text("Text.")
+    (tmp_path / "folder.txt").mkdir()
+
+    expected = [str(tmp_path / "a.txt"), str(tmp_path / "b.txt")]
+    assert find_text_files(str(tmp_path)) == expected
+    assert find_text_files(str(tmp_path / "*.txt")) == expected
+    assert find_text_files(str(tmp_path / "*.md")) == [str(tmp_path / "notes.md")]
+
+
+def test_get_output_csv_file():
+    assert get_output_csv_file("books/moby_dick.txt", "out") == "out/moby_dick.csv"
@@ -5,7 +5,11 @@ def parse_arguments() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Extract writing features and generate graphs."
     )
-    parser.add_argument("file", nargs="?", help="Input text file to analyze")
+    parser.add_argument(
+        "file",
+        nargs="?",
+        help="Input text file to analyze, or a directory or glob of text files with --corpus or --metrics-only",
+    )
     parser.add_argument(
         "--mode",
         choices=["paragraph", "section"],
@@ -38,4 +42,121 @@ def parse_arguments() -> argparse.Namespace:
     parser.add_argument(
         "--model", default="claude-3-haiku-20240307", help="The specific model to use"
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Maximum number of concurrent LLM requests",
+    )
+    parser.add_argument(
+        "--requests-per-minute",
+        type=float,
+        default=None,
+        help="Request quota of the provider and model; requests are paced to stay within it",
+    )
+    parser.add_argument(
+        "--tokens-per-minute",
+        type=float,
+        default=None,
+        help="Token quota of the provider and model, estimated from the rendered prompts",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=".feature_extractor_cache",
+        help="Directory of the on-disk LLM result cache",
+    )
+    parser.add_argument(
+        "--cache-size-mb",
+        type=int,
+        default=512,
+        help="Maximum size of the LLM result cache in megabytes",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Disable the LLM result cache"
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Submit all text units through the provider's batch API (openai, anthropic)",
+    )
+    parser.add_argument(
+        "--batch-poll-interval",
+        type=float,
+        default=60.0,
+        help="Seconds between batch status polls in --batch mode",
+    )
+    parser.add_argument(
+        "--pack-tokens",
+        type=int,
+        default=None,
+        help="Pack several text units into one LLM call, up to this estimated token budget",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream the input file and write each result row to --csv-file as soon as it completes",
+    )
+    parser.add_argument(
+        "--flush-interval",
+        type=int,
+        default=1,
+        help="Number of CSV rows written between flushes to disk in paragraph and --stream mode",
+    )
+    parser.add_argument(
+        "--checkpoint-file",
+        default="feature_extraction_checkpoint.jsonl",
+        help="Journal of completed text units, used to resume an interrupted run",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip text units already completed in the checkpoint journal",
+    )
+    parser.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="Resume from the checkpoint journal, processing only the text units which failed again",
+    )
+    parser.add_argument(
+        "--dead-letter-file",
+        default="failed_units.jsonl",
+        help="File listing the text units whose LLM call failed after all retries",
+    )
+    parser.add_argument(
+        "--corpus",
+        action="store_true",
+        help="Process all .txt files of a directory, or the files of a glob, through one shared work queue",
+    )
+    parser.add_argument(
+        "--max-active-books",
+        type=int,
+        default=8,
+        help="Number of books whose text units are interleaved at a time in --corpus mode",
+    )
+    parser.add_argument(
+        "--metrics-only",
+        action="store_true",
+        help="Only compute the text metrics, without any LLM, for a file, a directory or a glob",
+    )
+    parser.add_argument(
+        "--output-dir",
+        default="results",
+        help="Directory of the per-book CSV files in --corpus and --metrics-only mode",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes in --metrics-only mode (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--syllable-table",
+        default=None,
+        help="Precomputed word to syllable count table, memory-mapped for the text metrics",
+    )
+    parser.add_argument(
+        "--interactive",
+        action="store_true",
+        help="Pause for review after each section in paragraph mode",
+    )
     return parser.parse_args()
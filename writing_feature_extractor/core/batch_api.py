@@ -0,0 +1,334 @@
+import json
+import time
+import uuid
+from abc import ABC, abstractmethod
+from os import getenv
+from typing import Any, Optional, Type
+from urllib import error, request
+
+from langchain_core.prompts import BasePromptTemplate
+from langchain_core.pydantic_v1 import BaseModel
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from writing_feature_extractor.core.custom_exceptions import ModelError
+from writing_feature_extractor.prompt_templates.aesthemos_prompt import aesthemos_prompt
+from writing_feature_extractor.utils.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_POLL_INTERVAL = 60.0
+ANTHROPIC_VERSION = "2023-06-01"
+ANTHROPIC_MAX_TOKENS = 1024
+
+
+class BatchClient(ABC):
+    """
+    Client for a provider's asynchronous batch API.
+
+    Requests use the same tool-calling structured output as the interactive
+    chat models created by ModelFactory, so a batch run yields the same
+    DynamicFeatureModel results at a lower cost and without per-request rate
+    limits.
+    """
+
+    def __init__(self, model_name: str, api_key: str | None, base_url: str):
+        self.model_name = model_name
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+
+    @abstractmethod
+    def build_request(
+        self, custom_id: str, prompt: str, tool: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Build one batch request for a rendered prompt and an OpenAI-format tool."""
+        pass
+
+    @abstractmethod
+    def submit(self, requests: list[dict[str, Any]]) -> str:
+        """Submit the requests as a batch job and return the batch id."""
+        pass
+
+    @abstractmethod
+    def is_finished(self, batch_id: str) -> bool:
+        """Poll the batch job and return whether it has stopped processing."""
+        pass
+
+    @abstractmethod
+    def get_results(self, batch_id: str) -> dict[str, dict[str, Any]]:
+        """Return the structured output arguments of each succeeded request, by custom id."""
+        pass
+
+    def _headers(self) -> dict[str, str]:
+        return {}
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        body: bytes | None = None,
+        content_type: str = "application/json",
+    ) -> bytes:
+        headers = self._headers()
+        if body is not None:
+            headers["Content-Type"] = content_type
+        try:
+            with request.urlopen(
+                request.Request(url, data=body, headers=headers, method=method)
+            ) as response:
+                return response.read()
+        except error.URLError as e:
+            logger.error(f"Batch API request failed: {method} {url}: {e}")
+            raise ModelError(f"Batch API request to {url} failed.") from e
+
+    def _request_json(
+        self, method: str, url: str, payload: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        return json.loads(self._request(method, url, body))
+
+
+class OpenAIBatchClient(BatchClient):
+    """Client for the OpenAI Batch API (chat completions with a forced tool call)."""
+
+    def __init__(
+        self,
+        model_name: str,
+        api_key: str | None = None,
+        base_url: str | None = None,
+    ):
+        super().__init__(
+            model_name,
+            api_key or getenv("OPENAI_API_KEY"),
+            base_url or getenv("OPENAI_BASE_URL") or "https://api.openai.com/v1",
+        )
+
+    def _headers(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.api_key}"}
+
+    def build_request(
+        self, custom_id: str, prompt: str, tool: dict[str, Any]
+    ) -> dict[str, Any]:
+        return {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": self.model_name,
+                "temperature": 0,
+                "messages": [{"role": "user", "content": prompt}],
+                "tools": [tool],
+                "tool_choice": {
+                    "type": "function",
+                    "function": {"name": tool["function"]["name"]},
+                },
+            },
+        }
+
+    def submit(self, requests: list[dict[str, Any]]) -> str:
+        input_file_id = self._upload_file(
+            "\n".join(json.dumps(batch_request) for batch_request in requests)
+        )
+        batch = self._request_json(
+            "POST",
+            f"{self.base_url}/batches",
+            {
+                "input_file_id": input_file_id,
+                "endpoint": "/v1/chat/completions",
+                "completion_window": "24h",
+            },
+        )
+        return batch["id"]
+
+    def _upload_file(self, content: str) -> str:
+        boundary = uuid.uuid4().hex
+        body = (
+            f"--{boundary}\r\n"
+            'Content-Disposition: form-data; name="purpose"\r\n\r\n'
+            "batch\r\n"
+            f"--{boundary}\r\n"
+            'Content-Disposition: form-data; name="file"; filename="batch.jsonl"\r\n'
+            "Content-Type: application/jsonl\r\n\r\n"
+            f"{content}\r\n"
+            f"--{boundary}--\r\n"
+        ).encode("utf-8")
+        uploaded = json.loads(
+            self._request(
+                "POST",
+                f"{self.base_url}/files",
+                body,
+                f"multipart/form-data; boundary={boundary}",
+            )
+        )
+        return uploaded["id"]
+
+    def is_finished(self, batch_id: str) -> bool:
+        batch = self._request_json("GET", f"{self.base_url}/batches/{batch_id}")
+        logger.info(f"Batch {batch_id} status: {batch['status']}")
+        return batch["status"] in ("completed", "failed", "expired", "cancelled")
+
+    def get_results(self, batch_id: str) -> dict[str, dict[str, Any]]:
+        batch = self._request_json("GET", f"{self.base_url}/batches/{batch_id}")
+        if not batch.get("output_file_id"):
+            raise ModelError(f"Batch {batch_id} has no results: {batch['status']}")
+
+        content = self._request(
+            "GET", f"{self.base_url}/files/{batch['output_file_id']}/content"
+        )
+
+        results = {}
+        for line in content.decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            try:
+                message = record["response"]["body"]["choices"][0]["message"]
+                arguments = message["tool_calls"][0]["function"]["arguments"]
+                results[record["custom_id"]] = json.loads(arguments)
+            except (KeyError, IndexError, TypeError, json.JSONDecodeError) as e:
+                logger.error(
+                    f"Batch request {record.get('custom_id')} failed: {record.get('error') or e}"
+                )
+        return results
+
+
+class AnthropicBatchClient(BatchClient):
+    """Client for the Anthropic Message Batches API (messages with a forced tool use)."""
+
+    def __init__(
+        self,
+        model_name: str,
+        api_key: str | None = None,
+        base_url: str | None = None,
+    ):
+        super().__init__(
+            model_name,
+            api_key or getenv("ANTHROPIC_API_KEY"),
+            base_url or getenv("ANTHROPIC_BASE_URL") or "https://api.anthropic.com/v1",
+        )
+
+    def _headers(self) -> dict[str, str]:
+        return {"x-api-key": self.api_key, "anthropic-version": ANTHROPIC_VERSION}
+
+    def build_request(
+        self, custom_id: str, prompt: str, tool: dict[str, Any]
+    ) -> dict[str, Any]:
+        function = tool["function"]
+        return {
+            "custom_id": custom_id,
+            "params": {
+                "model": self.model_name,
+                "max_tokens": ANTHROPIC_MAX_TOKENS,
+                "temperature": 0,
+                "messages": [{"role": "user", "content": prompt}],
+                "tools": [
+                    {
+                        "name": function["name"],
+                        "description": function["description"],
+                        "input_schema": function["parameters"],
+                    }
+                ],
+                "tool_choice": {"type": "tool", "name": function["name"]},
+            },
+        }
+
+    def submit(self, requests: list[dict[str, Any]]) -> str:
+        batch = self._request_json(
+            "POST", f"{self.base_url}/messages/batches", {"requests": requests}
+        )
+        return batch["id"]
+
+    def is_finished(self, batch_id: str) -> bool:
+        batch = self._request_json(
+            "GET", f"{self.base_url}/messages/batches/{batch_id}"
+        )
+        logger.info(f"Batch {batch_id} status: {batch['processing_status']}")
+        return batch["processing_status"] == "ended"
+
+    def get_results(self, batch_id: str) -> dict[str, dict[str, Any]]:
+        batch = self._request_json(
+            "GET", f"{self.base_url}/messages/batches/{batch_id}"
+        )
+        if not batch.get("results_url"):
+            raise ModelError(f"Batch {batch_id} has no results yet")
+
+        content = self._request("GET", batch["results_url"])
+
+        results = {}
+        for line in content.decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            result = record.get("result", {})
+            if result.get("type") != "succeeded":
+                logger.error(
+                    f"Batch request {record.get('custom_id')} failed: {result}"
+                )
+                continue
+            for block in result["message"]["content"]:
+                if block.get("type") == "tool_use":
+                    results[record["custom_id"]] = block["input"]
+                    break
+        return results
+
+
+BATCH_CLIENTS: dict[str, Type[BatchClient]] = {
+    "openai": OpenAIBatchClient,
+    "anthropic": AnthropicBatchClient,
+}
+
+
+def get_batch_client(provider: str, model_name: str) -> BatchClient:
+    """Create the batch API client for a provider."""
+    client_class = BATCH_CLIENTS.get(provider)
+    if client_class is None:
+        raise ValueError(f"Batch mode is not supported for provider {provider}")
+    return client_class(model_name)
+
+
+def run_batch(
+    client: BatchClient,
+    text_units: list[str],
+    PydanticModel: Type[BaseModel],
+    prompt: BasePromptTemplate = aesthemos_prompt,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+) -> list[Optional[BaseModel]]:
+    """
+    Run structured feature extraction for all text units as one batch job.
+
+    Args:
+        client (BatchClient): The provider's batch API client.
+        text_units (list[str]): The text units to process.
+        PydanticModel (Type[BaseModel]): The dynamic feature model to extract.
+        prompt (BasePromptTemplate): The prompt template, rendered with each text unit.
+        poll_interval (float): Seconds to wait between polls of the batch status.
+
+    Returns:
+        list[Optional[BaseModel]]: One result per text unit, in order. None for
+        units whose request failed or returned invalid output.
+    """
+    tool = convert_to_openai_tool(PydanticModel)
+    requests = [
+        client.build_request(f"unit-{i}", prompt.format(input=text), tool)
+        for i, text in enumerate(text_units)
+    ]
+
+    batch_id = client.submit(requests)
+    logger.info(f"Submitted batch {batch_id} with {len(requests)} requests")
+
+    while not client.is_finished(batch_id):
+        time.sleep(poll_interval)
+
+    raw_results = client.get_results(batch_id)
+
+    results = []
+    for i in range(len(text_units)):
+        arguments = raw_results.get(f"unit-{i}")
+        if arguments is None:
+            results.append(None)
+            continue
+        try:
+            results.append(PydanticModel.parse_obj(arguments))
+        except Exception as e:
+            logger.error(f"Invalid structured output for text unit {i}: {e}")
+            results.append(None)
+    return results
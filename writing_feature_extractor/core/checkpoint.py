@@ -0,0 +1,309 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Optional
+
+from writing_feature_extractor.core.custom_exceptions import FileOperationError
+from writing_feature_extractor.utils.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CHECKPOINT_FILE = "feature_extraction_checkpoint.jsonl"
+DEFAULT_DEAD_LETTER_FILE = "failed_units.jsonl"
+# Value of every feature of a text unit whose LLM call failed
+FAILED_VALUE = "ERROR"
+
+
+class CheckpointJournal:
+    """
+    Append-only journal of completed text units, one JSON line per unit.
+
+    Each record holds the index of the text unit, the SHA-256 hash of its
+    content and the extracted value of each feature, by feature label. Units
+    whose LLM call failed after all retries are recorded as failed, together
+    with their text, and form the dead letters of the run. Every record is
+    flushed and fsync'd before the next unit is recorded, so a run which dies
+    can be resumed without repeating completed units.
+
+    Only the hash and file offset of each completed unit of the previous run
+    are kept in memory, and its values are read back from the file when asked
+    for, while the units completed during the run are not kept at all. Memory
+    therefore stays small however long the input is. Failed units are kept
+    whole, for the dead letter file.
+
+    The record methods block on the fsync; async code should use arecord and
+    arecord_failure, which write on a worker thread.
+
+    Usage:
+        with CheckpointJournal("run.jsonl", resume=True) as checkpoint:
+            values = checkpoint.get(index, text, labels)
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CHECKPOINT_FILE,
+        resume: bool = False,
+        retry_failed: bool = False,
+    ):
+        """
+        Open the journal.
+
+        Args:
+            path (str): Path of the journal file.
+            resume (bool): If True, load the records of a previous run and append
+                to them. Otherwise, any previous journal is discarded.
+            retry_failed (bool): If True, the previous run is resumed and its
+                failed units are processed again. Otherwise they keep their
+                failed values.
+
+        Raises:
+            FileOperationError: If the journal cannot be read or opened.
+        """
+        self.path = path
+        self.retry_failed = retry_failed
+        resume = resume or retry_failed
+        self._lock = threading.Lock()
+        # Hash and file offset of each completed unit of the previous run
+        self._completed: dict[int, tuple[str, int]] = {}
+        # Records of the failed units, by index
+        self._failed: dict[int, dict[str, Any]] = {}
+        # Number of units newly completed during the run
+        self._completed_in_run = 0
+        self._reader = None
+
+        try:
+            needs_newline = resume and self._load()
+            if self._completed:
+                self._reader = open(path, "rb")
+            self._file = open(path, "a" if resume else "w", encoding="utf-8")
+            if needs_newline:
+                # Terminate a record truncated by the previous run
+                self._file.write("\n")
+        except OSError as e:
+            logger.error(f"Error opening checkpoint journal {path}: {e}")
+            raise FileOperationError(
+                f"Could not open the checkpoint journal {path}."
+            ) from e
+
+        if resume:
+            logger.info(
+                f"Resuming with {len(self._completed)} completed "
+                f"and {len(self._failed)} failed text units"
+            )
+
+    @staticmethod
+    def hash_text(text: str) -> str:
+        """Return the SHA-256 hash of a text unit."""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _load(self) -> bool:
+        """
+        Load the records of a previous run.
+
+        Returns:
+            bool: True if the journal ends with an incomplete record.
+        """
+        if not os.path.exists(self.path):
+            logger.info(f"No checkpoint journal found at {self.path}")
+            return False
+
+        offset = 0
+        line = b""
+        with open(self.path, "rb") as f:
+            for line in f:
+                self._load_record(line, offset)
+                offset += len(line)
+
+        return len(line) > 0 and not line.endswith(b"\n")
+
+    def _load_record(self, line: bytes, offset: int) -> None:
+        """Make a journal line of the previous run the current record of its unit."""
+        if not line.strip():
+            return
+        try:
+            record = json.loads(line)
+            index = record["index"]
+            if record.get("failed"):
+                self._completed.pop(index, None)
+                self._failed[index] = record
+            else:
+                self._failed.pop(index, None)
+                self._completed[index] = (record["sha256"], offset)
+        except (UnicodeDecodeError, json.JSONDecodeError, KeyError, TypeError):
+            logger.warning(f"Ignoring incomplete checkpoint record: {line[:50]!r}")
+
+    def _read_values(self, offset: int) -> Optional[dict[str, Any]]:
+        """Read the feature values of the record at an offset of the journal."""
+        try:
+            self._reader.seek(offset)
+            return json.loads(self._reader.readline())["values"]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Could not read checkpoint record at {offset}: {e}")
+            return None
+
+    def get(self, index: int, text: str, labels: list[str]) -> Optional[list[Any]]:
+        """
+        Return the journaled values of a text unit of the previous run.
+
+        Args:
+            index (int): Index of the text unit in the run.
+            text (str): Content of the text unit.
+            labels (list[str]): The feature labels whose values are needed.
+
+        Returns:
+            Optional[list[Any]]: One value per label, FAILED_VALUE for each label
+            of a failed unit, or None if the unit is not journaled, its content
+            changed, a feature is missing, or it failed and is to be retried.
+        """
+        failed = self._failed.get(index)
+        if failed is not None:
+            if failed["sha256"] != self.hash_text(text) or self.retry_failed:
+                return None
+            return [FAILED_VALUE] * len(labels)
+        completed = self._completed.get(index)
+        if completed is None or completed[0] != self.hash_text(text):
+            return None
+        values = self._read_values(completed[1])
+        if values is None or not all(label in values for label in labels):
+            return None
+        return [values[label] for label in labels]
+
+    def record(self, index: int, text: str, values: dict[str, Any]) -> None:
+        """
+        Durably record a completed text unit.
+
+        Args:
+            index (int): Index of the text unit in the run.
+            text (str): Content of the text unit.
+            values (dict[str, Any]): The extracted value of each feature, by label.
+
+        Raises:
+            FileOperationError: If the record cannot be written.
+        """
+        self._write({"index": index, "sha256": self.hash_text(text), "values": values})
+
+    def record_failure(self, index: int, text: str) -> None:
+        """
+        Durably record a text unit whose LLM call failed.
+
+        Args:
+            index (int): Index of the text unit in the run.
+            text (str): Content of the text unit.
+
+        Raises:
+            FileOperationError: If the record cannot be written.
+        """
+        self._write(
+            {
+                "index": index,
+                "sha256": self.hash_text(text),
+                "failed": True,
+                "text": text,
+            }
+        )
+
+    async def arecord(self, index: int, text: str, values: dict[str, Any]) -> None:
+        """Durably record a completed text unit, without blocking the event loop."""
+        await asyncio.to_thread(self.record, index, text, values)
+
+    async def arecord_failure(self, index: int, text: str) -> None:
+        """Durably record a failed text unit, without blocking the event loop."""
+        await asyncio.to_thread(self.record_failure, index, text)
+
+    def _write(self, record: dict[str, Any]) -> None:
+        """Append a record to the journal, and make it the unit's current record."""
+        line = json.dumps(record, default=str)
+        try:
+            # Records may be written from several threads, one line at a time
+            with self._lock:
+                self._update_current(record)
+                self._file.write(line + "\n")
+                self._file.flush()
+                os.fsync(self._file.fileno())
+        except OSError as e:
+            logger.error(f"Error writing to checkpoint journal {self.path}: {e}")
+            raise FileOperationError(
+                f"Could not write to the checkpoint journal {self.path}."
+            ) from e
+
+    def _update_current(self, record: dict[str, Any]) -> None:
+        """Make a record written during the run the current record of its unit."""
+        index = record["index"]
+        if record.get("failed"):
+            self._completed.pop(index, None)
+            self._failed[index] = record
+            return
+        # Units completed during the run are only counted
+        self._completed.pop(index, None)
+        self._failed.pop(index, None)
+        self._completed_in_run += 1
+
+    def failed_units(self) -> list[dict[str, Any]]:
+        """Return the records of the failed text units, in index order."""
+        return [self._failed[index] for index in sorted(self._failed)]
+
+    def write_dead_letters(self, path: str = DEFAULT_DEAD_LETTER_FILE) -> int:
+        """
+        Write the failed text units to a JSON lines file.
+
+        The file is only written if there are failed text units. Otherwise,
+        the dead letter file of a previous run is removed, since its units
+        have all succeeded since.
+
+        Args:
+            path (str): Path of the dead letter file.
+
+        Returns:
+            int: The number of failed text units.
+
+        Raises:
+            FileOperationError: If the file cannot be written.
+        """
+        failed = self.failed_units()
+        if not failed:
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+                    logger.info(f"Removed dead letter file {path}: no failed units")
+            except OSError as e:
+                logger.error(f"Error removing dead letter file {path}: {e}")
+                raise FileOperationError(
+                    f"Could not remove the dead letter file {path}."
+                ) from e
+            return 0
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                for record in failed:
+                    f.write(
+                        json.dumps({"index": record["index"], "text": record["text"]})
+                        + "\n"
+                    )
+        except OSError as e:
+            logger.error(f"Error writing dead letter file {path}: {e}")
+            raise FileOperationError(
+                f"Could not write the dead letter file {path}."
+            ) from e
+
+        logger.warning(
+            f"{len(failed)} text units failed, see {path}. "
+            "Run again with --retry-failed to process them again."
+        )
+        return len(failed)
+
+    def __len__(self) -> int:
+        """Number of text units in the journal."""
+        return len(self._completed) + len(self._failed) + self._completed_in_run
+
+    def close(self) -> None:
+        """Close the journal file."""
+        self._file.close()
+        if self._reader is not None:
+            self._reader.close()
+
+    def __enter__(self) -> "CheckpointJournal":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -0,0 +1,253 @@
+import asyncio
+import os
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Tuple
+
+from langchain_core.language_models import LanguageModelInput
+from langchain_core.pydantic_v1 import BaseModel
+from langchain_core.runnables import Runnable
+
+from writing_feature_extractor.core.checkpoint import CheckpointJournal
+from writing_feature_extractor.core.custom_exceptions import FeatureExtractorError
+from writing_feature_extractor.core.feature_extraction import (
+    DEFAULT_CONCURRENCY,
+    DEFAULT_MAX_PENDING,
+    DEFAULT_TRIANGULATION_TIMEOUT,
+    aextract_row,
+    create_metrics_executor,
+)
+from writing_feature_extractor.features.writing_feature import WritingFeature
+from writing_feature_extractor.utils.logger_config import get_logger
+from writing_feature_extractor.utils.save_results_to_csv import IncrementalCSVWriter
+from writing_feature_extractor.utils.text_processing import (
+    ExtractionMode,
+    get_output_csv_file,
+    iter_sections,
+    iter_text_units,
+)
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_ACTIVE_BOOKS = 8
+CHECKPOINT_SUFFIX = ".checkpoint.jsonl"
+DEAD_LETTER_SUFFIX = ".failed.jsonl"
+
+
+@dataclass
+class CorpusBook:
+    """The progress of one book of a corpus run, while its output is open."""
+
+    path: str
+    text_units: Iterator[str]
+    writer: IncrementalCSVWriter
+    checkpoint: CheckpointJournal
+    units_read: int = 0
+    units_written: int = 0
+    fully_read: bool = False
+    failed: bool = False
+    completed: dict[int, Tuple[str, list[Any], dict[str, Any]]] = field(
+        default_factory=dict
+    )
+
+
+def extract_corpus_features(
+    file_paths: list[str],
+    output_dir: str,
+    mode: ExtractionMode | str,
+    feature_collectors: list[WritingFeature],
+    llm: Runnable[LanguageModelInput, BaseModel],
+    triangulation_llms: list[Runnable[LanguageModelInput, BaseModel]] | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    triangulation_timeout: float = DEFAULT_TRIANGULATION_TIMEOUT,
+    max_pending: int = DEFAULT_MAX_PENDING,
+    max_active_books: int = DEFAULT_MAX_ACTIVE_BOOKS,
+    resume: bool = False,
+    retry_failed: bool = False,
+) -> dict[str, int]:
+    """
+    Extract features from many books through one global work queue.
+
+    The text units of the books are read lazily and interleaved round-robin
+    into a single queue, served by `concurrency` workers which share the same
+    LLM runnable, so the request budget is never idle between books. Up to
+    `max_active_books` books are read at a time; when a book is fully read,
+    the next one is started. Each book is written to its own CSV file in the
+    output directory, in the order of its text units, next to its own
+    checkpoint journal. At most `max_pending` text units are held in memory.
+    The text units of a book which failed after all retries are listed in a
+    dead letter file next to its CSV file.
+
+    A book which cannot be read is logged and skipped.
+
+    Args:
+        file_paths (list[str]): The text files of the books.
+        output_dir (str): Directory of the CSV files and checkpoint journals.
+        mode (ExtractionMode | str): The extraction mode (PARAGRAPH or SECTION).
+        feature_collectors (list[WritingFeature]): List of writing features to extract.
+        llm (Runnable[LanguageModelInput, BaseModel]): The main language model.
+        triangulation_llms (list[Runnable[LanguageModelInput, BaseModel]] | None):
+            Optional list of triangulation language models.
+        concurrency (int): Maximum number of concurrent LLM requests.
+        triangulation_timeout (float): Seconds to wait for each triangulation member.
+        max_pending (int): Maximum number of text units held in memory.
+        max_active_books (int): Maximum number of books read at the same time.
+        resume (bool): Skip the text units in the checkpoint journal of each book.
+        retry_failed (bool): Resume, and process the failed text units of the
+            checkpoint journals again rather than keeping their failed values.
+
+    Returns:
+        dict[str, int]: The number of text units written for each completed book.
+
+    Raises:
+        FileOperationError: If an output file cannot be opened or written.
+    """
+    return asyncio.run(
+        aextract_corpus_features(
+            file_paths,
+            output_dir,
+            mode,
+            feature_collectors,
+            llm,
+            triangulation_llms,
+            concurrency,
+            triangulation_timeout,
+            max_pending,
+            max_active_books,
+            resume,
+            retry_failed,
+        )
+    )
+
+
+async def aextract_corpus_features(
+    file_paths: list[str],
+    output_dir: str,
+    mode: ExtractionMode | str,
+    feature_collectors: list[WritingFeature],
+    llm: Runnable[LanguageModelInput, BaseModel],
+    triangulation_llms: list[Runnable[LanguageModelInput, BaseModel]] | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    triangulation_timeout: float = DEFAULT_TRIANGULATION_TIMEOUT,
+    max_pending: int = DEFAULT_MAX_PENDING,
+    max_active_books: int = DEFAULT_MAX_ACTIVE_BOOKS,
+    resume: bool = False,
+    retry_failed: bool = False,
+) -> dict[str, int]:
+    """Async implementation of extract_corpus_features."""
+    workers = max(1, concurrency)
+    window = asyncio.Semaphore(max(max_pending, workers))
+    queue: asyncio.Queue = asyncio.Queue(maxsize=workers)
+    waiting = deque(file_paths)
+    # Books being read, in round-robin order
+    active: deque[CorpusBook] = deque()
+    open_books: list[CorpusBook] = []
+    processed: dict[str, int] = {}
+    executor = create_metrics_executor(max(max_pending, workers), chunk_size=1)
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    def start_books() -> None:
+        while waiting and len(active) < max(1, max_active_books):
+            path = waiting.popleft()
+            csv_file = get_output_csv_file(path, output_dir)
+            book = CorpusBook(
+                path,
+                iter_text_units(iter_sections(path), mode),
+                IncrementalCSVWriter(feature_collectors, csv_file).open(),
+                CheckpointJournal(
+                    os.path.splitext(csv_file)[0] + CHECKPOINT_SUFFIX,
+                    resume,
+                    retry_failed,
+                ),
+            )
+            logger.info(f"Starting {path}")
+            active.append(book)
+            open_books.append(book)
+
+    def close_book(book: CorpusBook) -> None:
+        book.writer.close()
+        book.checkpoint.write_dead_letters(
+            os.path.splitext(book.writer.filename)[0] + DEAD_LETTER_SUFFIX
+        )
+        book.checkpoint.close()
+        open_books.remove(book)
+
+    def finish_if_done(book: CorpusBook) -> None:
+        if not book.fully_read or book.units_written < book.units_read:
+            return
+        close_book(book)
+        if not book.failed:
+            processed[book.path] = book.units_written
+            logger.info(f"Finished {book.path}: {book.units_written} text units")
+
+    def next_text_unit() -> Tuple[CorpusBook, int, str] | None:
+        while active:
+            book = active.popleft()
+            try:
+                text = next(book.text_units, None)
+            except FeatureExtractorError as e:
+                logger.error(f"Skipping {book.path}: {e}")
+                book.failed = True
+                text = None
+            if text is None:
+                book.fully_read = True
+                finish_if_done(book)
+                start_books()
+                continue
+            active.append(book)
+            book.units_read += 1
+            return book, book.units_read - 1, text
+        return None
+
+    async def produce() -> None:
+        start_books()
+        while True:
+            await window.acquire()
+            item = next_text_unit()
+            if item is None:
+                break
+            await queue.put(item)
+        for _ in range(workers):
+            await queue.put(None)
+
+    def write_completed(book: CorpusBook) -> None:
+        while book.units_written in book.completed:
+            text, values, metrics = book.completed.pop(book.units_written)
+            book.writer.write_row(text, values, metrics)
+            book.units_written += 1
+            window.release()
+        finish_if_done(book)
+
+    async def work() -> None:
+        while (item := await queue.get()) is not None:
+            book, index, text = item
+            book.completed[index] = (
+                text,
+                *await aextract_row(
+                    index,
+                    text,
+                    feature_collectors,
+                    llm,
+                    executor,
+                    triangulation_llms,
+                    triangulation_timeout,
+                    book.checkpoint,
+                ),
+            )
+            write_completed(book)
+
+    tasks = [asyncio.create_task(produce())] + [
+        asyncio.create_task(work()) for _ in range(workers)
+    ]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        for book in list(open_books):
+            close_book(book)
+        executor.shutdown(cancel_futures=True)
+
+    logger.info(f"Processed {len(processed)}/{len(file_paths)} books")
+    return processed
@@ -16,6 +16,12 @@ class ModelError(FeatureExtractorError):
     pass
 
 
+class OutputValidationError(ModelError):
+    """Raised when the LLM output does not match the feature model."""
+
+    pass
+
+
 class GraphError(FeatureExtractorError):
     """Raised when there's a probllem graphing"""
 
@@ -1,22 +1,67 @@
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
 from enum import Enum
-from typing import Any, Tuple
+from itertools import accumulate
+from typing import Any, Awaitable, Callable, Iterable, Tuple, Type
 from langchain_core.language_models import LanguageModelInput
 from langchain_core.pydantic_v1 import BaseModel
 from langchain_core.runnables import Runnable
 
+from writing_feature_extractor.core.batch_api import (
+    DEFAULT_POLL_INTERVAL,
+    BatchClient,
+    run_batch,
+)
+from writing_feature_extractor.core.checkpoint import CheckpointJournal
+from writing_feature_extractor.core.packing import (
+    format_packed_input,
+    get_max_units_per_pack,
+    pack_text_units,
+    unpack_results,
+)
+from writing_feature_extractor.core.result_cache import (
+    acache_result,
+    aget_cached_result,
+)
+from writing_feature_extractor.core.retry import ainvoke_with_retry
+from writing_feature_extractor.features.enum_lookup import get_enum_lookup
 from writing_feature_extractor.features.result_collection_mode import (
     ResultCollectionMode,
 )
+from writing_feature_extractor.features.result_matrix import ResultMatrix
 from writing_feature_extractor.features.writing_feature import WritingFeature
 from writing_feature_extractor.utils.logger_config import get_logger
-from writing_feature_extractor.utils.save_results_to_csv import save_results_to_csv
+from writing_feature_extractor.utils.save_results_to_csv import IncrementalCSVWriter
+from writing_feature_extractor.utils.syllables import (
+    get_syllable_table_path,
+    load_syllable_table,
+)
 from writing_feature_extractor.utils.text_metrics import (
+    MetricsBatch,
     combine_short_strings,
+    compute_metrics_batch,
     get_text_statistics,
+    split_into_chunks,
+)
+from writing_feature_extractor.utils.text_processing import (
+    ExtractionMode,
+    get_extraction_mode,
+    iter_text_units,
+    split_into_text_units,
 )
 
 logger = get_logger(__name__)
 
+DEFAULT_CONCURRENCY = 8
+DEFAULT_TRIANGULATION_TIMEOUT = 60.0
+DEFAULT_PACKING_TOKEN_BUDGET = 2000
+DEFAULT_MAX_PENDING = 64
+DEFAULT_METRICS_CHUNK_SIZE = 64
+
+# Called with the index and the paragraphs of each completed section
+SectionCallback = Callable[[int, list[str]], None]
+
 
 def process_feature_with_triangulation(
     result: BaseModel, triangulation_results: list[BaseModel], feature: WritingFeature
@@ -30,7 +75,24 @@ def process_feature_with_triangulation(
         feature (WritingFeature): The writing feature being processed.
 
     This function compares the main LLM result with triangulation results and
-    determines the final result based on the feature's result collection mode.
+    adds the final result, determined by get_triangulated_result, to the feature.
+    """
+    feature.add_result(get_triangulated_result(result, triangulation_results, feature))
+
+
+def get_triangulated_result(
+    result: BaseModel, triangulation_results: list[BaseModel], feature: WritingFeature
+) -> Any:
+    """
+    Determine the result of a feature from the main and triangulation results.
+
+    Args:
+        result (BaseModel): The main LLM result.
+        triangulation_results (list[BaseModel]): Results from triangulation LLMs.
+        feature (WritingFeature): The writing feature being processed.
+
+    Returns:
+        Any: The triangulated result, based on the feature's result collection mode.
     """
     result_dict = result.dict()
     feature_results = [
@@ -53,11 +115,8 @@ def process_feature_with_triangulation(
         logger.info(
             f"Triangulated result is different from main LLM: Average: {triangulated_result}, Main LLM: {result_dict[feature.pydantic_feature_label]}"
         )
-    logger.info(
-        f"Adding result [{triangulated_result}] for feature: [{feature.pydantic_feature_label}]"
-    )
 
-    feature.add_result(triangulated_result)
+    return triangulated_result
 
 
 def get_triangulated_number_representation(
@@ -74,16 +133,20 @@ def get_triangulated_number_representation(
     Returns:
         Enum: The triangulated result as an Enum value.
     """
+    main_result = result_dict[feature.pydantic_feature_label]
+    lookup = get_enum_lookup(feature.pydantic_feature_type)
+    # Positions in the enum, without results which are not a level of the feature
     tri_results_as_ints = [
-        feature.get_int_for_enum(feature_result) for feature_result in feature_results
+        index
+        for index in map(lookup.index_of, [*feature_results, main_result])
+        if index is not None
     ]
-    tri_results_as_ints.append(
-        feature.get_int_for_enum(result_dict[feature.pydantic_feature_label])
-    )
+    if not tri_results_as_ints:
+        return main_result
 
     # Get floor of average of triangulation results
     floor_of_average = int(sum(tri_results_as_ints) / len(tri_results_as_ints))
-    average_as_enum = list(feature.pydantic_feature_type)[floor_of_average]
+    average_as_enum = lookup.members[floor_of_average]
 
     return average_as_enum
 
@@ -113,6 +176,7 @@ def process_text(
     feature_collectors: list[WritingFeature],
     llm: Runnable[LanguageModelInput, BaseModel],
     triangulation_llms: list[Runnable[LanguageModelInput, BaseModel]] | None = None,
+    triangulation_timeout: float = DEFAULT_TRIANGULATION_TIMEOUT,
 ) -> None:
     """
     Run LLM on a text to perform feature extraction.
@@ -123,73 +187,475 @@ def process_text(
         llm (Runnable[LanguageModelInput, BaseModel]): The main language model.
         triangulation_llms (list[Runnable[LanguageModelInput, BaseModel]] | None):
             Optional list of triangulation language models.
+        triangulation_timeout (float): Seconds to wait for each triangulation member.
 
     This function processes the input text using the main LLM and optional
     triangulation LLMs to extract writing features.
     """
-    triangulation_results = []
-    try:
-        result = llm.invoke(input=text)
-        logger.debug(f"LLM Result: [{str(result)}]")
-        result_dict = result.dict()
-        if triangulation_llms:
-            get_triangulation_results(text, triangulation_llms, triangulation_results)
-    except Exception as e:
-        logger.error("Error invoking the LLM", e)
+    result, triangulation_results = asyncio.run(
+        ainvoke_llms(text, llm, triangulation_llms, triangulation_timeout)
+    )
+    record_results(result, triangulation_results, feature_collectors)
+
+
+async def ainvoke_llms(
+    text: str,
+    llm: Runnable[LanguageModelInput, BaseModel],
+    triangulation_llms: list[Runnable[LanguageModelInput, BaseModel]] | None = None,
+    triangulation_timeout: float = DEFAULT_TRIANGULATION_TIMEOUT,
+) -> Tuple[BaseModel | None, list[BaseModel]]:
+    """
+    Asynchronously run the main LLM and the triangulation LLMs on a text.
+
+    The main LLM and all triangulation members are invoked concurrently.
+    Transient failures of the main LLM are retried with backoff.
+
+    Args:
+        text (str): The input text to process.
+        llm (Runnable[LanguageModelInput, BaseModel]): The main language model.
+        triangulation_llms (list[Runnable[LanguageModelInput, BaseModel]] | None):
+            Optional list of triangulation language models.
+        triangulation_timeout (float): Seconds to wait for each triangulation member.
+
+    Returns:
+        Tuple[BaseModel | None, list[BaseModel]]: The main LLM result (None if the
+        invocation failed after its retries) and the results of the triangulation members which
+        answered in time.
+    """
+    result, triangulation_results = await asyncio.gather(
+        ainvoke_with_retry(llm, text),
+        get_triangulation_results(
+            text, triangulation_llms or [], triangulation_timeout
+        ),
+        return_exceptions=True,
+    )
+
+    if isinstance(result, Exception):
+        logger.error(f"Error invoking the LLM: {result}")
         logger.debug(f"Text: {text},  llm: {llm}")
-        result_dict = {}
+        return None, []
+    logger.debug(f"LLM Result: [{str(result)}]")
+
+    if isinstance(triangulation_results, Exception):
+        logger.error(f"Error getting triangulation results: {triangulation_results}")
+        triangulation_results = []
+
+    return result, triangulation_results
+
+
+def resolve_results(
+    result: BaseModel | None,
+    triangulation_results: list[BaseModel],
+    feature_collectors: list[WritingFeature],
+) -> list[Any]:
+    """
+    Determine the extracted value of each feature for one text unit.
 
+    Args:
+        result (BaseModel | None): The main LLM result, or None if the LLM failed.
+        triangulation_results (list[BaseModel]): Results from triangulation LLMs.
+        feature_collectors (list[WritingFeature]): List of writing features to extract.
+
+    Returns:
+        list[Any]: One value per feature collector. "ERROR" if the value is missing.
+    """
+    result_dict = result.dict() if result is not None else {}
+
+    values = []
     for feature in feature_collectors:
         if len(triangulation_results) > 0:
-            process_feature_with_triangulation(result, triangulation_results, feature)
+            value = get_triangulated_result(result, triangulation_results, feature)
         else:
-            logger.info(
-                f"Adding result [{result_dict.get(feature.pydantic_feature_label, 'ERROR')}] for feature: [{feature.pydantic_feature_label}]"
-            )
-            feature.add_result(result_dict.get(feature.pydantic_feature_label, "ERROR"))
+            value = result_dict.get(feature.pydantic_feature_label, "ERROR")
+        logger.info(
+            f"Adding result [{value}] for feature: [{feature.pydantic_feature_label}]"
+        )
+        values.append(value)
+    return values
 
 
-def get_triangulation_results(
+async def arecord_unit(
+    checkpoint: CheckpointJournal,
+    index: int,
     text: str,
-    triangulation_llms: list[Runnable[LanguageModelInput, BaseModel]],
+    result: BaseModel | None,
+    labels: list[str],
+    values: list[Any],
+) -> None:
+    """
+    Journal a text unit as completed, or as failed if the LLM gave no result.
+
+    The record is written on a worker thread, so its fsync does not block the
+    requests in flight.
+
+    Args:
+        checkpoint (CheckpointJournal): The journal of the run.
+        index (int): Index of the text unit in the run.
+        text (str): The text unit.
+        result (BaseModel | None): The main LLM result, or None if the LLM failed.
+        labels (list[str]): The feature labels.
+        values (list[Any]): The resolved value of each feature.
+    """
+    if result is None:
+        await checkpoint.arecord_failure(index, text)
+    else:
+        await checkpoint.arecord(index, text, dict(zip(labels, values)))
+
+
+def record_results(
+    result: BaseModel | None,
     triangulation_results: list[BaseModel],
+    feature_collectors: list[WritingFeature],
+) -> None:
+    """
+    Add the results of one text unit to each feature collector.
+
+    Args:
+        result (BaseModel | None): The main LLM result, or None if the LLM failed.
+        triangulation_results (list[BaseModel]): Results from triangulation LLMs.
+        feature_collectors (list[WritingFeature]): List of writing features to extract.
+    """
+    values = resolve_results(result, triangulation_results, feature_collectors)
+    for feature, value in zip(feature_collectors, values):
+        feature.add_result(value)
+
+
+async def process_text_units(
+    text_units: list[str],
+    feature_collectors: list[WritingFeature],
+    llm: Runnable[LanguageModelInput, BaseModel],
+    triangulation_llms: list[Runnable[LanguageModelInput, BaseModel]] | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    triangulation_timeout: float = DEFAULT_TRIANGULATION_TIMEOUT,
+    packed_llm: Runnable[LanguageModelInput, BaseModel] | None = None,
+    packing_token_budget: int = DEFAULT_PACKING_TOKEN_BUDGET,
+    checkpoint: CheckpointJournal | None = None,
+    start_index: int = 0,
+    results: ResultMatrix | None = None,
 ) -> None:
     """
-    Get results from triangulation LLMs and append them to the triangulation_results list.
+    Run feature extraction on several text units concurrently.
+
+    At most `concurrency` text units are in flight at any time. Results are
+    added to the feature collectors in the original order of the text units,
+    so the collected results are identical to those of a sequential run.
+
+    Args:
+        text_units (list[str]): The text units (paragraphs or sections) to process.
+        feature_collectors (list[WritingFeature]): List of writing features to extract.
+        llm (Runnable[LanguageModelInput, BaseModel]): The main language model.
+        triangulation_llms (list[Runnable[LanguageModelInput, BaseModel]] | None):
+            Optional list of triangulation language models.
+        concurrency (int): Maximum number of text units processed at the same time.
+        triangulation_timeout (float): Seconds to wait for each triangulation member.
+        packed_llm (Runnable[LanguageModelInput, BaseModel] | None): Optional language
+            model with the packed feature model as structured output. If given,
+            several text units are sent per LLM call.
+        packing_token_budget (int): Maximum estimated number of tokens of the text
+            units in one packed call.
+        checkpoint (CheckpointJournal | None): Optional journal. Text units found in
+            it are not sent to the LLM, and completed units are recorded in it.
+        start_index (int): Index of the first text unit in the run, used to
+            identify the units in the checkpoint journal.
+        results (ResultMatrix | None): The result matrix of the run. If None, the
+            results are added to the current results of each feature.
+    """
+    unit_values = await aresolve_text_units(
+        text_units,
+        feature_collectors,
+        llm,
+        asyncio.Semaphore(max(1, concurrency)),
+        triangulation_llms,
+        triangulation_timeout,
+        packed_llm,
+        packing_token_budget,
+        checkpoint,
+        start_index,
+    )
+    add_unit_values(unit_values, feature_collectors, results)
+
+
+def add_unit_values(
+    unit_values: list[list[Any]],
+    feature_collectors: list[WritingFeature],
+    results: ResultMatrix | None = None,
+) -> None:
+    """Add the resolved values of each text unit to the result matrix, or to the
+    feature collectors if there is none, in order."""
+    for values in unit_values:
+        if results is not None:
+            results.add_row(values)
+        else:
+            for feature, value in zip(feature_collectors, values):
+                feature.add_result(value)
+
+
+async def aresolve_text_units(
+    text_units: list[str],
+    feature_collectors: list[WritingFeature],
+    llm: Runnable[LanguageModelInput, BaseModel],
+    semaphore: asyncio.Semaphore,
+    triangulation_llms: list[Runnable[LanguageModelInput, BaseModel]] | None = None,
+    triangulation_timeout: float = DEFAULT_TRIANGULATION_TIMEOUT,
+    packed_llm: Runnable[LanguageModelInput, BaseModel] | None = None,
+    packing_token_budget: int = DEFAULT_PACKING_TOKEN_BUDGET,
+    checkpoint: CheckpointJournal | None = None,
+    start_index: int = 0,
+) -> list[list[Any]]:
+    """
+    Resolve the feature values of several text units concurrently.
+
+    Unlike process_text_units, the values are returned rather than added to the
+    feature collectors, and the requests are limited by a semaphore which may
+    be shared with other calls.
+
+    Args:
+        text_units (list[str]): The text units (paragraphs or sections) to process.
+        feature_collectors (list[WritingFeature]): List of writing features to extract.
+        llm (Runnable[LanguageModelInput, BaseModel]): The main language model.
+        semaphore (asyncio.Semaphore): Limits the number of concurrent requests.
+        triangulation_llms (list[Runnable[LanguageModelInput, BaseModel]] | None):
+            Optional list of triangulation language models.
+        triangulation_timeout (float): Seconds to wait for each triangulation member.
+        packed_llm (Runnable[LanguageModelInput, BaseModel] | None): Optional language
+            model with the packed feature model as structured output.
+        packing_token_budget (int): Maximum estimated number of tokens per packed call.
+        checkpoint (CheckpointJournal | None): Optional journal of completed text units.
+        start_index (int): Index of the first text unit in the run.
+
+    Returns:
+        list[list[Any]]: The values of each text unit, one per feature collector.
+    """
+    labels = [feature.pydantic_feature_label for feature in feature_collectors]
+    unit_values: list[list[Any] | None] = [None] * len(text_units)
+
+    remaining = []
+    for i, text in enumerate(text_units):
+        if checkpoint is not None:
+            unit_values[i] = checkpoint.get(start_index + i, text, labels)
+        if unit_values[i] is None:
+            remaining.append(i)
+    if len(remaining) < len(text_units):
+        logger.info(
+            f"Skipping {len(text_units) - len(remaining)} text units found in the checkpoint"
+        )
+
+    async def complete(
+        i: int, result: BaseModel | None, triangulation_results: list[BaseModel]
+    ) -> None:
+        values = resolve_results(result, triangulation_results, feature_collectors)
+        if checkpoint is not None:
+            await arecord_unit(
+                checkpoint, start_index + i, text_units[i], result, labels, values
+            )
+        unit_values[i] = values
+
+    async def run(text: str) -> Tuple[BaseModel | None, list[BaseModel]]:
+        async with semaphore:
+            return await ainvoke_llms(
+                text, llm, triangulation_llms, triangulation_timeout
+            )
+
+    async def run_and_complete(i: int) -> None:
+        await complete(i, *await run(text_units[i]))
+
+    if packed_llm is not None and triangulation_llms:
+        logger.warning("Packing is not used together with triangulation LLMs")
+        packed_llm = None
+
+    if packed_llm is None:
+        await asyncio.gather(*(run_and_complete(i) for i in remaining))
+    else:
+        outcomes = await ainvoke_packed_llm(
+            [text_units[i] for i in remaining],
+            packed_llm,
+            packing_token_budget,
+            semaphore,
+            run,
+            llm,
+            get_max_units_per_pack(len(feature_collectors)),
+        )
+        await asyncio.gather(
+            *(
+                complete(i, result, triangulation_results)
+                for i, (result, triangulation_results) in zip(remaining, outcomes)
+            )
+        )
+
+    return unit_values
+
+
+async def ainvoke_packed_llm(
+    text_units: list[str],
+    packed_llm: Runnable[LanguageModelInput, BaseModel],
+    token_budget: int,
+    semaphore: asyncio.Semaphore,
+    run_single: Callable[[str], Awaitable[Tuple[BaseModel | None, list[BaseModel]]]],
+    llm: Runnable[LanguageModelInput, BaseModel] | None = None,
+    max_units: int | None = None,
+) -> list[Tuple[BaseModel | None, list[BaseModel]]]:
+    """
+    Run feature extraction on packs of several text units per LLM call.
+
+    Text units are packed into numbered paragraphs up to the token budget and
+    the number of units whose answer fits the output limit. Units which are
+    missing or misaligned in the packed answer are re-requested individually.
+
+    Results are cached per text unit through the main LLM, so that packed and
+    unpacked runs share the cache: units already cached are not packed, and
+    each unpacked result is stored under its own text unit.
+
+    Args:
+        text_units (list[str]): The text units to process.
+        packed_llm (Runnable[LanguageModelInput, BaseModel]): Language model with the
+            packed (list-valued) feature model as structured output.
+        token_budget (int): Maximum estimated number of tokens of the text units in a pack.
+        semaphore (asyncio.Semaphore): Limits the number of concurrent requests.
+        run_single (Callable): Processes a single text unit with the main LLM.
+        llm (Runnable[LanguageModelInput, BaseModel] | None): The main language
+            model, whose cache is used for each text unit.
+        max_units (int | None): Maximum number of text units in a pack.
+
+    Returns:
+        list[Tuple[BaseModel | None, list[BaseModel]]]: The result of each text
+        unit, in order, with no triangulation results.
+    """
+
+    cached: list[BaseModel | None] = [None] * len(text_units)
+    if llm is not None:
+        cached = await asyncio.gather(
+            *(aget_cached_result(llm, text) for text in text_units)
+        )
+    uncached = [i for i, result in enumerate(cached) if result is None]
+    if len(uncached) < len(text_units):
+        logger.info(
+            f"Found {len(text_units) - len(uncached)} text units in the result cache"
+        )
+
+    async def run_pack(pack: list[int]) -> list[Tuple[BaseModel | None, list]]:
+        texts = [text_units[uncached[i]] for i in pack]
+        async with semaphore:
+            try:
+                packed_result = await packed_llm.ainvoke(
+                    input=format_packed_input(texts)
+                )
+                logger.debug(f"Packed LLM Result: [{str(packed_result)}]")
+            except Exception as e:
+                logger.error(f"Error invoking the packed LLM: {e}")
+                packed_result = None
+
+        results = unpack_results(packed_result, len(pack))
+        unpacked = [
+            (texts[i], result) for i, result in enumerate(results) if result is not None
+        ]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            logger.info(f"Re-requesting {len(missing)} text units individually")
+            retried = await asyncio.gather(*(run_single(texts[i]) for i in missing))
+            for i, (result, _) in zip(missing, retried):
+                results[i] = result
+
+        # Re-requested units are cached by the main LLM itself
+        if llm is not None:
+            await asyncio.gather(
+                *(acache_result(llm, text, result) for text, result in unpacked)
+            )
+
+        return [(result, []) for result in results]
+
+    packs = pack_text_units([text_units[i] for i in uncached], token_budget, max_units)
+    pack_outcomes = await asyncio.gather(*(run_pack(pack) for pack in packs))
+
+    outcomes: list[Tuple[BaseModel | None, list[BaseModel]]] = [
+        (result, []) for result in cached
+    ]
+    for pack, pack_outcome in zip(packs, pack_outcomes):
+        for i, outcome in zip(pack, pack_outcome):
+            outcomes[uncached[i]] = outcome
+    return outcomes
+
+
+async def get_triangulation_results(
+    text: str,
+    triangulation_llms: list[Runnable[LanguageModelInput, BaseModel]],
+    timeout: float = DEFAULT_TRIANGULATION_TIMEOUT,
+) -> list[BaseModel]:
+    """
+    Get results from all triangulation LLMs concurrently.
+
+    Members which raise an error or do not answer within the timeout are
+    dropped from the vote and logged, so they never stall the text unit.
 
     Args:
         text (str): The input text to process.
         triangulation_llms (list[Runnable[LanguageModelInput, BaseModel]]): List of triangulation language models.
-        triangulation_results (list[BaseModel]): List to store the results from triangulation LLMs.
+        timeout (float): Seconds to wait for each triangulation member.
+
+    Returns:
+        list[BaseModel]: The results of the members which answered in time.
     """
-    for llm in triangulation_llms:
-        tri_result = llm.invoke(input=text)
-        triangulation_results.append(tri_result)
-        logger.debug(f"Triangulation Member LLM Result: [{str(tri_result)}]")
+    outcomes = await asyncio.gather(
+        *(
+            asyncio.wait_for(tri_llm.ainvoke(input=text), timeout)
+            for tri_llm in triangulation_llms
+        ),
+        return_exceptions=True,
+    )
 
+    triangulation_results = []
+    for tri_llm, outcome in zip(triangulation_llms, outcomes):
+        if isinstance(outcome, asyncio.TimeoutError):
+            logger.warning(
+                f"Triangulation member timed out after {timeout}s and was dropped from the vote: {tri_llm}"
+            )
+        elif isinstance(outcome, Exception):
+            logger.warning(
+                f"Triangulation member failed and was dropped from the vote: {outcome}"
+            )
+        else:
+            logger.debug(f"Triangulation Member LLM Result: [{str(outcome)}]")
+            triangulation_results.append(outcome)
 
-class ExtractionMode(Enum):
-    PARAGRAPH = "paragraph"
-    SECTION = "section"
+    return triangulation_results
 
 
 def extract_features(
     sections: list[str],
-    mode: ExtractionMode,
+    mode: ExtractionMode | str,
     feature_collectors: list[WritingFeature],
     llm: Runnable[LanguageModelInput, BaseModel],
     triangulation_llms: list[Runnable[LanguageModelInput, BaseModel]] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    triangulation_timeout: float = DEFAULT_TRIANGULATION_TIMEOUT,
+    packed_llm: Runnable[LanguageModelInput, BaseModel] | None = None,
+    packing_token_budget: int = DEFAULT_PACKING_TOKEN_BUDGET,
+    checkpoint: CheckpointJournal | None = None,
+    interactive: bool = False,
+    on_section_complete: SectionCallback | None = None,
+    flush_interval: int = 1,
 ) -> Tuple[list[WritingFeature], list[str], dict[str, Any]]:
     """
     Extract features from the text based on the specified mode.
 
     Args:
         sections (list[str]): List of text sections to process.
-        mode (ExtractionMode): The extraction mode (PARAGRAPH or SECTION).
+        mode (ExtractionMode | str): The extraction mode (PARAGRAPH or SECTION).
         feature_collectors (list[WritingFeature]): List of writing features to extract.
         llm (Runnable[LanguageModelInput, BaseModel]): The main language model.
         triangulation_llms (list[Runnable[LanguageModelInput, BaseModel]]):
             Optional list of triangulation language models.
+        concurrency (int): Maximum number of concurrent LLM requests.
+        triangulation_timeout (float): Seconds to wait for each triangulation member.
+        packed_llm (Runnable[LanguageModelInput, BaseModel] | None): Optional language
+            model with the packed feature model as structured output.
+        packing_token_budget (int): Maximum estimated number of tokens per packed call.
+        checkpoint (CheckpointJournal | None): Optional journal of completed text
+            units. Units found in it are not sent to the LLM again.
+        interactive (bool): Paragraph mode only. Pause for review after each section.
+        on_section_complete (SectionCallback | None): Paragraph mode only. Called
+            after each section has been processed and saved.
+        flush_interval (int): Paragraph mode only. Number of CSV rows written
+            between flushes to disk.
 
     Returns:
         Tuple[list[WritingFeature], list[str], dict[str, Any]]:
@@ -199,19 +665,40 @@ def extract_features(
     Raises:
         ValueError: If an invalid extraction mode is provided.
     """
-    for feature in feature_collectors:
-        feature.results.clear()
+    mode = get_extraction_mode(mode)
+
+    # The results of the run are collected in one matrix, viewed by each feature
+    results = ResultMatrix(feature_collectors, len(sections))
 
     if mode == ExtractionMode.PARAGRAPH:
         return extract_features_paragraph_mode(
-            sections, feature_collectors, llm, triangulation_llms
+            sections,
+            feature_collectors,
+            llm,
+            triangulation_llms,
+            concurrency,
+            triangulation_timeout,
+            packed_llm,
+            packing_token_budget,
+            checkpoint,
+            interactive,
+            on_section_complete,
+            flush_interval,
+            results,
         )
-    elif mode == ExtractionMode.SECTION:
+    else:
         return extract_features_section_mode(
-            sections, feature_collectors, llm, triangulation_llms
+            sections,
+            feature_collectors,
+            llm,
+            triangulation_llms,
+            concurrency,
+            triangulation_timeout,
+            packed_llm,
+            packing_token_budget,
+            checkpoint,
+            results,
         )
-    else:
-        raise ValueError(f"Invalid mode: {mode}. Must be a valid ExtractionMode.")
 
 
 def extract_features_paragraph_mode(
@@ -219,35 +706,154 @@ def extract_features_paragraph_mode(
     feature_collectors: list[WritingFeature],
     llm: Runnable[LanguageModelInput, BaseModel],
     triangulation_llms: list[Runnable[LanguageModelInput, BaseModel]] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    triangulation_timeout: float = DEFAULT_TRIANGULATION_TIMEOUT,
+    packed_llm: Runnable[LanguageModelInput, BaseModel] | None = None,
+    packing_token_budget: int = DEFAULT_PACKING_TOKEN_BUDGET,
+    checkpoint: CheckpointJournal | None = None,
+    interactive: bool = False,
+    on_section_complete: SectionCallback | None = None,
+    flush_interval: int = 1,
+    results: ResultMatrix | None = None,
 ) -> Tuple[list[WritingFeature], list[str], dict[str, Any]]:
     """
     Extract features from the text in paragraph mode.
 
+    Runs unattended: the paragraphs of the next section are dispatched while
+    the results of the current section are collected and saved, and all
+    sections share the same limit of concurrent requests. In interactive mode,
+    the run pauses for review after each section, and the next section is only
+    dispatched once the user continues.
+
     Args:
         sections (list[str]): List of text sections to process.
         feature_collectors (list[WritingFeature]): List of writing features to extract.
         llm (Runnable[LanguageModelInput, BaseModel]): The main language model.
         triangulation_llms (list[Runnable[LanguageModelInput, BaseModel]]):
             Optional list of triangulation language models.
+        concurrency (int): Maximum number of concurrent LLM requests.
+        triangulation_timeout (float): Seconds to wait for each triangulation member.
+        packed_llm (Runnable[LanguageModelInput, BaseModel] | None): Optional language
+            model with the packed feature model as structured output.
+        packing_token_budget (int): Maximum estimated number of tokens per packed call.
+        checkpoint (CheckpointJournal | None): Optional journal of completed text
+            units. Units found in it are not sent to the LLM again.
+        interactive (bool): Pause for review after each section.
+        on_section_complete (SectionCallback | None): Called with the index and the
+            paragraphs of each section, once its results are collected and saved.
+        flush_interval (int): Number of CSV rows written between flushes to disk.
+            The file is also flushed after each section.
+        results (ResultMatrix | None): The result matrix of the run. If None, a
+            new matrix is created for the feature collectors.
 
     Returns:
         Tuple[list[WritingFeature], list[str], dict[str, Any]]:
             A tuple containing the updated feature collectors, processed paragraphs,
             and text metrics for each paragraph.
     """
+    return asyncio.run(
+        aextract_features_paragraph_mode(
+            sections,
+            feature_collectors,
+            llm,
+            triangulation_llms,
+            concurrency,
+            triangulation_timeout,
+            packed_llm,
+            packing_token_budget,
+            checkpoint,
+            interactive,
+            on_section_complete,
+            flush_interval,
+            results,
+        )
+    )
+
+
+async def aextract_features_paragraph_mode(
+    sections: list[str],
+    feature_collectors: list[WritingFeature],
+    llm: Runnable[LanguageModelInput, BaseModel],
+    triangulation_llms: list[Runnable[LanguageModelInput, BaseModel]] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    triangulation_timeout: float = DEFAULT_TRIANGULATION_TIMEOUT,
+    packed_llm: Runnable[LanguageModelInput, BaseModel] | None = None,
+    packing_token_budget: int = DEFAULT_PACKING_TOKEN_BUDGET,
+    checkpoint: CheckpointJournal | None = None,
+    interactive: bool = False,
+    on_section_complete: SectionCallback | None = None,
+    flush_interval: int = 1,
+    results: ResultMatrix | None = None,
+) -> Tuple[list[WritingFeature], list[str], dict[str, Any]]:
+    """Async implementation of extract_features_paragraph_mode."""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    section_paragraphs = [
+        combine_short_strings(section.split("\n")) for section in sections
+    ]
+    start_indices = list(
+        accumulate((len(paragraphs) for paragraphs in section_paragraphs), initial=0)
+    )
+    if results is None:
+        results = ResultMatrix(feature_collectors, start_indices[-1])
+    results.reserve(start_indices[-1])
+    executor = create_metrics_executor(start_indices[-1])
+    # The metrics of the whole book are submitted to the process pool up front
+    metrics_tasks = [
+        asyncio.ensure_future(acompute_metrics(paragraphs, executor))
+        for paragraphs in section_paragraphs
+    ]
+
+    def dispatch(k: int) -> asyncio.Task:
+        return asyncio.create_task(
+            aresolve_text_units(
+                section_paragraphs[k],
+                feature_collectors,
+                llm,
+                semaphore,
+                triangulation_llms,
+                triangulation_timeout,
+                packed_llm,
+                packing_token_budget,
+                checkpoint,
+                start_indices[k],
+            )
+        )
+
     text_units = []
     text_metrics = []
+    next_task = None
 
-    for section in sections:
-        paragraphs = combine_short_strings(section.split("\n"))
-        for paragraph in paragraphs:
-            process_text(paragraph, feature_collectors, llm, triangulation_llms)
-            text_metrics.append(get_text_statistics(paragraph))
-            text_units.append(paragraph)
+    try:
+        with IncrementalCSVWriter(
+            feature_collectors, flush_interval=flush_interval
+        ) as writer:
+            for k, paragraphs in enumerate(section_paragraphs):
+                task = next_task or dispatch(k)
+                next_task = None
+                if not interactive and k + 1 < len(section_paragraphs):
+                    # Keep the request slots busy while this section is saved
+                    next_task = dispatch(k + 1)
 
-        logger.info("Saving results to CSV...")
-        save_results_to_csv(feature_collectors, text_metrics, text_units)
-        input("Press Enter to continue...")
+                unit_values = await task
+                metrics = await metrics_tasks[k]
+                add_unit_values(unit_values, feature_collectors, results)
+                text_metrics.extend(metrics.rows())
+                text_units.extend(paragraphs)
+
+                logger.info(f"Saving results of section {k + 1} to CSV...")
+                writer.append_rows(text_units, text_metrics)
+                writer.flush()
+
+                if on_section_complete is not None:
+                    on_section_complete(k, paragraphs)
+                if interactive:
+                    input("Press Enter to continue...")
+    finally:
+        if next_task is not None:
+            next_task.cancel()
+        for metrics_task in metrics_tasks:
+            metrics_task.cancel()
+        executor.shutdown(cancel_futures=True)
 
     log_processing_results(text_units, feature_collectors)
     return feature_collectors, text_units, text_metrics
@@ -258,6 +864,12 @@ def extract_features_section_mode(
     feature_collectors: list[WritingFeature],
     llm: Runnable[LanguageModelInput, BaseModel],
     triangulation_llms: list[Runnable[LanguageModelInput, BaseModel]] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    triangulation_timeout: float = DEFAULT_TRIANGULATION_TIMEOUT,
+    packed_llm: Runnable[LanguageModelInput, BaseModel] | None = None,
+    packing_token_budget: int = DEFAULT_PACKING_TOKEN_BUDGET,
+    checkpoint: CheckpointJournal | None = None,
+    results: ResultMatrix | None = None,
 ) -> Tuple[list[WritingFeature], list[str], dict[str, Any]]:
     """
     Extract features from the text in section mode.
@@ -268,28 +880,392 @@ def extract_features_section_mode(
         llm (Runnable[LanguageModelInput, BaseModel]): The main language model.
         triangulation_llms (list[Runnable[LanguageModelInput, BaseModel]]):
             Optional list of triangulation language models.
+        concurrency (int): Maximum number of concurrent LLM requests.
+        triangulation_timeout (float): Seconds to wait for each triangulation member.
+        packed_llm (Runnable[LanguageModelInput, BaseModel] | None): Optional language
+            model with the packed feature model as structured output.
+        packing_token_budget (int): Maximum estimated number of tokens per packed call.
+        checkpoint (CheckpointJournal | None): Optional journal of completed text
+            units. Units found in it are not sent to the LLM again.
+        results (ResultMatrix | None): The result matrix of the run. If None, a
+            new matrix is created for the feature collectors.
 
     Returns:
         Tuple[list[WritingFeature], list[str], dict[str, Any]]:
             A tuple containing the updated feature collectors, processed sections,
             and text metrics for each section.
     """
-    text_units = []
-    section_text_metrics = []
-    sections = combine_short_strings(sections, 50)
-    section_number = 1
+    sections = split_into_text_units(sections, ExtractionMode.SECTION)
+    logger.info(f"Processing {len(sections)} sections")
+    if results is None:
+        results = ResultMatrix(feature_collectors, len(sections))
 
-    for section in sections:
-        logger.info(f"Processing section number {section_number}")
-        process_text(section, feature_collectors, llm, triangulation_llms)
-        section_text_metrics.append(get_text_statistics(section))
-        text_units.append(section)
-        section_number += 1
+    with create_metrics_executor(len(sections)) as executor:
+        _, metrics = asyncio.run(
+            gather_llm_and_metrics_stages(
+                process_text_units(
+                    sections,
+                    feature_collectors,
+                    llm,
+                    triangulation_llms,
+                    concurrency,
+                    triangulation_timeout,
+                    packed_llm,
+                    packing_token_budget,
+                    checkpoint,
+                    results=results,
+                ),
+                acompute_metrics(sections, executor),
+            )
+        )
+    section_text_metrics = metrics.rows()
+    text_units = list(sections)
 
     log_processing_results(text_units, feature_collectors)
     return feature_collectors, text_units, section_text_metrics
 
 
+def extract_features_batch(
+    sections: list[str],
+    mode: ExtractionMode | str,
+    feature_collectors: list[WritingFeature],
+    batch_client: BatchClient,
+    PydanticModel: Type[BaseModel],
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+) -> Tuple[list[WritingFeature], list[str], dict[str, Any]]:
+    """
+    Extract features from the text through the provider's batch API.
+
+    All text units are submitted as one batch job, which is polled until it
+    finishes. The results are then added to the feature collectors in order.
+
+    Args:
+        sections (list[str]): List of text sections to process.
+        mode (ExtractionMode | str): The extraction mode (PARAGRAPH or SECTION).
+        feature_collectors (list[WritingFeature]): List of writing features to extract.
+        batch_client (BatchClient): The provider's batch API client.
+        PydanticModel (Type[BaseModel]): The dynamic feature model to extract.
+        poll_interval (float): Seconds to wait between polls of the batch status.
+
+    Returns:
+        Tuple[list[WritingFeature], list[str], dict[str, Any]]:
+            A tuple containing the updated feature collectors, processed text units,
+            and text metrics.
+    """
+    text_units = split_into_text_units(sections, mode)
+
+    results = ResultMatrix(feature_collectors, len(text_units))
+
+    with create_metrics_executor(len(text_units)) as executor:
+        # The metrics are computed while the batch job runs
+        metrics_futures = [
+            executor.submit(compute_metrics_batch, chunk)
+            for chunk in split_into_chunks(text_units, DEFAULT_METRICS_CHUNK_SIZE)
+        ]
+        batch_results = run_batch(
+            batch_client, text_units, PydanticModel, poll_interval=poll_interval
+        )
+        text_metrics = MetricsBatch.concatenate(
+            [future.result() for future in metrics_futures]
+        ).rows()
+
+    for result in batch_results:
+        results.add_row(resolve_results(result, [], feature_collectors))
+
+    log_processing_results(text_units, feature_collectors)
+    return feature_collectors, text_units, text_metrics
+
+
+def stream_extract_features(
+    sections: Iterable[str],
+    mode: ExtractionMode | str,
+    feature_collectors: list[WritingFeature],
+    llm: Runnable[LanguageModelInput, BaseModel],
+    writer: IncrementalCSVWriter,
+    triangulation_llms: list[Runnable[LanguageModelInput, BaseModel]] | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    triangulation_timeout: float = DEFAULT_TRIANGULATION_TIMEOUT,
+    max_pending: int = DEFAULT_MAX_PENDING,
+    checkpoint: CheckpointJournal | None = None,
+) -> int:
+    """
+    Extract features with bounded memory, writing each row as soon as it is ready.
+
+    Text units are read lazily from the sections, processed by `concurrency`
+    workers, and written to the CSV writer in their original order. At most
+    `max_pending` text units are held in memory at any time, whether queued,
+    in flight or waiting for an earlier unit to complete, so peak memory does
+    not depend on the size of the input. The results are not accumulated in
+    the feature collectors.
+
+    Args:
+        sections (Iterable[str]): The text sections, e.g. from iter_sections.
+        mode (ExtractionMode | str): The extraction mode (PARAGRAPH or SECTION).
+        feature_collectors (list[WritingFeature]): List of writing features to extract.
+        llm (Runnable[LanguageModelInput, BaseModel]): The main language model.
+        writer (IncrementalCSVWriter): An open writer receiving one row per text unit.
+        triangulation_llms (list[Runnable[LanguageModelInput, BaseModel]] | None):
+            Optional list of triangulation language models.
+        concurrency (int): Maximum number of concurrent LLM requests.
+        triangulation_timeout (float): Seconds to wait for each triangulation member.
+        max_pending (int): Maximum number of text units held in memory.
+        checkpoint (CheckpointJournal | None): Optional journal of completed text
+            units. Units found in it are not sent to the LLM again.
+
+    Returns:
+        int: The number of text units processed.
+
+    Raises:
+        ValueError: If an invalid extraction mode is provided.
+        FileOperationError: If the input cannot be read or the output cannot be written.
+    """
+    return asyncio.run(
+        astream_extract_features(
+            sections,
+            mode,
+            feature_collectors,
+            llm,
+            writer,
+            triangulation_llms,
+            concurrency,
+            triangulation_timeout,
+            max_pending,
+            checkpoint,
+        )
+    )
+
+
+async def astream_extract_features(
+    sections: Iterable[str],
+    mode: ExtractionMode | str,
+    feature_collectors: list[WritingFeature],
+    llm: Runnable[LanguageModelInput, BaseModel],
+    writer: IncrementalCSVWriter,
+    triangulation_llms: list[Runnable[LanguageModelInput, BaseModel]] | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    triangulation_timeout: float = DEFAULT_TRIANGULATION_TIMEOUT,
+    max_pending: int = DEFAULT_MAX_PENDING,
+    checkpoint: CheckpointJournal | None = None,
+) -> int:
+    """Async implementation of stream_extract_features."""
+    text_units = iter_text_units(sections, mode)
+    workers = max(1, concurrency)
+    # Bounds the units between being read and being written, including
+    # completed units waiting for an earlier, slower unit
+    window = asyncio.Semaphore(max(max_pending, workers))
+    queue: asyncio.Queue = asyncio.Queue(maxsize=workers)
+    completed: dict[int, Tuple[str, list[Any], dict[str, Any]]] = {}
+    next_index = 0
+    executor = create_metrics_executor(max(max_pending, workers), chunk_size=1)
+
+    async def produce() -> None:
+        index = 0
+        # Reserve a slot before reading the next unit, so that no more than
+        # max_pending units are ever read ahead of the writer
+        while True:
+            await window.acquire()
+            text = next(text_units, None)
+            if text is None:
+                break
+            await queue.put((index, text))
+            index += 1
+        for _ in range(workers):
+            await queue.put(None)
+
+    def write_completed() -> None:
+        nonlocal next_index
+        while next_index in completed:
+            text, values, metrics = completed.pop(next_index)
+            writer.write_row(text, values, metrics)
+            next_index += 1
+            window.release()
+
+    async def work() -> None:
+        while (item := await queue.get()) is not None:
+            index, text = item
+            completed[index] = (
+                text,
+                *await aextract_row(
+                    index,
+                    text,
+                    feature_collectors,
+                    llm,
+                    executor,
+                    triangulation_llms,
+                    triangulation_timeout,
+                    checkpoint,
+                ),
+            )
+            write_completed()
+
+    tasks = [asyncio.create_task(produce())] + [
+        asyncio.create_task(work()) for _ in range(workers)
+    ]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        executor.shutdown(cancel_futures=True)
+
+    logger.debug(f"Number of text units processed: {next_index}")
+    return next_index
+
+
+async def aextract_row(
+    index: int,
+    text: str,
+    feature_collectors: list[WritingFeature],
+    llm: Runnable[LanguageModelInput, BaseModel],
+    executor: Executor,
+    triangulation_llms: list[Runnable[LanguageModelInput, BaseModel]] | None = None,
+    triangulation_timeout: float = DEFAULT_TRIANGULATION_TIMEOUT,
+    checkpoint: CheckpointJournal | None = None,
+) -> Tuple[list[Any], dict[str, Any]]:
+    """
+    Extract the CSV row values and the text metrics of one text unit.
+
+    The text metrics are computed on the executor while the LLM is called, so
+    they do not block the event loop.
+
+    Args:
+        index (int): Index of the text unit in its journal.
+        text (str): The text unit.
+        feature_collectors (list[WritingFeature]): List of writing features to extract.
+        llm (Runnable[LanguageModelInput, BaseModel]): The main language model.
+        executor (Executor): The executor of the metrics stage.
+        triangulation_llms (list[Runnable[LanguageModelInput, BaseModel]] | None):
+            Optional list of triangulation language models.
+        triangulation_timeout (float): Seconds to wait for each triangulation member.
+        checkpoint (CheckpointJournal | None): Optional journal of completed text
+            units. A unit found in it is not sent to the LLM again.
+
+    Returns:
+        Tuple[list[Any], dict[str, Any]]: The converted result of each feature,
+        and the text metrics of the text unit.
+    """
+    metrics = asyncio.get_running_loop().run_in_executor(
+        executor, get_text_statistics, text
+    )
+    try:
+        values = await aextract_row_values(
+            index,
+            text,
+            feature_collectors,
+            llm,
+            triangulation_llms,
+            triangulation_timeout,
+            checkpoint,
+        )
+    except BaseException:
+        metrics.cancel()
+        raise
+    return values, await metrics
+
+
+async def aextract_row_values(
+    index: int,
+    text: str,
+    feature_collectors: list[WritingFeature],
+    llm: Runnable[LanguageModelInput, BaseModel],
+    triangulation_llms: list[Runnable[LanguageModelInput, BaseModel]] | None = None,
+    triangulation_timeout: float = DEFAULT_TRIANGULATION_TIMEOUT,
+    checkpoint: CheckpointJournal | None = None,
+) -> list[Any]:
+    """
+    Extract the CSV row values of one text unit, without collecting the results.
+
+    Args:
+        index (int): Index of the text unit in its journal.
+        text (str): The text unit.
+        feature_collectors (list[WritingFeature]): List of writing features to extract.
+        llm (Runnable[LanguageModelInput, BaseModel]): The main language model.
+        triangulation_llms (list[Runnable[LanguageModelInput, BaseModel]] | None):
+            Optional list of triangulation language models.
+        triangulation_timeout (float): Seconds to wait for each triangulation member.
+        checkpoint (CheckpointJournal | None): Optional journal of completed text
+            units. A unit found in it is not sent to the LLM again.
+
+    Returns:
+        list[Any]: The converted result of each feature, in order.
+    """
+    labels = [feature.pydantic_feature_label for feature in feature_collectors]
+    values = None
+    if checkpoint is not None:
+        values = checkpoint.get(index, text, labels)
+    if values is None:
+        result, triangulation_results = await ainvoke_llms(
+            text, llm, triangulation_llms, triangulation_timeout
+        )
+        values = resolve_results(result, triangulation_results, feature_collectors)
+        if checkpoint is not None:
+            await arecord_unit(checkpoint, index, text, result, labels, values)
+    return [fc.convert_result(v) for fc, v in zip(feature_collectors, values)]
+
+
+def create_metrics_executor(
+    num_text_units: int, chunk_size: int = DEFAULT_METRICS_CHUNK_SIZE
+) -> ProcessPoolExecutor:
+    """
+    Create the process pool of the metrics stage.
+
+    The text metrics are CPU-bound, so they are computed in separate processes
+    instead of on the thread which waits for the LLM responses. The pool has
+    no more workers than there are chunks of text units to compute, and each
+    worker uses the syllable table loaded in this process.
+
+    Args:
+        num_text_units (int): Number of text units to compute the metrics of.
+        chunk_size (int): Number of text units per submitted chunk.
+
+    Returns:
+        ProcessPoolExecutor: The process pool.
+    """
+    num_chunks = max(1, -(-num_text_units // max(1, chunk_size)))
+    return ProcessPoolExecutor(
+        max_workers=min(os.cpu_count() or 1, num_chunks),
+        initializer=load_syllable_table,
+        initargs=(get_syllable_table_path(),),
+    )
+
+
+async def acompute_metrics(
+    text_units: list[str],
+    executor: Executor,
+    chunk_size: int = DEFAULT_METRICS_CHUNK_SIZE,
+) -> MetricsBatch:
+    """
+    Compute the text metrics of text units in chunks on an executor.
+
+    All chunks are submitted at once, and the event loop is free to wait for
+    LLM responses while they are computed.
+
+    Args:
+        text_units (list[str]): The text units to compute the metrics of.
+        executor (Executor): The executor of the metrics stage.
+        chunk_size (int): Number of text units per submitted chunk.
+
+    Returns:
+        MetricsBatch: The text metrics, in the order of the text units.
+    """
+    loop = asyncio.get_running_loop()
+    batches = await asyncio.gather(
+        *(
+            loop.run_in_executor(executor, compute_metrics_batch, chunk)
+            for chunk in split_into_chunks(text_units, chunk_size)
+        )
+    )
+    return MetricsBatch.concatenate(list(batches))
+
+
+async def gather_llm_and_metrics_stages(
+    llm_stage: Awaitable[Any], metrics_stage: Awaitable[MetricsBatch]
+) -> Tuple[Any, MetricsBatch]:
+    """Run the LLM stage and the metrics stage of the same text units concurrently."""
+    llm_result, metrics = await asyncio.gather(llm_stage, metrics_stage)
+    return llm_result, metrics
+
+
 def log_processing_results(
     text_units: list[str], feature_collectors: list[WritingFeature]
 ) -> None:
@@ -0,0 +1,96 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from writing_feature_extractor.core.custom_exceptions import FeatureExtractorError
+from writing_feature_extractor.utils.logger_config import get_logger
+from writing_feature_extractor.utils.save_results_to_csv import save_results_to_csv
+from writing_feature_extractor.utils.syllables import (
+    get_syllable_table_path,
+    load_syllable_table,
+)
+from writing_feature_extractor.utils.text_metrics import compute_metrics_batch
+from writing_feature_extractor.utils.text_processing import (
+    ExtractionMode,
+    load_text,
+    split_into_sections,
+    split_into_text_units,
+)
+
+logger = get_logger(__name__)
+
+
+def extract_metrics_file(
+    file_path: str, mode: ExtractionMode | str, csv_file: str
+) -> int:
+    """
+    Compute the text metrics of one file and save them to a CSV file.
+
+    The CSV file has the layout of save_results_to_csv, without feature columns.
+
+    Args:
+        file_path (str): The text file to analyze.
+        mode (ExtractionMode | str): The extraction mode (PARAGRAPH or SECTION).
+        csv_file (str): The CSV file to write.
+
+    Returns:
+        int: The number of text units of the file.
+
+    Raises:
+        FileOperationError: If the file cannot be read or the CSV file written.
+    """
+    text_units = split_into_text_units(split_into_sections(load_text(file_path)), mode)
+    metrics = compute_metrics_batch(text_units)
+    save_results_to_csv([], metrics.rows(), text_units, csv_file)
+    return len(text_units)
+
+
+def extract_metrics_only(
+    file_paths: list[str],
+    mode: ExtractionMode | str,
+    csv_files: list[str],
+    max_workers: int | None = None,
+) -> dict[str, int]:
+    """
+    Compute the text metrics of many files in parallel, without any LLM.
+
+    Each file is processed by a worker process, which reads the file, computes
+    its metrics and writes its CSV file, so only the number of text units is
+    sent back. A file which fails is logged and skipped.
+
+    Args:
+        file_paths (list[str]): The text files to analyze.
+        mode (ExtractionMode | str): The extraction mode (PARAGRAPH or SECTION).
+        csv_files (list[str]): The CSV file to write for each text file.
+        max_workers (int | None): Number of worker processes. Defaults to the
+            number of CPUs.
+
+    Returns:
+        dict[str, int]: The number of text units of each processed file.
+    """
+    if not file_paths:
+        return {}
+
+    workers = min(max_workers or os.cpu_count() or 1, len(file_paths))
+    processed = {}
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=load_syllable_table,
+        initargs=(get_syllable_table_path(),),
+    ) as executor:
+        futures = {
+            executor.submit(extract_metrics_file, file_path, mode, csv_file): file_path
+            for file_path, csv_file in zip(file_paths, csv_files)
+        }
+        for future in as_completed(futures):
+            file_path = futures[future]
+            try:
+                processed[file_path] = future.result()
+            except FeatureExtractorError as e:
+                logger.error(f"Skipping {file_path}: {e}")
+                continue
+            logger.info(
+                f"Saved metrics of {processed[file_path]} text units of {file_path}"
+            )
+
+    logger.info(f"Computed the metrics of {len(processed)}/{len(file_paths)} files")
+    return processed
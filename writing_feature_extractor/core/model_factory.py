@@ -1,18 +1,34 @@
 from functools import wraps
 from os import getenv
-from typing import Callable, Dict, Type
+from typing import Any, Callable, Dict, Tuple, Type
 
-from langchain.output_parsers import PydanticOutputParser
 from langchain_core.language_models import LanguageModelInput
 from langchain_core.prompts import PromptTemplate
 from langchain_core.pydantic_v1 import BaseModel
 from langchain_core.runnables import Runnable
 
 from writing_feature_extractor.core.custom_exceptions import ModelError
+from writing_feature_extractor.core.output_repair import create_tolerant_parser
+from writing_feature_extractor.core.prompt_cache import prompt_cache_callback
+from writing_feature_extractor.core.rate_limiter import (
+    RateLimitedRunnable,
+    get_rate_limiter,
+)
+from writing_feature_extractor.core.result_cache import (
+    CachedRunnable,
+    FeatureCachedRunnable,
+    ResultCache,
+)
+from writing_feature_extractor.features.writing_feature import WritingFeature
+from writing_feature_extractor.features.writing_feature_factory import (
+    WritingFeatureFactory,
+)
 from writing_feature_extractor.prompt_templates.aesthemos_prompt_non_tooling_prompt import (
     aesthemos_non_tooling_prompt,
 )
-from writing_feature_extractor.prompt_templates.aesthemos_prompt import aesthemos_prompt
+from writing_feature_extractor.prompt_templates.aesthemos_prompt import (
+    aesthemos_chat_prompt,
+)
 from writing_feature_extractor.prompt_templates.more_detailed_prompt import (
     more_detailed_prompt,
 )
@@ -36,6 +52,8 @@ logger = get_logger(__name__)
 
 class ModelFactory:
     _creators: Dict[str, Callable] = {}
+    # Structured-output runnables by provider, model name and Pydantic model
+    _runnables: Dict[Tuple[str, str, Type[BaseModel]], Runnable] = {}
 
     @classmethod
     def register(cls, provider: str):
@@ -45,22 +63,93 @@ class ModelFactory:
                 return func(*args, **kwargs)
 
             cls._creators[provider] = wrapper
+            cls._runnables = {
+                key: runnable
+                for key, runnable in cls._runnables.items()
+                if key[0] != provider
+            }
             return wrapper
 
         return decorator
 
     @classmethod
     def get_llm_model(
-        cls, provider: str, model_name: str, PydanticModel: Type[BaseModel]
+        cls,
+        provider: str,
+        model_name: str,
+        PydanticModel: Type[BaseModel],
+        cache: ResultCache | None = None,
+        feature_collectors: list[WritingFeature] | None = None,
     ) -> Runnable[LanguageModelInput, BaseModel]:
-        creator = cls._creators.get(provider)
-        if creator:
-            try:
-                return creator(model_name, PydanticModel)
-            except Exception as e:
-                raise ModelError(f"Failed to create {provider} model: {str(e)}")
-        else:
-            raise ValueError(f"Provider {provider} not found")
+        """
+        Create the structured-output runnable for a provider and model.
+
+        Requests are paced by the rate limiter of the provider and model, which
+        is shared by all runnables of the same provider and model. If a cache is
+        given, results are cached, and cache hits do not count against the rate
+        limit. When the feature collectors are given as well, results are cached
+        per feature, and only features missing from the cache are requested from
+        the LLM.
+
+        The structured-output runnable of a provider, model and Pydantic model
+        is created once and reused, so its tool schema is derived only once.
+        """
+        if cache is not None and feature_collectors:
+            return FeatureCachedRunnable(
+                feature_collectors,
+                cache,
+                provider,
+                model_name,
+                PydanticModel,
+                lambda features: cls.get_llm_model(
+                    provider,
+                    model_name,
+                    WritingFeatureFactory.create_dynamic_model(features),
+                ),
+            )
+
+        key = (provider, model_name, PydanticModel)
+        llm = cls._runnables.get(key)
+        if llm is None:
+            creator = cls._creators.get(provider)
+            if creator:
+                try:
+                    llm = creator(model_name, PydanticModel)
+                except Exception as e:
+                    raise ModelError(f"Failed to create {provider} model: {str(e)}")
+            else:
+                raise ValueError(f"Provider {provider} not found")
+            cls._runnables[key] = llm
+
+        llm = RateLimitedRunnable(llm, get_rate_limiter(provider, model_name))
+        if cache is not None:
+            llm = CachedRunnable(llm, cache, provider, model_name, PydanticModel)
+        return llm
+
+
+def create_non_tooling_chain(
+    llm: Runnable[LanguageModelInput, Any], PydanticModel: type[BaseModel]
+) -> Runnable[LanguageModelInput, BaseModel]:
+    """
+    Create the structured-output chain of a chat model without tool calling.
+
+    The schema of the model is given to the LLM as format instructions in the
+    prompt, and the answer is parsed by a tolerant output parser.
+
+    Args:
+        llm (Runnable[LanguageModelInput, Any]): The chat model.
+        PydanticModel (type[BaseModel]): The feature model.
+
+    Returns:
+        Runnable[LanguageModelInput, BaseModel]: The chain.
+    """
+    parser = create_tolerant_parser(PydanticModel, llm)
+    prompt = PromptTemplate(
+        template=aesthemos_non_tooling_prompt,
+        input_variables=["input"],
+        partial_variables={"format_instructions": parser.get_format_instructions()},
+    )
+    return prompt | llm | parser
 
 
 @ModelFactory.register("openai")
@@ -70,8 +159,10 @@ def create_openai_model(
     from langchain_openai import ChatOpenAI
 
     try:
-        return aesthemos_prompt | ChatOpenAI(
-            model=model_name, temperature=0
+        # OpenAI caches long prompt prefixes automatically, so the static
+        # instructions are sent first, as the system message
+        return aesthemos_chat_prompt | ChatOpenAI(
+            model=model_name, temperature=0, callbacks=[prompt_cache_callback]
         ).with_structured_output(PydanticModel)
     except Exception as e:
         logger.error(f"Error creating OpenAI model: {e}")
@@ -85,8 +176,10 @@ def create_anthropic_model(
     from langchain_anthropic import ChatAnthropic
 
     try:
-        return aesthemos_prompt | ChatAnthropic(
-            model=model_name, temperature=0
+        # The system message is a plain string: the locked langchain-anthropic
+        # does not accept content blocks with cache_control in system messages
+        return aesthemos_chat_prompt | ChatAnthropic(
+            model=model_name, temperature=0, callbacks=[prompt_cache_callback]
         ).with_structured_output(PydanticModel)
     except Exception as e:
         logger.error(f"Error creating Anthropic model: {e}")
@@ -100,7 +193,7 @@ def create_groq_model(
     from langchain_groq import ChatGroq
 
     try:
-        return aesthemos_prompt | ChatGroq(
+        return aesthemos_chat_prompt | ChatGroq(
             model_name=model_name, temperature=0
         ).with_structured_output(PydanticModel)
     except Exception as e:
@@ -115,14 +208,8 @@ def create_gemini_model(
     from langchain_google_genai import ChatGoogleGenerativeAI
 
     try:
-        parser = PydanticOutputParser(pydantic_object=PydanticModel)
-        prompt = PromptTemplate(
-            template=aesthemos_non_tooling_prompt,
-            input_variables=["input"],
-            partial_variables={"format_instructions": parser.get_format_instructions()},
-        )
         llm = ChatGoogleGenerativeAI(model=model_name, temperature=0)
-        return prompt | llm | parser
+        return create_non_tooling_chain(llm, PydanticModel)
     except Exception as e:
         logger.error(f"Error creating Google Gemini model: {e}")
         raise ModelError("Failed to create Google Gemini model.") from e
@@ -135,22 +222,13 @@ def create_openrouter_model(
     from langchain_openai import ChatOpenAI
 
     try:
-        parser = PydanticOutputParser(pydantic_object=PydanticModel)
-
-        prompt = PromptTemplate(
-            template=aesthemos_non_tooling_prompt,
-            input_variables=["input"],
-            partial_variables={"format_instructions": parser.get_format_instructions()},
-        )
-
         llm = ChatOpenAI(
             base_url="https://openrouter.ai/api/v1",
             api_key=getenv("OPENROUTER_API_KEY"),
             model=model_name,
             temperature=0,
         )
-
-        return prompt | llm | parser
+        return create_non_tooling_chain(llm, PydanticModel)
     except Exception as e:
         logger.error(f"Error creating OpenRouter model: {e}")
         raise ModelError("Failed to create OpenRouter model.") from e
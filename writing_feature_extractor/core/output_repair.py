@@ -0,0 +1,201 @@
+import difflib
+import json
+import re
+from enum import Enum
+from typing import Any, Optional, Type, get_args
+
+from langchain.output_parsers import OutputFixingParser, PydanticOutputParser
+from langchain_core.exceptions import OutputParserException
+from langchain_core.language_models import LanguageModelInput
+from langchain_core.outputs import Generation
+from langchain_core.pydantic_v1 import BaseModel
+from langchain_core.pydantic_v1 import ValidationError as ValidationErrorV1
+from langchain_core.runnables import Runnable
+
+from writing_feature_extractor.features.enum_lookup import (
+    get_enum_lookup,
+    normalize_label,
+)
+from writing_feature_extractor.utils.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+# Minimum difflib similarity of a near-miss string to an enum value
+ENUM_MATCH_CUTOFF = 0.8
+MAX_FIXING_RETRIES = 1
+CODE_FENCE_PATTERN = re.compile(r"```(?:json)?\s*(.*?)\s*```", re.DOTALL)
+TRAILING_COMMA_PATTERN = re.compile(r",\s*([}\]])")
+SMART_QUOTES = str.maketrans({"“": '"', "”": '"'})
+
+
+def extract_json(text: str) -> str:
+    """Return the JSON object or array of an LLM answer, without prose or code fences."""
+    fenced = CODE_FENCE_PATTERN.search(text)
+    if fenced:
+        text = fenced.group(1)
+    starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+    if not starts:
+        return text.strip()
+    start = min(starts)
+    end = text.rfind("}" if text[start] == "{" else "]")
+    return text[start : end + 1] if end > start else text[start:]
+
+
+def repair_json(text: str) -> Any:
+    """
+    Parse the JSON of an LLM answer, repairing common mistakes.
+
+    The JSON is extracted from code fences and surrounding prose. If it does
+    not parse, typographic quotes and trailing commas are repaired.
+
+    Args:
+        text (str): The LLM answer.
+
+    Returns:
+        Any: The parsed JSON value.
+
+    Raises:
+        json.JSONDecodeError: If the JSON cannot be repaired.
+    """
+    candidate = extract_json(text)
+    try:
+        return json.loads(candidate)
+    except json.JSONDecodeError:
+        repaired = TRAILING_COMMA_PATTERN.sub(r"\1", candidate.translate(SMART_QUOTES))
+        return json.loads(repaired)
+
+
+def match_enum_value(value: str, enum_type: Type[Enum]) -> Optional[Enum]:
+    """
+    Map a near-miss string to a member of an enum.
+
+    Values and member names are compared ignoring case, spacing and
+    punctuation, so "very Strongly" and "VERY_STRONGLY" both match the value
+    "Very strongly". Otherwise, the closest value above ENUM_MATCH_CUTOFF is
+    used.
+
+    Args:
+        value (str): The extracted string.
+        enum_type (Type[Enum]): The enum of the feature.
+
+    Returns:
+        Optional[Enum]: The matching member, or None.
+    """
+    lookup = get_enum_lookup(enum_type)
+    index = lookup.index_of(value)
+    if index is None:
+        close = difflib.get_close_matches(
+            normalize_label(value), lookup.normalized, n=1, cutoff=ENUM_MATCH_CUTOFF
+        )
+        index = lookup.normalized[close[0]] if close else None
+    return lookup.members[index] if index is not None else None
+
+
+def coerce_to_model(data: Any, PydanticModel: Type[BaseModel]) -> Any:
+    """
+    Align parsed JSON with the fields of a feature model.
+
+    Keys are matched to field names ignoring case, and strings of enum fields
+    are mapped to enum members, also in nested models such as the packed
+    feature model. Values which cannot be matched are left unchanged, for the
+    model validation to handle.
+
+    Args:
+        data (Any): The parsed JSON.
+        PydanticModel (Type[BaseModel]): The feature model.
+
+    Returns:
+        Any: The aligned data.
+    """
+    if not isinstance(data, dict):
+        return data
+
+    fields = {normalize_label(name): name for name in PydanticModel.__fields__}
+    coerced = {}
+    for key, value in data.items():
+        name = fields.get(normalize_label(str(key)), key)
+        field = PydanticModel.__fields__.get(name)
+        if field is not None:
+            value = coerce_field_value(value, field.type_)
+        coerced[name] = value
+    return coerced
+
+
+def coerce_field_value(value: Any, field_type: Any) -> Any:
+    """Coerce one field value, or each item of a list value, to the field type."""
+    if isinstance(value, list):
+        return [coerce_field_value(item, field_type) for item in value]
+    if isinstance(field_type, type) and issubclass(field_type, BaseModel):
+        return coerce_to_model(value, field_type)
+    if not isinstance(value, str):
+        return value
+
+    for option in get_args(field_type) or (field_type,):
+        if isinstance(option, type) and issubclass(option, Enum):
+            member = match_enum_value(value, option)
+            if member is not None:
+                return member
+    return value
+
+
+class TolerantOutputParser(PydanticOutputParser):
+    """
+    Pydantic output parser which repairs slightly malformed answers.
+
+    The answer is parsed with repair_json and aligned with the feature model
+    by coerce_to_model before it is validated, so that a stray trailing comma
+    or a differently cased enum value does not lose the result.
+    """
+
+    def parse_result(self, result: list[Generation], *, partial: bool = False) -> Any:
+        if partial:
+            return super().parse_result(result, partial=partial)
+
+        text = result[0].text
+        try:
+            data = repair_json(text)
+        except json.JSONDecodeError as e:
+            raise OutputParserException(
+                f"Could not parse or repair the JSON of the answer: {e}",
+                llm_output=text,
+            ) from e
+
+        try:
+            return self.pydantic_object.parse_obj(
+                coerce_to_model(data, self.pydantic_object)
+            )
+        except ValidationErrorV1 as e:
+            raise OutputParserException(
+                f"The answer does not match {self.pydantic_object.__name__}: {e}",
+                llm_output=text,
+            ) from e
+
+    @property
+    def _type(self) -> str:
+        return "tolerant_pydantic"
+
+
+def create_tolerant_parser(
+    PydanticModel: Type[BaseModel],
+    llm: Runnable[LanguageModelInput, Any],
+    max_retries: int = MAX_FIXING_RETRIES,
+) -> OutputFixingParser:
+    """
+    Create the output parser of a model without tool calling.
+
+    Answers are repaired locally first. Only when the repair fails is the LLM
+    asked to fix its answer, up to max_retries times.
+
+    Args:
+        PydanticModel (Type[BaseModel]): The feature model.
+        llm (Runnable[LanguageModelInput, Any]): The chat model which fixes answers.
+        max_retries (int): Maximum number of follow-up LLM calls per answer.
+
+    Returns:
+        OutputFixingParser: The parser.
+    """
+    return OutputFixingParser.from_llm(
+        llm=llm,
+        parser=TolerantOutputParser(pydantic_object=PydanticModel),
+        max_retries=max_retries,
+    )
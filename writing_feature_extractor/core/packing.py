@@ -0,0 +1,175 @@
+from functools import lru_cache
+from typing import List, Optional, Type
+
+from langchain_core.pydantic_v1 import BaseModel, Field, create_model
+
+from writing_feature_extractor.utils.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+PARAGRAPH_NUMBER_FIELD = "paragraph_number"
+CHARACTERS_PER_TOKEN = 4
+PER_UNIT_TOKEN_OVERHEAD = 8
+# Default output limit of the chat models, e.g. the max_tokens of ChatAnthropic
+DEFAULT_MAX_OUTPUT_TOKENS = 1024
+# Estimated answer tokens: the list around the entries, the paragraph number
+# of each entry, and each feature value of an entry
+PACKED_OUTPUT_OVERHEAD_TOKENS = 32
+OUTPUT_TOKENS_PER_UNIT = 10
+OUTPUT_TOKENS_PER_FEATURE = 12
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the number of tokens of a text (about 4 characters per token)."""
+    return len(text) // CHARACTERS_PER_TOKEN + 1
+
+
+@lru_cache(maxsize=None)
+def create_packed_model(PydanticModel: Type[BaseModel]) -> Type[BaseModel]:
+    """
+    Create a list-valued variant of a dynamic feature model.
+
+    The packed model holds one entry per numbered paragraph. Each entry has the
+    fields of the given model plus the number of the paragraph it refers to.
+    It is created once per model.
+
+    Args:
+        PydanticModel (Type[BaseModel]): The dynamic feature model.
+
+    Returns:
+        Type[BaseModel]: The packed feature model.
+    """
+    item_fields = {
+        PARAGRAPH_NUMBER_FIELD: (
+            int,
+            Field(..., description="Number of the paragraph this entry refers to."),
+        )
+    }
+    for name, field in PydanticModel.__fields__.items():
+        item_fields[name] = (
+            field.outer_type_,
+            Field(..., description=field.field_info.description),
+        )
+
+    PackedFeatureItem = create_model(
+        "PackedFeatureItem",
+        __doc__="Features contained in one numbered paragraph of the creative writing text",
+        **item_fields,
+    )
+    return create_model(
+        "PackedFeatureModel",
+        __doc__="Features contained in each numbered paragraph of the creative writing text",
+        results=(
+            List[PackedFeatureItem],
+            Field(..., description="One entry for every numbered paragraph."),
+        ),
+    )
+
+
+def get_max_units_per_pack(
+    num_features: int, max_output_tokens: int = DEFAULT_MAX_OUTPUT_TOKENS
+) -> int:
+    """
+    Return how many text units fit in the answer of one packed call.
+
+    The packed answer holds one entry per text unit, so it grows with the
+    size of the pack. A pack whose answer exceeds the output limit of the
+    model is truncated, and all of its units are re-requested individually.
+
+    Args:
+        num_features (int): Number of features of each entry.
+        max_output_tokens (int): Output limit of the model.
+
+    Returns:
+        int: The maximum number of text units in a pack, at least 1.
+    """
+    unit_tokens = OUTPUT_TOKENS_PER_UNIT + OUTPUT_TOKENS_PER_FEATURE * num_features
+    return max(1, (max_output_tokens - PACKED_OUTPUT_OVERHEAD_TOKENS) // unit_tokens)
+
+
+def pack_text_units(
+    text_units: list[str], token_budget: int, max_units: Optional[int] = None
+) -> list[list[int]]:
+    """
+    Group consecutive text units into packs which fit the token budget.
+
+    A text unit which exceeds the budget on its own forms a pack by itself.
+
+    Args:
+        text_units (list[str]): The text units to pack.
+        token_budget (int): Maximum estimated number of tokens of the text units in a pack.
+        max_units (Optional[int]): Maximum number of text units in a pack, so
+            that the answer fits the output limit of the model.
+
+    Returns:
+        list[list[int]]: The indices of the text units in each pack.
+    """
+    packs = []
+    current_pack = []
+    current_tokens = 0
+    for i, text in enumerate(text_units):
+        tokens = estimate_tokens(text) + PER_UNIT_TOKEN_OVERHEAD
+        if current_pack and (
+            current_tokens + tokens > token_budget
+            or (max_units is not None and len(current_pack) >= max_units)
+        ):
+            packs.append(current_pack)
+            current_pack = []
+            current_tokens = 0
+        current_pack.append(i)
+        current_tokens += tokens
+
+    if current_pack:
+        packs.append(current_pack)
+    return packs
+
+
+def format_packed_input(texts: list[str]) -> str:
+    """Format several text units as one input of numbered paragraphs."""
+    numbered_paragraphs = "\n\n".join(
+        f"[Paragraph {number}]\n{text}" for number, text in enumerate(texts, 1)
+    )
+    return (
+        f"The passage below consists of {len(texts)} numbered paragraphs. "
+        "Respond to each paragraph separately, as if it were its own passage, and "
+        f"give exactly one entry per paragraph number, from 1 to {len(texts)}.\n\n"
+        f"{numbered_paragraphs}"
+    )
+
+
+def unpack_results(
+    packed_result: Optional[BaseModel], pack_size: int
+) -> list[Optional[BaseModel]]:
+    """
+    Split a packed LLM result into one result per text unit of the pack.
+
+    Each result is a packed entry, which holds the same fields as the dynamic
+    feature model plus the paragraph number.
+
+    Args:
+        packed_result (Optional[BaseModel]): The packed LLM result, or None if it failed.
+        pack_size (int): The number of text units in the pack.
+
+    Returns:
+        list[Optional[BaseModel]]: One result per text unit. None for units which
+        are missing or duplicated in the packed result.
+    """
+    results: list[Optional[BaseModel]] = [None] * pack_size
+    if packed_result is None:
+        return results
+
+    seen = set()
+    for item in packed_result.results:
+        index = getattr(item, PARAGRAPH_NUMBER_FIELD) - 1
+        if not 0 <= index < pack_size:
+            logger.warning(f"Unexpected paragraph number in packed result: {index + 1}")
+            continue
+        if index in seen:
+            # Ambiguous answer: re-request the paragraph individually
+            logger.warning(f"Duplicate paragraph number in packed result: {index + 1}")
+            results[index] = None
+            continue
+        seen.add(index)
+        results[index] = item
+
+    return results
@@ -0,0 +1,111 @@
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Tuple
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import LLMResult
+
+from writing_feature_extractor.utils.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def get_cache_usage(message: BaseMessage) -> Tuple[int, int, int]:
+    """
+    Read the prompt cache usage of a chat model response.
+
+    Supports the usage reported by Anthropic (cache_read_input_tokens and
+    cache_creation_input_tokens) and by OpenAI (prompt_tokens_details with
+    cached_tokens).
+
+    Args:
+        message (BaseMessage): The response message.
+
+    Returns:
+        Tuple[int, int, int]: The input tokens, the input tokens read from the
+        cache and the input tokens written to the cache.
+    """
+    metadata = getattr(message, "response_metadata", None) or {}
+    usage = metadata.get("usage") or metadata.get("token_usage")
+    if not isinstance(usage, dict):
+        return 0, 0, 0
+
+    cache_read = usage.get("cache_read_input_tokens") or 0
+    cache_write = usage.get("cache_creation_input_tokens") or 0
+    input_tokens = usage.get("input_tokens")
+    if input_tokens is not None:
+        # Anthropic counts the cached tokens separately from the input tokens
+        input_tokens += cache_read + cache_write
+    else:
+        input_tokens = usage.get("prompt_tokens") or 0
+        details = usage.get("prompt_tokens_details") or {}
+        cache_read = details.get("cached_tokens") or 0
+    return input_tokens, cache_read, cache_write
+
+
+@dataclass
+class PromptCacheStats:
+    """Counts of the provider-side prompt cache hits and misses of a run."""
+
+    requests: int = 0
+    hits: int = 0
+    input_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    @property
+    def misses(self) -> int:
+        return self.requests - self.hits
+
+    def record(self, input_tokens: int, cache_read: int, cache_write: int) -> None:
+        """Count one response. A response with any cached input tokens is a hit."""
+        with self._lock:
+            self.requests += 1
+            self.hits += cache_read > 0
+            self.input_tokens += input_tokens
+            self.cache_read_tokens += cache_read
+            self.cache_write_tokens += cache_write
+
+    def reset(self) -> None:
+        """Clear the counts."""
+        with self._lock:
+            self.requests = self.hits = self.input_tokens = 0
+            self.cache_read_tokens = self.cache_write_tokens = 0
+
+    def summary(self) -> str:
+        """Describe the counts for the run log."""
+        cached_share = self.cache_read_tokens / max(1, self.input_tokens) * 100
+        return (
+            f"Prompt cache: {self.hits} hits, {self.misses} misses in "
+            f"{self.requests} requests; {self.cache_read_tokens}/{self.input_tokens} "
+            f"input tokens read from the cache ({cached_share:.1f}%), "
+            f"{self.cache_write_tokens} written"
+        )
+
+
+class PromptCacheCallbackHandler(BaseCallbackHandler):
+    """Callback handler which counts the prompt cache usage of chat model responses."""
+
+    def __init__(self, stats: PromptCacheStats):
+        self.stats = stats
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                if message is not None:
+                    self.stats.record(*get_cache_usage(message))
+
+
+prompt_cache_stats = PromptCacheStats()
+prompt_cache_callback = PromptCacheCallbackHandler(prompt_cache_stats)
+
+
+def log_prompt_cache_stats() -> None:
+    """Log the prompt cache hits and misses of the run, if any requests were made."""
+    if prompt_cache_stats.requests:
+        logger.info(prompt_cache_stats.summary())
@@ -0,0 +1,277 @@
+import asyncio
+import json
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Optional
+
+from langchain_core.language_models import LanguageModelInput
+from langchain_core.prompts import BasePromptTemplate
+from langchain_core.pydantic_v1 import BaseModel
+from langchain_core.runnables import Runnable, RunnableConfig
+
+from writing_feature_extractor.core.packing import estimate_tokens
+from writing_feature_extractor.utils.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_RATE_LIMIT_RETRIES = 3
+DEFAULT_RETRY_AFTER = 10.0
+# Rough size of a structured answer, counted against the tokens-per-minute quota
+ESTIMATED_OUTPUT_TOKENS = 64
+RATE_LIMIT_STATUS_CODE = 429
+RATE_LIMIT_ERROR_NAMES = ("RateLimitError", "ResourceExhausted", "TooManyRequests")
+
+
+@dataclass
+class RateLimit:
+    """Quota of a provider or model. None means unlimited."""
+
+    requests_per_minute: Optional[float] = None
+    tokens_per_minute: Optional[float] = None
+
+
+class TokenBucket:
+    """
+    Token bucket which refills continuously up to one minute's quota.
+
+    Callers reserve their tokens up front and are told how long to wait, so
+    the bucket may go into debt. Waiting callers are therefore served in the
+    order of their reservations, and the same bucket can pace both threads
+    and coroutines.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """
+        Take tokens from the bucket.
+
+        Args:
+            amount (float): The number of tokens needed. Amounts above the
+                capacity are capped, so that they can still be served.
+
+        Returns:
+            float: Seconds to wait before the tokens may be used.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= min(amount, self.capacity)
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class RateLimiter:
+    """
+    Paces the requests to one provider and model.
+
+    A request reserves one request and its estimated tokens, and waits for the
+    slower of the two buckets. After a rate limit error, all requests wait
+    until the time given by the provider's Retry-After header.
+    """
+
+    def __init__(self, rate_limit: RateLimit):
+        self.rate_limit = rate_limit
+        self._buckets = [
+            (TokenBucket(per_minute), counts_tokens)
+            for per_minute, counts_tokens in [
+                (rate_limit.requests_per_minute, False),
+                (rate_limit.tokens_per_minute, True),
+            ]
+            if per_minute
+        ]
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: int) -> float:
+        """Reserve one request of the given tokens, and return the seconds to wait."""
+        with self._lock:
+            delay = max(0.0, self._paused_until - time.monotonic())
+        for bucket, counts_tokens in self._buckets:
+            delay = max(delay, bucket.reserve(tokens if counts_tokens else 1))
+        return delay
+
+    async def acquire(self, tokens: int) -> None:
+        """Wait until a request of the given tokens may be sent."""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def acquire_sync(self, tokens: int) -> None:
+        """Blocking variant of acquire."""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back all requests for the given number of seconds."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+_rate_limits: dict[tuple[str, Optional[str]], RateLimit] = {}
+_rate_limiters: dict[tuple[str, str], RateLimiter] = {}
+
+
+def configure_rate_limit(
+    provider: str,
+    model_name: Optional[str] = None,
+    requests_per_minute: Optional[float] = None,
+    tokens_per_minute: Optional[float] = None,
+) -> None:
+    """
+    Set the quota of a provider, or of one of its models.
+
+    A model's own quota takes precedence over the quota of its provider.
+    Rate limiters created before the call are replaced.
+
+    Args:
+        provider (str): The provider name, as registered in ModelFactory.
+        model_name (Optional[str]): The model name, or None for all models.
+        requests_per_minute (Optional[float]): Requests per minute, or None.
+        tokens_per_minute (Optional[float]): Tokens per minute, or None.
+    """
+    _rate_limits[(provider, model_name)] = RateLimit(
+        requests_per_minute, tokens_per_minute
+    )
+    for key in [key for key in _rate_limiters if key[0] == provider]:
+        del _rate_limiters[key]
+
+
+def get_rate_limiter(provider: str, model_name: str) -> RateLimiter:
+    """Return the rate limiter shared by all runnables of a provider and model."""
+    key = (provider, model_name)
+    if key not in _rate_limiters:
+        rate_limit = _rate_limits.get(key) or _rate_limits.get(
+            (provider, None), RateLimit()
+        )
+        _rate_limiters[key] = RateLimiter(rate_limit)
+    return _rate_limiters[key]
+
+
+def get_status_code(error: Exception) -> Optional[int]:
+    """Return the HTTP status code of a provider SDK error, if it has one."""
+    return getattr(error, "status_code", None) or getattr(
+        getattr(error, "response", None), "status_code", None
+    )
+
+
+def get_retry_after(error: Exception) -> Optional[float]:
+    """
+    Return how long to wait after a rate limit error.
+
+    Args:
+        error (Exception): An error raised by an LLM call.
+
+    Returns:
+        Optional[float]: Seconds to wait, from the Retry-After header of the
+        response if there is one, or None if the error is not a rate limit error.
+    """
+    if (
+        get_status_code(error) != RATE_LIMIT_STATUS_CODE
+        and type(error).__name__ not in RATE_LIMIT_ERROR_NAMES
+    ):
+        return None
+
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        retry_after = headers.get("retry-after")
+        if retry_after:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                retry_at = parsedate_to_datetime(retry_after).timestamp()
+                return max(0.0, retry_at - time.time())
+    except (TypeError, ValueError):
+        logger.warning(f"Ignoring unreadable Retry-After header: {headers}")
+    return DEFAULT_RETRY_AFTER
+
+
+class RateLimitedRunnable(Runnable[LanguageModelInput, BaseModel]):
+    """
+    Wraps a structured-output runnable with a RateLimiter.
+
+    The tokens of a request are estimated from the rendered prompt. A request
+    which fails with a rate limit error pauses the limiter for the time given
+    by the provider, and is then retried up to max_retries times.
+    """
+
+    def __init__(
+        self,
+        runnable: Runnable[LanguageModelInput, BaseModel],
+        limiter: RateLimiter,
+        max_retries: int = DEFAULT_RATE_LIMIT_RETRIES,
+    ):
+        self.runnable = runnable
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self._prompt_tokens = self._estimate_prompt_tokens(runnable)
+
+    @staticmethod
+    def _estimate_prompt_tokens(runnable: Runnable) -> int:
+        """Estimate the tokens of the prompt template around the input text."""
+        prompt = getattr(runnable, "first", None)
+        if not isinstance(prompt, BasePromptTemplate):
+            return 0
+        try:
+            return estimate_tokens(prompt.format(input=""))
+        except Exception as e:
+            logger.debug(f"Could not render the prompt to estimate its tokens: {e}")
+            return 0
+
+    def estimate_tokens(self, input: LanguageModelInput) -> int:
+        """Estimate the tokens of a request for the input."""
+        text = input if isinstance(input, str) else json.dumps(input, default=str)
+        return self._prompt_tokens + estimate_tokens(text) + ESTIMATED_OUTPUT_TOKENS
+
+    def _should_retry(self, error: Exception, attempt: int) -> bool:
+        retry_after = get_retry_after(error)
+        if retry_after is None or attempt == self.max_retries:
+            return False
+        logger.warning(f"Rate limited, pausing requests for {retry_after:.1f}s")
+        self.limiter.pause(retry_after)
+        return True
+
+    def invoke(
+        self,
+        input: LanguageModelInput,
+        config: Optional[RunnableConfig] = None,
+        **kwargs: Any,
+    ) -> BaseModel:
+        tokens = self.estimate_tokens(input)
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire_sync(tokens)
+            try:
+                return self.runnable.invoke(input, config, **kwargs)
+            except Exception as e:
+                if not self._should_retry(e, attempt):
+                    raise
+
+    async def ainvoke(
+        self,
+        input: LanguageModelInput,
+        config: Optional[RunnableConfig] = None,
+        **kwargs: Any,
+    ) -> BaseModel:
+        tokens = self.estimate_tokens(input)
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire(tokens)
+            try:
+                return await self.runnable.ainvoke(input, config, **kwargs)
+            except Exception as e:
+                if not self._should_retry(e, attempt):
+                    raise
+
+    def __repr__(self) -> str:
+        return f"RateLimitedRunnable({self.runnable!r})"
@@ -0,0 +1,459 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from functools import lru_cache
+from typing import Any, Callable, Optional, Type
+
+from langchain_core.language_models import LanguageModelInput
+from langchain_core.prompts import BasePromptTemplate
+from langchain_core.pydantic_v1 import BaseModel
+from langchain_core.runnables import Runnable, RunnableConfig
+
+from writing_feature_extractor.core.custom_exceptions import FileOperationError
+from writing_feature_extractor.features.writing_feature import WritingFeature
+from writing_feature_extractor.utils.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CACHE_DIR = ".feature_extractor_cache"
+DEFAULT_MAX_CACHE_SIZE_BYTES = 512 * 1024 * 1024
+CACHE_FILE_NAME = "results.sqlite3"
+# Number of cache hits whose access time is kept in memory before it is written
+MAX_PENDING_ACCESSES = 1024
+
+
+class ResultCache:
+    """
+    Persistent, content-addressed store for LLM results, backed by SQLite.
+
+    Entries are evicted in least-recently-used order once the total size of the
+    stored values exceeds max_size_bytes. The access times of cache hits are
+    kept in memory, and written together with the next stored value, every
+    MAX_PENDING_ACCESSES hits, or when the cache is closed, so that a hit does
+    not cost a write.
+
+    The methods block on SQLite; async code should use aget and aput. Close the
+    cache, or use it as a context manager, so the last access times are kept.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        max_size_bytes: int = DEFAULT_MAX_CACHE_SIZE_BYTES,
+    ):
+        self.cache_dir = cache_dir
+        self.max_size_bytes = max_size_bytes
+        self._lock = threading.Lock()
+
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._connection = sqlite3.connect(
+                os.path.join(cache_dir, CACHE_FILE_NAME), check_same_thread=False
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "size INTEGER NOT NULL, last_access INTEGER NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS results_last_access ON results (last_access)"
+            )
+            self._connection.commit()
+            total_size, last_access = self._connection.execute(
+                "SELECT COALESCE(SUM(size), 0), COALESCE(MAX(last_access), 0) FROM results"
+            ).fetchone()
+        except (OSError, sqlite3.Error) as e:
+            logger.error(f"Error opening result cache in {cache_dir}: {e}")
+            raise FileOperationError(
+                f"Could not open the result cache in {cache_dir}."
+            ) from e
+
+        self._total_size = total_size
+        self._access_counter = last_access
+        # Access times of cache hits which have not been written yet
+        self._pending_accesses: dict[str, int] = {}
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Build a content-addressed cache key from the given parts."""
+        return hashlib.sha256(
+            json.dumps(parts, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value for the key, or None on a miss."""
+        with self._lock:
+            try:
+                row = self._connection.execute(
+                    "SELECT value FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                self._access_counter += 1
+                self._pending_accesses[key] = self._access_counter
+                if len(self._pending_accesses) >= MAX_PENDING_ACCESSES:
+                    self._write_accesses()
+                    self._connection.commit()
+                return row[0]
+            except sqlite3.Error as e:
+                logger.warning(f"Error reading from result cache: {e}")
+                return None
+
+    def put(self, key: str, value: str) -> None:
+        """Store a value, evicting least recently used entries if needed."""
+        size = len(value.encode("utf-8"))
+        with self._lock:
+            try:
+                row = self._connection.execute(
+                    "SELECT size FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    self._total_size -= row[0]
+
+                self._write_accesses()
+                self._access_counter += 1
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO results (key, value, size, last_access) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, value, size, self._access_counter),
+                )
+                self._total_size += size
+                self._evict()
+                self._connection.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Error writing to result cache: {e}")
+
+    async def aget(self, key: str) -> Optional[str]:
+        """Return the cached value for the key, without blocking the event loop."""
+        return await asyncio.to_thread(self.get, key)
+
+    async def aput(self, key: str, value: str) -> None:
+        """Store a value, without blocking the event loop."""
+        await asyncio.to_thread(self.put, key, value)
+
+    def _write_accesses(self) -> None:
+        """Write the access times of the cache hits kept in memory."""
+        if not self._pending_accesses:
+            return
+        self._connection.executemany(
+            "UPDATE results SET last_access = ? WHERE key = ?",
+            [(access, key) for key, access in self._pending_accesses.items()],
+        )
+        self._pending_accesses.clear()
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache fits its size bound."""
+        if self._total_size <= self.max_size_bytes:
+            return
+
+        evicted_keys = []
+        for key, size in self._connection.execute(
+            "SELECT key, size FROM results ORDER BY last_access"
+        ):
+            if self._total_size <= self.max_size_bytes:
+                break
+            evicted_keys.append((key,))
+            self._total_size -= size
+
+        self._connection.executemany("DELETE FROM results WHERE key = ?", evicted_keys)
+        logger.debug(f"Evicted {len(evicted_keys)} entries from the result cache")
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connection.execute(
+                "SELECT COUNT(*) FROM results"
+            ).fetchone()
+            return count
+
+    def close(self) -> None:
+        with self._lock:
+            try:
+                self._write_accesses()
+                self._connection.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Error writing access times to result cache: {e}")
+            self._connection.close()
+
+    def __enter__(self) -> "ResultCache":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+@lru_cache(maxsize=None)
+def get_schema_json(PydanticModel: Type[BaseModel]) -> str:
+    """Return the JSON schema of a Pydantic model, which is computed once per model."""
+    return PydanticModel.schema_json(sort_keys=True)
+
+
+def describe_prompt(runnable: Runnable, with_partial_variables: bool = True) -> str:
+    """
+    Describe the prompt template at the head of a runnable sequence, so that
+    changes to the prompt produce different cache keys.
+
+    Without partial variables, the partials are described by their names only.
+    Partials such as the format instructions of a model without tool calling
+    hold the schema of all requested features, which is not part of the prompt
+    of a single feature.
+    """
+    # Look through wrappers such as RateLimitedRunnable
+    while not hasattr(runnable, "first") and hasattr(runnable, "runnable"):
+        runnable = runnable.runnable
+    prompt = getattr(runnable, "first", None)
+    if not isinstance(prompt, BasePromptTemplate):
+        return ""
+    if not with_partial_variables:
+        return prompt.partial(
+            **{name: "{" + name + "}" for name in prompt.partial_variables}
+        ).pretty_repr()
+    return prompt.pretty_repr() + json.dumps(
+        prompt.partial_variables, sort_keys=True, default=str
+    )
+
+
+class CachedRunnable(Runnable[LanguageModelInput, BaseModel]):
+    """
+    Wraps a structured-output runnable with a ResultCache.
+
+    Results are keyed by the input text, the prompt template, the provider and
+    model name, and the JSON schema of the Pydantic model.
+    """
+
+    def __init__(
+        self,
+        runnable: Runnable[LanguageModelInput, BaseModel],
+        cache: ResultCache,
+        provider: str,
+        model_name: str,
+        PydanticModel: Type[BaseModel],
+    ):
+        self.runnable = runnable
+        self.cache = cache
+        self.PydanticModel = PydanticModel
+        self._key_prefix = ResultCache.make_key(
+            describe_prompt(runnable),
+            provider,
+            model_name,
+            get_schema_json(PydanticModel),
+        )
+
+    def _get_key(self, input: LanguageModelInput) -> str:
+        text = input if isinstance(input, str) else json.dumps(input, default=str)
+        return ResultCache.make_key(self._key_prefix, text)
+
+    def _get_cached(self, key: str) -> Optional[BaseModel]:
+        cached = self.cache.get(key)
+        if cached is None:
+            return None
+        try:
+            return self.PydanticModel.parse_raw(cached)
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cached result: {e}")
+            return None
+
+    async def aget_cached(self, input: LanguageModelInput) -> Optional[BaseModel]:
+        """Return the cached result for the input, or None on a miss."""
+        return await asyncio.to_thread(self._get_cached, self._get_key(input))
+
+    async def astore(self, input: LanguageModelInput, result: BaseModel) -> None:
+        """Cache a result for the input which was obtained by another call."""
+        result = self.PydanticModel.parse_obj(result.dict())
+        await self.cache.aput(self._get_key(input), result.json())
+
+    def invoke(
+        self,
+        input: LanguageModelInput,
+        config: Optional[RunnableConfig] = None,
+        **kwargs: Any,
+    ) -> BaseModel:
+        key = self._get_key(input)
+        result = self._get_cached(key)
+        if result is not None:
+            logger.debug("Result cache hit")
+            return result
+
+        result = self.runnable.invoke(input, config, **kwargs)
+        self.cache.put(key, result.json())
+        return result
+
+    async def ainvoke(
+        self,
+        input: LanguageModelInput,
+        config: Optional[RunnableConfig] = None,
+        **kwargs: Any,
+    ) -> BaseModel:
+        key = self._get_key(input)
+        result = await asyncio.to_thread(self._get_cached, key)
+        if result is not None:
+            logger.debug("Result cache hit")
+            return result
+
+        result = await self.runnable.ainvoke(input, config, **kwargs)
+        await self.cache.aput(key, result.json())
+        return result
+
+    def __repr__(self) -> str:
+        return f"CachedRunnable({self.runnable!r})"
+
+
+class FeatureCachedRunnable(Runnable[LanguageModelInput, BaseModel]):
+    """
+    Caches LLM results per feature rather than per dynamic model.
+
+    Each feature value is keyed by the input text, the prompt template without
+    its partial variables, the provider and model name, and the feature's
+    label, description and enum levels. On a
+    partial hit, only the missing features are requested from the LLM, through
+    a reduced dynamic model holding just those fields. Adding a feature to the
+    configuration therefore only costs the new feature.
+    """
+
+    def __init__(
+        self,
+        feature_collectors: list[WritingFeature],
+        cache: ResultCache,
+        provider: str,
+        model_name: str,
+        PydanticModel: Type[BaseModel],
+        get_llm: Callable[
+            [list[WritingFeature]], Runnable[LanguageModelInput, BaseModel]
+        ],
+    ):
+        self.feature_collectors = feature_collectors
+        self.cache = cache
+        self.PydanticModel = PydanticModel
+        self._get_llm = get_llm
+        self._llms: dict[tuple[str, ...], Runnable[LanguageModelInput, BaseModel]] = {}
+
+        # The format instructions of the prompt depend on the selected features,
+        # so each feature is keyed on the prompt without them and on its own schema
+        prompt = describe_prompt(
+            self._get_llm_for(feature_collectors), with_partial_variables=False
+        )
+        self._key_prefixes = {
+            feature.pydantic_feature_label: ResultCache.make_key(
+                prompt,
+                provider,
+                model_name,
+                feature.pydantic_feature_label,
+                feature.pydantic_docstring,
+                *[str(level.value) for level in feature.pydantic_feature_type],
+            )
+            for feature in feature_collectors
+        }
+
+    def _get_llm_for(
+        self, features: list[WritingFeature]
+    ) -> Runnable[LanguageModelInput, BaseModel]:
+        labels = tuple(feature.pydantic_feature_label for feature in features)
+        if labels not in self._llms:
+            self._llms[labels] = self._get_llm(features)
+        return self._llms[labels]
+
+    def _get_key(self, input: LanguageModelInput, feature: WritingFeature) -> str:
+        text = input if isinstance(input, str) else json.dumps(input, default=str)
+        return ResultCache.make_key(
+            self._key_prefixes[feature.pydantic_feature_label], text
+        )
+
+    def _get_cached(
+        self, input: LanguageModelInput
+    ) -> tuple[dict[str, Any], list[WritingFeature]]:
+        """Split the features into cached values and features still missing."""
+        cached_values = {}
+        missing_features = []
+        for feature in self.feature_collectors:
+            cached = self.cache.get(self._get_key(input, feature))
+            if cached is None:
+                missing_features.append(feature)
+            else:
+                cached_values[feature.pydantic_feature_label] = json.loads(cached)
+        return cached_values, missing_features
+
+    def _store(
+        self,
+        input: LanguageModelInput,
+        missing_features: list[WritingFeature],
+        result: BaseModel,
+    ) -> dict[str, Any]:
+        values = json.loads(result.json())
+        for feature in missing_features:
+            self.cache.put(
+                self._get_key(input, feature),
+                json.dumps(values[feature.pydantic_feature_label]),
+            )
+        return values
+
+    async def aget_cached(self, input: LanguageModelInput) -> Optional[BaseModel]:
+        """Return the result for the input if all features are cached, or None."""
+        values, missing_features = await asyncio.to_thread(self._get_cached, input)
+        if missing_features:
+            return None
+        return self.PydanticModel.parse_obj(values)
+
+    async def astore(self, input: LanguageModelInput, result: BaseModel) -> None:
+        """Cache each feature of a result for the input which was obtained by
+        another call."""
+        await asyncio.to_thread(self._store, input, self.feature_collectors, result)
+
+    def invoke(
+        self,
+        input: LanguageModelInput,
+        config: Optional[RunnableConfig] = None,
+        **kwargs: Any,
+    ) -> BaseModel:
+        values, missing_features = self._get_cached(input)
+        if missing_features:
+            logger.debug(
+                f"Requesting {len(missing_features)} uncached features from the LLM"
+            )
+            llm = self._get_llm_for(missing_features)
+            result = llm.invoke(input, config, **kwargs)
+            values.update(self._store(input, missing_features, result))
+        return self.PydanticModel.parse_obj(values)
+
+    async def ainvoke(
+        self,
+        input: LanguageModelInput,
+        config: Optional[RunnableConfig] = None,
+        **kwargs: Any,
+    ) -> BaseModel:
+        values, missing_features = await asyncio.to_thread(self._get_cached, input)
+        if missing_features:
+            logger.debug(
+                f"Requesting {len(missing_features)} uncached features from the LLM"
+            )
+            llm = self._get_llm_for(missing_features)
+            result = await llm.ainvoke(input, config, **kwargs)
+            values.update(
+                await asyncio.to_thread(self._store, input, missing_features, result)
+            )
+        return self.PydanticModel.parse_obj(values)
+
+    def __repr__(self) -> str:
+        return f"FeatureCachedRunnable({self._get_llm_for(self.feature_collectors)!r})"
+
+
+async def aget_cached_result(
+    llm: Runnable[LanguageModelInput, BaseModel], input: LanguageModelInput
+) -> Optional[BaseModel]:
+    """Return the cached result of an LLM for the input, or None if there is
+    none or the LLM is not cached."""
+    if isinstance(llm, (CachedRunnable, FeatureCachedRunnable)):
+        return await llm.aget_cached(input)
+    return None
+
+
+async def acache_result(
+    llm: Runnable[LanguageModelInput, BaseModel],
+    input: LanguageModelInput,
+    result: BaseModel,
+) -> None:
+    """Cache a result for the input as if the LLM had returned it, if the LLM
+    is cached."""
+    if isinstance(llm, (CachedRunnable, FeatureCachedRunnable)):
+        await llm.astore(input, result)
@@ -0,0 +1,175 @@
+import asyncio
+import json
+import random
+from dataclasses import dataclass
+from enum import Enum
+
+import pydantic
+from langchain_core.exceptions import OutputParserException
+from langchain_core.language_models import LanguageModelInput
+from langchain_core.pydantic_v1 import BaseModel
+from langchain_core.pydantic_v1 import ValidationError as ValidationErrorV1
+from langchain_core.runnables import Runnable
+
+from writing_feature_extractor.core.custom_exceptions import OutputValidationError
+from writing_feature_extractor.core.rate_limiter import (
+    get_retry_after,
+    get_status_code,
+)
+from writing_feature_extractor.utils.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+SERVER_ERROR_STATUS_CODE = 500
+CONNECTION_ERROR_NAMES = (
+    "APIConnectionError",
+    "ConnectError",
+    "ConnectionError",
+    "ServiceUnavailable",
+    "InternalServerError",
+    "OverloadedError",
+)
+VALIDATION_ERRORS = (
+    OutputValidationError,
+    OutputParserException,
+    ValidationErrorV1,
+    pydantic.ValidationError,
+    json.JSONDecodeError,
+)
+
+
+class ErrorKind(str, Enum):
+    """Classification of an error raised by an LLM call."""
+
+    RATE_LIMIT = "rate_limit"
+    TIMEOUT = "timeout"
+    SERVER = "server"
+    VALIDATION = "validation"
+    FATAL = "fatal"
+
+
+# Rate limit errors are not retried here: RateLimitedRunnable retries them
+# after pausing the shared rate limiter for the Retry-After time
+RETRYABLE_ERROR_KINDS = frozenset(
+    {ErrorKind.TIMEOUT, ErrorKind.SERVER, ErrorKind.VALIDATION}
+)
+
+
+@dataclass
+class RetryPolicy:
+    """
+    How often and how long to retry a failed LLM call.
+
+    Attributes:
+        max_attempts (int): Maximum number of calls for transient errors.
+        max_validation_attempts (int): Maximum number of calls when the output
+            does not match the feature model. A model which answers in the wrong
+            format tends to repeat it, so these are retried fewer times.
+        base_delay (float): Upper bound of the delay before the first retry.
+        max_delay (float): Upper bound of the delay before any retry.
+    """
+
+    max_attempts: int = 4
+    max_validation_attempts: int = 2
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+
+def classify_error(error: BaseException) -> ErrorKind:
+    """
+    Classify an error raised by an LLM call.
+
+    Provider SDK errors are recognized by their HTTP status code or class
+    name, so that no provider package needs to be imported.
+
+    Args:
+        error (BaseException): The error.
+
+    Returns:
+        ErrorKind: The kind of the error. FATAL and RATE_LIMIT errors are not
+        retried by ainvoke_with_retry.
+    """
+    if get_retry_after(error) is not None:
+        return ErrorKind.RATE_LIMIT
+    name = type(error).__name__
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError)) or "Timeout" in name:
+        return ErrorKind.TIMEOUT
+    if isinstance(error, VALIDATION_ERRORS):
+        return ErrorKind.VALIDATION
+    status_code = get_status_code(error)
+    if (
+        isinstance(status_code, int) and status_code >= SERVER_ERROR_STATUS_CODE
+    ) or name in CONNECTION_ERROR_NAMES:
+        return ErrorKind.SERVER
+    return ErrorKind.FATAL
+
+
+def get_backoff_delay(
+    attempt: int, policy: RetryPolicy = DEFAULT_RETRY_POLICY
+) -> float:
+    """
+    Return the delay before a retry, with exponential backoff and full jitter.
+
+    The delay is drawn uniformly below an exponentially growing bound, so that
+    concurrent requests which failed together do not retry together.
+
+    Args:
+        attempt (int): The number of the failed attempt, starting at 0.
+        policy (RetryPolicy): The retry policy.
+
+    Returns:
+        float: Seconds to wait.
+    """
+    return random.uniform(0, min(policy.max_delay, policy.base_delay * 2**attempt))
+
+
+async def ainvoke_with_retry(
+    llm: Runnable[LanguageModelInput, BaseModel],
+    text: str,
+    policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+) -> BaseModel:
+    """
+    Invoke an LLM, retrying transient failures with backoff.
+
+    An empty result is treated as a validation failure. Rate limit errors
+    are raised at once, since the rate limited runnable has already retried
+    them.
+
+    Args:
+        llm (Runnable[LanguageModelInput, BaseModel]): The language model.
+        text (str): The input text.
+        policy (RetryPolicy): The retry policy.
+
+    Returns:
+        BaseModel: The result of the LLM.
+
+    Raises:
+        Exception: The error of the last attempt, if the error is fatal or the
+            attempts are exhausted.
+    """
+    attempt = 0
+    while True:
+        try:
+            result = await llm.ainvoke(input=text)
+            if result is None:
+                raise OutputValidationError("The LLM returned no structured output.")
+            return result
+        except Exception as e:
+            kind = classify_error(e)
+            max_attempts = (
+                policy.max_validation_attempts
+                if kind == ErrorKind.VALIDATION
+                else policy.max_attempts
+            )
+            if kind not in RETRYABLE_ERROR_KINDS or attempt + 1 >= max_attempts:
+                raise
+            delay = get_backoff_delay(attempt, policy)
+            logger.warning(
+                f"LLM call failed with a {kind.value} error ({e}), "
+                f"retrying in {delay:.1f}s (attempt {attempt + 2}/{max_attempts})"
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
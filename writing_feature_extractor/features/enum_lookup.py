@@ -0,0 +1,60 @@
+import re
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Optional
+
+NON_WORD_PATTERN = re.compile(r"[\W_]+")
+
+
+def normalize_label(value: str) -> str:
+    """Normalize a string for comparison with enum values and names, ignoring
+    case, spacing and punctuation."""
+    return NON_WORD_PATTERN.sub(" ", value).strip().lower()
+
+
+class EnumLookup:
+    """
+    Precomputed index of the members of a feature enum.
+
+    Maps each member, each value and the normalized form of each value and
+    member name to the position of the member in the enum, so that extracted
+    results are converted with a dictionary lookup instead of scanning the
+    enum.
+    """
+
+    def __init__(self, enum_type: type[Enum]):
+        self.members: tuple[Enum, ...] = tuple(enum_type)
+        self.values: list[Any] = [member.value for member in self.members]
+        self._indices: dict[Any, int] = {}
+        # Position of each member, by normalized value and member name
+        self.normalized: dict[str, int] = {}
+        for index, member in enumerate(self.members):
+            self._indices.setdefault(member, index)
+            self._indices.setdefault(member.value, index)
+            for label in (str(member.value), member.name):
+                self.normalized.setdefault(normalize_label(label), index)
+
+    def index_of(self, value: Any) -> Optional[int]:
+        """
+        Return the position of a member in the enum.
+
+        Args:
+            value (Any): A member, a value, or a string matching a value or a
+                member name except for case, spacing and punctuation.
+
+        Returns:
+            Optional[int]: The position of the member, or None if there is no match.
+        """
+        try:
+            index = self._indices.get(value)
+        except TypeError:
+            return None
+        if index is None and isinstance(value, str):
+            index = self.normalized.get(normalize_label(value))
+        return index
+
+
+@lru_cache(maxsize=None)
+def get_enum_lookup(enum_type: type[Enum]) -> EnumLookup:
+    """Return the lookup table of an enum, which is built once per enum."""
+    return EnumLookup(enum_type)
@@ -14,9 +14,7 @@ class MoodFeature(WritingFeature):
         result_collection_mode: ResultCollectionMode = ResultCollectionMode.FIELD_NAME,
     ):
         # This feature is only available by adding field name results
-        self.result_collection_mode = ResultCollectionMode.FIELD_NAME
-
-    results: list[int] = []
+        super().__init__(ResultCollectionMode.FIELD_NAME)
 
     class Mood(str, Enum):
         """Mood of the text. The mood MUST be one of these selections. If the mood is not listed, choose the closest semantic match."""
@@ -0,0 +1,170 @@
+from collections.abc import Sequence
+from typing import Any, Iterator, Optional
+
+import numpy as np
+
+from writing_feature_extractor.features.enum_lookup import get_enum_lookup
+from writing_feature_extractor.features.result_collection_mode import (
+    ResultCollectionMode,
+)
+from writing_feature_extractor.features.writing_feature import WritingFeature
+
+RESULT_DTYPE = np.int16
+# Cell value of a text unit whose result has not been collected
+MISSING = np.iinfo(RESULT_DTYPE).min
+DEFAULT_CAPACITY = 256
+
+
+class ResultMatrix:
+    """
+    Columnar store of the results of an extraction run.
+
+    The results are kept in one preallocated integer array of shape
+    (text units x features), which grows by doubling. Cells without a result
+    hold MISSING. Features collected as numbers store their number
+    representation directly. Features collected by field name store a code
+    into a per-feature code table, which starts with the members of the
+    feature enum, so the code of a member is its position, and is extended
+    with any other value collected, such as a failed result.
+
+    Creating the matrix attaches a FeatureResults view to each feature as its
+    results, so add_result works unchanged. An extraction run adds the values
+    of each text unit with add_row, and the CSV writers read whole columns.
+    """
+
+    def __init__(
+        self,
+        feature_collectors: list[WritingFeature],
+        capacity: int = DEFAULT_CAPACITY,
+    ):
+        self.feature_collectors = list(feature_collectors)
+        self.data = np.full(
+            (max(1, capacity), len(self.feature_collectors)), MISSING, RESULT_DTYPE
+        )
+        self.lengths = [0] * len(self.feature_collectors)
+        # Code table of each feature collected by field name, None otherwise
+        self.code_tables: list[Optional[list[Any]]] = []
+        self._codes: list[dict[Any, int]] = []
+        for index, feature in enumerate(self.feature_collectors):
+            if feature.result_collection_mode == ResultCollectionMode.FIELD_NAME:
+                members = list(get_enum_lookup(feature.pydantic_feature_type).members)
+                self.code_tables.append(members)
+                self._codes.append({member: i for i, member in enumerate(members)})
+            else:
+                self.code_tables.append(None)
+                self._codes.append({})
+            feature.results = FeatureResults(self, index)
+
+    def __len__(self) -> int:
+        return max(self.lengths, default=0)
+
+    @property
+    def capacity(self) -> int:
+        return self.data.shape[0]
+
+    def column(self, index: int) -> np.ndarray:
+        """Return a view of the collected codes or numbers of one feature."""
+        return self.data[: self.lengths[index], index]
+
+    def encode(self, index: int, value: Any) -> int:
+        """Return the cell value of a result of a feature."""
+        table = self.code_tables[index]
+        if table is None:
+            return int(value)
+        codes = self._codes[index]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(table)
+            table.append(value)
+        return code
+
+    def decode(self, index: int, cell: int) -> Any:
+        """Return the result of a feature represented by a cell value."""
+        table = self.code_tables[index]
+        return cell if table is None else table[cell]
+
+    def decode_column(self, index: int, rows: slice = slice(None)) -> list[Any]:
+        """Return the results of a feature for a slice of the collected text units."""
+        cells = self.column(index)[rows].tolist()
+        table = self.code_tables[index]
+        return cells if table is None else [table[cell] for cell in cells]
+
+    def append(self, index: int, value: Any) -> None:
+        """Add the result of the next text unit of a feature."""
+        row = self.lengths[index]
+        if row >= self.capacity:
+            self.reserve(2 * self.capacity)
+        self.data[row, index] = self.encode(index, value)
+        self.lengths[index] = row + 1
+
+    def add_row(self, values: list[Any]) -> None:
+        """
+        Add the results of the next text unit.
+
+        Args:
+            values (list[Any]): The extracted value of each feature, in order.
+                Each value is converted by its feature according to its
+                collection mode.
+        """
+        for index, (feature, value) in enumerate(zip(self.feature_collectors, values)):
+            self.append(index, feature.convert_result(value))
+
+    def reserve(self, capacity: int) -> None:
+        """Grow the matrix to hold at least `capacity` text units."""
+        if capacity <= self.capacity:
+            return
+        data = np.full((capacity, self.data.shape[1]), MISSING, RESULT_DTYPE)
+        data[: self.capacity] = self.data
+        self.data = data
+
+    def clear(self, index: Optional[int] = None) -> None:
+        """Remove the results of one feature, or of all features."""
+        indices = range(len(self.lengths)) if index is None else [index]
+        for i in indices:
+            self.data[: self.lengths[i], i] = MISSING
+            self.lengths[i] = 0
+
+
+class FeatureResults(Sequence):
+    """
+    The results of one feature, as a view of a column of a ResultMatrix.
+
+    Behaves like the list of results of the feature: results are appended one
+    at a time, and reading gives the same values as were added, except that
+    a string equal to a member of a str enum reads as the member.
+    """
+
+    def __init__(self, matrix: ResultMatrix, index: int):
+        self.matrix = matrix
+        self.index = index
+
+    @property
+    def array(self) -> np.ndarray:
+        """The collected codes or numbers, as a view of the matrix column."""
+        return self.matrix.column(self.index)
+
+    def __len__(self) -> int:
+        return self.matrix.lengths[self.index]
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self.matrix.decode_column(self.index, i)
+        row = range(len(self))[i]
+        return self.matrix.decode(self.index, self.matrix.data[row, self.index].item())
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.matrix.decode_column(self.index))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def append(self, value: Any) -> None:
+        self.matrix.append(self.index, value)
+
+    def clear(self) -> None:
+        self.matrix.clear(self.index)
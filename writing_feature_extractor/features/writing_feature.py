@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from enum import Enum
 
+from writing_feature_extractor.features.enum_lookup import get_enum_lookup
 from writing_feature_extractor.features.result_collection_mode import (
     ResultCollectionMode,
 )
@@ -57,27 +58,39 @@ class WritingFeature(ABC):
 
     @property
     def graph_y_tick_labels(self) -> list[str]:
-        return [e.value for e in self.pydantic_feature_type]
+        return list(get_enum_lookup(self.pydantic_feature_type).values)
 
     @property
     def graph_y_ticks(self) -> list[int]:
-        return list(range(len(self.pydantic_feature_type)))
+        return list(range(len(get_enum_lookup(self.pydantic_feature_type).members)))
 
     def get_int_for_enum(self, enum_value: Enum) -> int:
         """Get the integer equivalent for an enum. This is a workaround
         for an odd issue with graphing in which using the integer value of
         an enum, or using the enum value itself, resulted in the graph being
-        displayed out of order and incorrectly."""
-        return list(self.pydantic_feature_type).index(enum_value)
+        displayed out of order and incorrectly.
 
-    def add_result(self, enum_value: Enum | str) -> None:
-        """For results collection. Add a result to the results list."""
+        Raises:
+            ValueError: If the value is not a member of the feature enum.
+        """
+        index = get_enum_lookup(self.pydantic_feature_type).index_of(enum_value)
+        if index is None:
+            raise ValueError(f"{enum_value!r} is not a level of this feature")
+        return index
+
+    def convert_result(self, enum_value: Enum | str) -> int | Enum | str:
+        """Convert an extracted value to its representation in the results,
+        according to the result collection mode."""
         if self.result_collection_mode == ResultCollectionMode.NUMBER_REPRESENTATION:
-            if enum_value in (item.value for item in self.pydantic_feature_type):
-                self.results.append(self.get_int_for_enum(enum_value))
-            else:
-                self.results.append(-1)
+            try:
+                return self.get_int_for_enum(enum_value)
+            except ValueError:
+                return -1
         elif self.result_collection_mode == ResultCollectionMode.FIELD_NAME:
-            self.results.append(enum_value)
+            return enum_value
         else:
             raise ValueError("Invalid result collection mode")
+
+    def add_result(self, enum_value: Enum | str) -> None:
+        """For results collection. Add a result to the results list."""
+        self.results.append(self.convert_result(enum_value))
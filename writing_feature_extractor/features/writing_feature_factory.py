@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Dict, Tuple, Type, Union
+from typing import Dict, Hashable, Tuple, Type, Union
 
 from langchain_core.pydantic_v1 import BaseModel, Field, create_model
 
@@ -51,6 +51,11 @@ class WritingFeatureFactory:
 
     This class provides methods to generate custom Pydantic models and feature collectors
     for various writing features, including both predefined and generic features.
+
+    The dynamic enums and models are memoized, so a long-lived process which
+    sees the same feature configurations again reuses the same classes, and
+    everything keyed by them, such as the LLM runnables of ModelFactory. The
+    feature collectors hold the results of a run, and are always created anew.
     """
 
     FEATURE_MAP: Dict[AvailableWritingFeatures, Type[WritingFeature]] = {
@@ -67,6 +72,9 @@ class WritingFeatureFactory:
         AvailableWritingFeatures.AESTHEMOS_RELAXATION: AesthemosRelaxation,
     }
 
+    _dynamic_enums: Dict[Tuple[str, Tuple[str, ...]], Type[Enum]] = {}
+    _dynamic_models: Dict[Tuple[Hashable, ...], type[BaseModel]] = {}
+
     @staticmethod
     def get_dynamic_model(
         features: list[FeatureConfigData],
@@ -90,7 +98,6 @@ class WritingFeatureFactory:
             raise ModelError("No features provided for dynamic model creation")
 
         try:
-            selected_features = dict()
             feature_collectors = []
             for feature_config in features:
                 feature_class = WritingFeatureFactory.FEATURE_MAP.get(
@@ -111,24 +118,10 @@ class WritingFeatureFactory:
                 logger.info(
                     f"Adding feature: [{current_feature.pydantic_feature_label}] to the dynamic model"
                 )
-
-                # For some reason, using Union with string with the feature type actually does a
-                # better job for feature extraction than just using the feature type. The extracted
-                # feature still has the type of the enum.
-                selected_features[current_feature.pydantic_feature_label] = (
-                    Union[current_feature.pydantic_feature_type, str],
-                    Field(
-                        ...,
-                        description=current_feature.pydantic_docstring,
-                    ),
-                )
-
                 feature_collectors.append(current_feature)
 
-            DynamicFeatureModel = create_model(
-                "DynamicFeatureModel",
-                __doc__="Features contained in the creative writing text",
-                **selected_features,
+            DynamicFeatureModel = WritingFeatureFactory.create_dynamic_model(
+                feature_collectors
             )
 
             return feature_collectors, DynamicFeatureModel
@@ -137,6 +130,57 @@ class WritingFeatureFactory:
             logger.error(f"Error creating dynamic model: {e}")
             raise FeatureExtractorError("Error creating dynamic model") from e
 
+    @staticmethod
+    def create_dynamic_model(
+        feature_collectors: list[WritingFeature],
+    ) -> type[BaseModel]:
+        """
+        Create a dynamic Pydantic model with one field per writing feature.
+
+        This is also used to build reduced models holding only a subset of the
+        configured features.
+
+        Args:
+            feature_collectors (list[WritingFeature]): The writing features to include.
+
+        Returns:
+            type[BaseModel]: The dynamically created Pydantic model class. The
+            same class is returned for features of the same labels, types and
+            descriptions.
+        """
+        key = tuple(
+            (
+                feature.pydantic_feature_label,
+                feature.pydantic_feature_type,
+                feature.pydantic_docstring,
+            )
+            for feature in feature_collectors
+        )
+        DynamicFeatureModel = WritingFeatureFactory._dynamic_models.get(key)
+        if DynamicFeatureModel is not None:
+            return DynamicFeatureModel
+
+        selected_features = dict()
+        for feature in feature_collectors:
+            # For some reason, using Union with string with the feature type actually does a
+            # better job for feature extraction than just using the feature type. The extracted
+            # feature still has the type of the enum.
+            selected_features[feature.pydantic_feature_label] = (
+                Union[feature.pydantic_feature_type, str],
+                Field(
+                    ...,
+                    description=feature.pydantic_docstring,
+                ),
+            )
+
+        DynamicFeatureModel = create_model(
+            "DynamicFeatureModel",
+            __doc__="Features contained in the creative writing text",
+            **selected_features,
+        )
+        WritingFeatureFactory._dynamic_models[key] = DynamicFeatureModel
+        return DynamicFeatureModel
+
     @staticmethod
     def create_generic_feature(
         feature_config: FeatureConfigData,
@@ -181,11 +225,15 @@ class WritingFeatureFactory:
             values (list[str]): List of string values for the Enum.
 
         Returns:
-            Enum: A dynamically created Enum class.
+            Enum: A dynamically created Enum class. The same class is returned
+            for the same name and values.
         """
-        return Enum(
-            enum_name,
-            {value.upper(): value for value in values},
-            type=str,
-            module=__name__,
-        )
+        key = (enum_name, tuple(values))
+        if key not in WritingFeatureFactory._dynamic_enums:
+            WritingFeatureFactory._dynamic_enums[key] = Enum(
+                enum_name,
+                {value.upper(): value for value in values},
+                type=str,
+                module=__name__,
+            )
+        return WritingFeatureFactory._dynamic_enums[key]
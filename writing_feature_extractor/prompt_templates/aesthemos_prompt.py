@@ -1,7 +1,7 @@
-from langchain_core.prompts import PromptTemplate
+from langchain_core.prompts import ChatPromptTemplate, PromptTemplate
 
-aesthemos_prompt = PromptTemplate.from_template(
-    template="""Context: You will act in the role of a participant in this study.
+# Static study instructions, sent first so that providers can cache them as a prefix
+AESTHEMOS_INSTRUCTIONS = """Context: You will act in the role of a participant in this study.
 Thank you for taking part in this study. You will be reading several passages of text and then responding to a survey about your emotional reactions to each passage. Please follow these instructions carefully:
 
 Read the provided passage of text thoroughly. Take your time to absorb the content and pay attention to your emotional reactions as you read.
@@ -24,10 +24,19 @@ Repeat this process for each passage of text provided.
 Please answer as honestly as possible. There are no right or wrong answers; we are interested in your genuine emotional responses to the text.
 
 Thank you for your participation in this study. Your responses will contribute to our understanding of emotional responses to written text.
+"""
 
-Following is the passage to which you will respond:
+# Per-unit part of the prompt
+AESTHEMOS_PASSAGE_TEMPLATE = """Following is the passage to which you will respond:
 -----
 {input}
 -----
 """
+
+aesthemos_prompt = PromptTemplate.from_template(
+    template=AESTHEMOS_INSTRUCTIONS + "\n" + AESTHEMOS_PASSAGE_TEMPLATE
+)
+
+aesthemos_chat_prompt = ChatPromptTemplate.from_messages(
+    [("system", AESTHEMOS_INSTRUCTIONS), ("human", AESTHEMOS_PASSAGE_TEMPLATE)]
 )
@@ -41,35 +41,145 @@ def save_results_to_csv(
         and the number of entries in text_metrics.
     """
     try:
-        with open(filename, "w", newline="") as csvfile:
-            fieldnames = (
-                ["Unit", "Length"]
-                + [fc.y_level_label for fc in feature_collectors]
-                + [metric for metric in text_metrics[0]]
-                + ["ColorMaps"]
-            )
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-
-            writer.writeheader()
-            for i, text in enumerate(text_units, 1):
-                row = {"Unit": i, "Length": len(text.split())}
-                for fc in feature_collectors:
-                    row[fc.y_level_label] = (
-                        fc.results[i - 1] if i <= len(fc.results) else ""
-                    )
-
-                for metric in text_metrics[0].keys():
-                    row[metric] = text_metrics[i - 1][metric]
-
-                # Add color maps
-                color_maps = {
-                    fc.y_level_label: fc.graph_colors for fc in feature_collectors
-                }
-                row["ColorMaps"] = json.dumps(color_maps)
-
-                writer.writerow(row)
+        with IncrementalCSVWriter(feature_collectors, filename) as writer:
+            writer.append_rows(text_units, text_metrics)
 
         logger.info(f"Results saved to {filename}")
     except Exception as e:
         logger.error(f"Error saving results to CSV: {e}")
         raise FileOperationError(f"Failed to save results to {filename}.") from e
+
+
+class IncrementalCSVWriter:
+    """
+    Writes the results of each text unit to a CSV file as soon as it is available.
+
+    The columns are the same as those of save_results_to_csv. The header is
+    written once, together with the first row, since the metric columns are
+    taken from the metrics of the first text unit. Later rows are appended,
+    so a file which grows with every section is never rewritten.
+
+    Rows are flushed to disk every `flush_interval` rows, and when the writer
+    is flushed or closed.
+
+    Usage:
+        with IncrementalCSVWriter(feature_collectors, "results.csv") as writer:
+            writer.write_row(text, feature_values, metrics)
+    """
+
+    def __init__(
+        self,
+        feature_collectors: List[WritingFeature],
+        filename: str = DEFAULT_CSV_FILE,
+        flush_interval: int = 1,
+    ):
+        self.feature_collectors = feature_collectors
+        self.filename = filename
+        self.flush_interval = max(1, flush_interval)
+        self.rows_written = 0
+        self._file = None
+        self._writer = None
+        self._metric_names: list[str] = []
+        self._color_maps = json.dumps(
+            {fc.y_level_label: fc.graph_colors for fc in feature_collectors}
+        )
+
+    def open(self) -> "IncrementalCSVWriter":
+        """
+        Open the CSV file for writing, truncating any previous content.
+
+        Raises:
+            FileOperationError: If the file cannot be opened.
+        """
+        try:
+            self._file = open(self.filename, "w", newline="")
+        except OSError as e:
+            logger.error(f"Error opening CSV file {self.filename}: {e}")
+            raise FileOperationError(f"Failed to open {self.filename}.") from e
+        return self
+
+    def write_row(
+        self, text: str, feature_values: list[Any], metrics: dict[str, Any]
+    ) -> None:
+        """
+        Write the results of the next text unit.
+
+        Args:
+            text (str): The text unit.
+            feature_values (list[Any]): One result per feature collector, in order.
+            metrics (dict[str, Any]): The text metrics of the text unit.
+
+        Raises:
+            FileOperationError: If the row cannot be written.
+        """
+        try:
+            if self._writer is None:
+                self._metric_names = list(metrics)
+                fieldnames = (
+                    ["Unit", "Length"]
+                    + [fc.y_level_label for fc in self.feature_collectors]
+                    + self._metric_names
+                    + ["ColorMaps"]
+                )
+                self._writer = csv.DictWriter(self._file, fieldnames=fieldnames)
+                self._writer.writeheader()
+
+            self.rows_written += 1
+            row = {"Unit": self.rows_written, "Length": len(text.split())}
+            for fc, value in zip(self.feature_collectors, feature_values):
+                row[fc.y_level_label] = value
+            for metric in self._metric_names:
+                row[metric] = metrics[metric]
+            row["ColorMaps"] = self._color_maps
+
+            self._writer.writerow(row)
+            if self.rows_written % self.flush_interval == 0:
+                self._file.flush()
+        except (OSError, csv.Error) as e:
+            logger.error(f"Error writing row to CSV file {self.filename}: {e}")
+            raise FileOperationError(f"Failed to write to {self.filename}.") from e
+
+    def append_rows(
+        self, text_units: List[str], text_metrics: list[dict[str, Any]]
+    ) -> None:
+        """
+        Write the rows of the text units which have not been written yet.
+
+        The feature values are taken from the results of the feature collectors,
+        one column slice per feature, so this can be called after each section
+        with all text units and metrics collected so far. Missing results are
+        written as empty values.
+
+        Args:
+            text_units (List[str]): All text units collected so far.
+            text_metrics (list[dict[str, Any]]): The text metrics of each text unit.
+
+        Raises:
+            FileOperationError: If a row cannot be written.
+        """
+        start = self.rows_written
+        columns = [
+            fc.results[start : len(text_units)] for fc in self.feature_collectors
+        ]
+        for offset, i in enumerate(range(start, len(text_units))):
+            feature_values = [
+                column[offset] if offset < len(column) else "" for column in columns
+            ]
+            self.write_row(text_units[i], feature_values, text_metrics[i])
+
+    def flush(self) -> None:
+        """Flush the rows written so far to disk."""
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self) -> None:
+        """Close the CSV file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "IncrementalCSVWriter":
+        return self.open()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -0,0 +1,207 @@
+import argparse
+import mmap
+import re
+from functools import lru_cache
+from typing import Iterable, Optional
+
+import textstat
+
+from writing_feature_extractor.core.custom_exceptions import FileOperationError
+from writing_feature_extractor.utils.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_SYLLABLE_CACHE_SIZE = 65536
+WORD_NORMALIZATION_PATTERN = re.compile(r"[^\w\s]")
+# Pronunciation variants of a word in CMUdict, such as "READ(1)"
+VARIANT_SUFFIX_PATTERN = re.compile(r"\(\d+\)$")
+
+
+class SyllableTable:
+    """
+    Precomputed word to syllable count table, memory-mapped from disk.
+
+    The table is a UTF-8 text file with one "word<TAB>syllables" line per
+    word, sorted by the bytes of the line. Lookups binary-search the mapped
+    file, so the table is never loaded into memory as a whole and the pages
+    of a large table are shared between the worker processes.
+
+    Usage:
+        table = SyllableTable("syllables.tsv")
+        table.get("beautiful")  # 3
+    """
+
+    def __init__(self, path: str):
+        """
+        Memory-map a syllable table.
+
+        Args:
+            path (str): Path of the table file, as written by build_syllable_table.
+
+        Raises:
+            FileOperationError: If the table cannot be opened.
+        """
+        self.path = path
+        self._map: Optional[mmap.mmap] = None
+        try:
+            with open(path, "rb") as f:
+                if f.seek(0, 2) > 0:
+                    self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except OSError as e:
+            logger.error(f"Error opening syllable table {path}: {e}")
+            raise FileOperationError(
+                f"Could not open the syllable table {path}."
+            ) from e
+
+    def get(self, word: str) -> Optional[int]:
+        """
+        Return the syllable count of a word, or None if it is not in the table.
+
+        Args:
+            word (str): A lowercase word without punctuation.
+
+        Returns:
+            Optional[int]: The syllable count of the word.
+        """
+        if self._map is None:
+            return None
+
+        key = word.encode("utf-8") + b"\t"
+        low, high = 0, len(self._map)
+        while low < high:
+            middle = (low + high) // 2
+            start = self._map.rfind(b"\n", 0, middle) + 1
+            end = self._map.find(b"\n", start)
+            if end == -1:
+                end = len(self._map)
+            line = self._map[start:end]
+            if line.startswith(key):
+                return int(line[len(key) :])
+            if line < key:
+                low = end + 1
+            else:
+                high = start
+        return None
+
+    def close(self) -> None:
+        """Unmap the table file."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+_syllable_table: Optional[SyllableTable] = None
+
+
+def load_syllable_table(path: Optional[str]) -> None:
+    """
+    Use a precomputed syllable table for count_word_syllables.
+
+    Words missing from the table are still counted with textstat's pyphen
+    dictionary. Also used as the initializer of the metrics worker processes.
+
+    Args:
+        path (Optional[str]): Path of the table file, or None to use no table.
+
+    Raises:
+        FileOperationError: If the table cannot be opened.
+    """
+    global _syllable_table
+    table = SyllableTable(path) if path else None
+    if _syllable_table is not None:
+        _syllable_table.close()
+    _syllable_table = table
+    count_word_syllables.cache_clear()
+    if table is not None:
+        logger.info(f"Loaded syllable table {path}")
+
+
+def get_syllable_table_path() -> Optional[str]:
+    """Return the path of the loaded syllable table, or None."""
+    return _syllable_table.path if _syllable_table is not None else None
+
+
+def count_word_syllables_with_pyphen(word: str) -> int:
+    """Count the syllables of a word as textstat's syllable_count does."""
+    return len(textstat.textstat.pyphen.positions(word)) + 1
+
+
+@lru_cache(maxsize=DEFAULT_SYLLABLE_CACHE_SIZE)
+def count_word_syllables(word: str) -> int:
+    """
+    Count the syllables of a lowercase word without punctuation.
+
+    The count is memoized in a bounded LRU cache, and looked up in the loaded
+    syllable table before falling back to hyphenation with pyphen.
+
+    Args:
+        word (str): A lowercase word without punctuation.
+
+    Returns:
+        int: The syllable count, as textstat's syllable_count gives it.
+    """
+    if _syllable_table is not None:
+        syllables = _syllable_table.get(word)
+        if syllables is not None:
+            return syllables
+    return count_word_syllables_with_pyphen(word)
+
+
+def normalize_word(word: str) -> str:
+    """Normalize a word of a word list as count_text tokenizes words."""
+    word = VARIANT_SUFFIX_PATTERN.sub("", word.strip())
+    return WORD_NORMALIZATION_PATTERN.sub("", word.lower())
+
+
+def build_syllable_table(words: Iterable[str], path: str) -> int:
+    """
+    Write a syllable table for the given words.
+
+    The syllable counts are computed with textstat's pyphen dictionary, so the
+    readability scores are the same with or without the table. Any word list
+    can be used; for a CMUdict file, the first column of each line is used.
+
+    Args:
+        words (Iterable[str]): The words to include.
+        path (str): Path of the table file to write.
+
+    Returns:
+        int: The number of words in the table.
+
+    Raises:
+        FileOperationError: If the table cannot be written.
+    """
+    normalized = {normalize_word(word) for word in words}
+    lines = sorted(
+        f"{word}\t{count_word_syllables_with_pyphen(word)}\n".encode("utf-8")
+        for word in normalized
+        if word and len(word.split()) == 1
+    )
+    try:
+        with open(path, "wb") as f:
+            f.writelines(lines)
+    except OSError as e:
+        logger.error(f"Error writing syllable table {path}: {e}")
+        raise FileOperationError(f"Could not write the syllable table {path}.") from e
+
+    logger.info(f"Wrote {len(lines)} words to syllable table {path}")
+    return len(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Build a syllable table from a word list, such as CMUdict."
+    )
+    parser.add_argument("word_list", help="Text file with one word per line")
+    parser.add_argument("output", help="Syllable table file to write")
+    args = parser.parse_args()
+
+    with open(args.word_list, encoding="utf-8", errors="ignore") as f:
+        build_syllable_table(
+            (
+                line.split()[0]
+                for line in f
+                if line.strip() and not line.startswith(";;;")
+            ),
+            args.output,
+        )
@@ -1,12 +1,26 @@
+import math
 import re
-import textstat
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator
+
+import numpy as np
 from writing_feature_extractor.utils.logger_config import get_logger
+from writing_feature_extractor.utils.syllables import count_word_syllables
 
 logger = get_logger(__name__)
 
 MININUM_WORDS_PER_PARAGRAPH = 8
 NUMBER_OF_CHARACTERS_TO_SHOW_WHEN_COMBINING = 20
 
+# Tokenization rules and English constants of textstat's readability formulas
+SENTENCE_PATTERN = re.compile(r"\b[^.!?]+[.!?]*", re.UNICODE)
+PUNCTUATION_PATTERN = re.compile(r"[^\w\s]")
+MAXIMUM_WORDS_IN_IGNORED_SENTENCE = 2
+FLESCH_READING_EASE_BASE = 206.835
+FLESCH_READING_EASE_SENTENCE_LENGTH = 1.015
+FLESCH_READING_EASE_SYLLABLES_PER_WORD = 84.6
+
 
 def calculate_dialogue_percentage(text: str) -> float:
     """
@@ -37,50 +51,190 @@ def calculate_dialogue_percentage(text: str) -> float:
 
 
 def combine_short_strings(
-    strings: list[str], minimum_words: int = MININUM_WORDS_PER_PARAGRAPH
+    strings: Iterable[str], minimum_words: int = MININUM_WORDS_PER_PARAGRAPH
 ) -> list[str]:
     """
     Combine short strings with the next string in the list if they contain fewer than the specified minimum words.
 
     This is useful for consolidating text segments that are too small for an LLM to make accurate inferences
-    during feature extraction.
+    during feature extraction. Empty strings are removed. The input list is not modified.
 
     Args:
-        strings (list[str]): A list of strings to process.
+        strings (Iterable[str]): A list of strings to process.
         minimum_words (int, optional): The minimum number of words a string should contain.
                                        Defaults to MININUM_WORDS_PER_PARAGRAPH.
 
     Returns:
-        list[str]: A new list with short strings combined. If an error occurs, returns the original list.
+        list[str]: A new list with short strings combined.
+    """
+    return list(iter_combine_short_strings(strings, minimum_words))
+
+
+def iter_combine_short_strings(
+    strings: Iterable[str], minimum_words: int = MININUM_WORDS_PER_PARAGRAPH
+) -> Iterator[str]:
+    """
+    Lazily combine short strings with the following strings.
+
+    Streaming form of combine_short_strings, e.g. for the lines of a section:
+    strings are consumed one at a time, and only the pending short strings are
+    held in memory. Each string is split into words once, and the pending
+    strings are joined once, so the run time is linear in the total length.
+
+    Args:
+        strings (Iterable[str]): The strings to process.
+        minimum_words (int, optional): The minimum number of words a string should contain.
+                                       Defaults to MININUM_WORDS_PER_PARAGRAPH.
+
+    Yields:
+        str: The combined strings.
     """
+    pending = []
+    pending_words = 0
     for string in strings:
         if len(string) == 0:
-            logger.info("Removing empty string from list of strings")
-            strings.remove(string)
+            logger.debug("Removing empty string from list of strings")
+            continue
+        if pending:
+            logger.debug(
+                f"Combining ...[{pending[-1][:NUMBER_OF_CHARACTERS_TO_SHOW_WHEN_COMBINING]}] and [{string[:NUMBER_OF_CHARACTERS_TO_SHOW_WHEN_COMBINING]}...]"
+            )
+        pending.append(string)
+        pending_words += len(string.split())
+        if pending_words >= minimum_words:
+            yield " ".join(pending)
+            pending = []
+            pending_words = 0
 
-    try:
-        i = 0
-        while i < len(strings) - 1:
-            if (len(strings[i].split()) < minimum_words) and (len(strings[i]) > 0):
-                logger.info(
-                    f"Combining ...[{strings[i][:NUMBER_OF_CHARACTERS_TO_SHOW_WHEN_COMBINING]}] and [{strings[i + 1][:NUMBER_OF_CHARACTERS_TO_SHOW_WHEN_COMBINING]}...]"
-                )
-                strings[i + 1] = strings[i] + " " + strings[i + 1]
-                strings.pop(i)
-            else:
-                i += 1
-        return strings
-    except Exception as e:
-        logger.error(
-            f"Failure while combining short strings: {e}. Returning original list of strings"
-        )
-        return strings
+    if pending:
+        yield " ".join(pending)
+
+
+@dataclass
+class TextCounts:
+    """Counts of a text from which all text statistics are derived."""
+
+    characters: int
+    words: int
+    sentences: int
+    syllables: int
+    dialogue_characters: int
+
+
+def count_text(text: str) -> TextCounts:
+    """
+    Count the words, sentences, syllables and dialogue characters of a text in one pass.
+
+    The counts follow the rules of textstat's lexicon_count, sentence_count
+    and syllable_count, so the readability scores derived from them match
+    textstat's: sentences of two words or fewer are not counted, punctuation
+    is removed from words, and syllables are counted with textstat's pyphen
+    dictionary, through the memoized count_word_syllables.
+
+    Tolerance: the counts are identical to textstat's for text whose lowercase
+    form has the same word characters, which includes all English text. For
+    other scripts, the word and sentence counts may differ for the tokens
+    affected by lowercasing.
+
+    Args:
+        text (str): The input text to analyze.
+
+    Returns:
+        TextCounts: The counts of the text.
+    """
+    lowered = text.lower()
+    stripped_pieces = []
+    sentences = 0
+    ignored_sentences = 0
+    position = 0
+    for match in SENTENCE_PATTERN.finditer(lowered):
+        # The text between two sentences holds no word characters
+        stripped = PUNCTUATION_PATTERN.sub("", lowered[position : match.end()])
+        stripped_pieces.append(stripped)
+        position = match.end()
+        sentences += 1
+        if len(stripped.split()) <= MAXIMUM_WORDS_IN_IGNORED_SENTENCE:
+            ignored_sentences += 1
+
+    # Joining the pieces keeps words which contain sentence punctuation, like
+    # "3.5", as one word, as when the punctuation is removed from the whole text
+    words = "".join(stripped_pieces).split()
+    syllables = sum(
+        count_word_syllables(word) * occurrences
+        for word, occurrences in Counter(words).items()
+    )
+
+    return TextCounts(
+        characters=len(text),
+        words=len(words),
+        sentences=max(1, sentences - ignored_sentences),
+        syllables=syllables,
+        dialogue_characters=count_dialogue_characters(text),
+    )
+
+
+def count_dialogue_characters(text: str) -> int:
+    """Count the characters within pairs of double quotes, including the quotes."""
+    dialogue_characters = 0
+    start = text.find('"')
+    while start != -1:
+        end = text.find('"', start + 1)
+        if end == -1:
+            break
+        dialogue_characters += end - start + 1
+        start = text.find('"', end + 1)
+    return dialogue_characters
+
+
+def legacy_round(number: float, points: int = 0) -> float:
+    """Round half away from zero, as textstat does."""
+    p = 10**points
+    return float(math.floor((number * p) + math.copysign(0.5, number))) / p
+
+
+def get_statistics_from_counts(counts: TextCounts) -> dict[str]:
+    """
+    Derive the text statistics of get_text_statistics from the counts of a text.
+
+    Raises:
+        ZeroDivisionError: If the text has no words.
+    """
+    sentence_length = legacy_round(counts.words / counts.sentences, 1)
+    syllables_per_word = legacy_round(counts.syllables / counts.words, 1)
+
+    dialogue_percentage = (
+        (counts.dialogue_characters / counts.characters) * 100
+        if counts.characters > 0
+        else 0
+    )
+
+    return {
+        "dialogue_percentage": f"{dialogue_percentage:.2f}%",
+        "readability_ease": legacy_round(
+            FLESCH_READING_EASE_BASE
+            - float(FLESCH_READING_EASE_SENTENCE_LENGTH * sentence_length)
+            - float(FLESCH_READING_EASE_SYLLABLES_PER_WORD * syllables_per_word),
+            2,
+        ),
+        "readability_grade": legacy_round(
+            float(0.39 * sentence_length) + float(11.8 * syllables_per_word) - 15.59,
+            1,
+        ),
+        "sentence_count": counts.sentences,
+        "word_count": counts.words,
+        "syllable_count": counts.syllables,
+        "average_words_per_sentence": counts.words / counts.sentences,
+        "average_syllables_per_word": counts.syllables / counts.words,
+    }
 
 
 def get_text_statistics(text: str) -> dict[str]:
     """
     Calculate various statistics about the given text.
 
+    The statistics are derived from a single counting pass over the text (see
+    count_text) and match those of the corresponding textstat functions.
+
     Args:
         text (str): The input text to analyze.
 
@@ -99,22 +253,115 @@ def get_text_statistics(text: str) -> dict[str]:
         Returns an empty dictionary if an error occurs during calculation.
     """
     try:
-        text_statistics = dict()
-        text_statistics["dialogue_percentage"] = calculate_dialogue_percentage(text)
-        text_statistics["readability_ease"] = textstat.flesch_reading_ease(text)
-        text_statistics["readability_grade"] = textstat.flesch_kincaid_grade(text)
-        text_statistics["sentence_count"] = textstat.sentence_count(text)
-        text_statistics["word_count"] = textstat.lexicon_count(text, removepunct=True)
-        text_statistics["syllable_count"] = textstat.syllable_count(text)
-        text_statistics["average_words_per_sentence"] = (
-            text_statistics["word_count"] / text_statistics["sentence_count"]
-        )
-        text_statistics["average_syllables_per_word"] = (
-            text_statistics["syllable_count"] / text_statistics["word_count"]
-        )
+        text_statistics = get_statistics_from_counts(count_text(text))
 
         logger.debug(f"Text statistics: {text_statistics}")
         return text_statistics
     except Exception as e:
         logger.error(f"Error calculating text statistics: {e}")
         return dict()
+
+
+class MetricsBatch:
+    """
+    Columnar text metrics of several text units.
+
+    Each statistic of get_text_statistics is one column, with one entry per
+    text unit. The columns can be passed to pandas.DataFrame directly, and
+    rows() gives the per-unit dictionaries used by the CSV writers.
+    """
+
+    def __init__(self, columns: dict[str, np.ndarray]):
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.columns["word_count"])
+
+    def row(self, index: int) -> dict[str, Any]:
+        """Return the statistics of one text unit, as get_text_statistics does."""
+        if self.columns["word_count"][index] == 0:
+            # get_text_statistics has no statistics for text without words
+            return {}
+        return {name: column[index].item() for name, column in self.columns.items()}
+
+    def rows(self) -> list[dict[str, Any]]:
+        """Return the statistics of every text unit."""
+        return [self.row(i) for i in range(len(self))]
+
+    @classmethod
+    def concatenate(cls, batches: list["MetricsBatch"]) -> "MetricsBatch":
+        """Join the metrics of consecutive chunks of text units, in order."""
+        if not batches:
+            return compute_metrics_batch([])
+        if len(batches) == 1:
+            return batches[0]
+        return cls(
+            {
+                name: np.concatenate([batch.columns[name] for batch in batches])
+                for name in batches[0].columns
+            }
+        )
+
+
+def split_into_chunks(text_units: list[str], chunk_size: int) -> list[list[str]]:
+    """Split text units into consecutive chunks of at most chunk_size units."""
+    chunk_size = max(1, chunk_size)
+    return [
+        text_units[i : i + chunk_size] for i in range(0, len(text_units), chunk_size)
+    ]
+
+
+def legacy_round_array(numbers: np.ndarray, points: int = 0) -> np.ndarray:
+    """Vectorized legacy_round."""
+    p = 10**points
+    return np.floor((numbers * p) + np.copysign(0.5, numbers)) / p
+
+
+def compute_metrics_batch(text_units: list[str]) -> MetricsBatch:
+    """
+    Calculate the statistics of get_text_statistics for many text units at once.
+
+    Each text unit is counted once with count_text. The readability formulas
+    and averages are then computed over arrays of counts. Undefined values,
+    for text units without words, are NaN.
+
+    Args:
+        text_units (list[str]): The text units to analyze.
+
+    Returns:
+        MetricsBatch: The columnar statistics, in the order of the text units.
+    """
+    counts = [count_text(text) for text in text_units]
+    characters = np.array([c.characters for c in counts], dtype=np.int64)
+    words = np.array([c.words for c in counts], dtype=np.int64)
+    sentences = np.array([c.sentences for c in counts], dtype=np.int64)
+    syllables = np.array([c.syllables for c in counts], dtype=np.int64)
+    dialogue = np.array([c.dialogue_characters for c in counts], dtype=np.int64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        words_per_sentence = words / sentences
+        syllables_per_word = np.where(words > 0, syllables / words, np.nan)
+        dialogue_percentage = np.where(characters > 0, dialogue / characters * 100, 0.0)
+    sentence_length = legacy_round_array(words_per_sentence, 1)
+    rounded_syllables_per_word = legacy_round_array(syllables_per_word, 1)
+
+    columns = {
+        "dialogue_percentage": np.array(
+            [f"{percentage:.2f}%" for percentage in dialogue_percentage]
+        ),
+        "readability_ease": legacy_round_array(
+            FLESCH_READING_EASE_BASE
+            - FLESCH_READING_EASE_SENTENCE_LENGTH * sentence_length
+            - FLESCH_READING_EASE_SYLLABLES_PER_WORD * rounded_syllables_per_word,
+            2,
+        ),
+        "readability_grade": legacy_round_array(
+            0.39 * sentence_length + 11.8 * rounded_syllables_per_word - 15.59, 1
+        ),
+        "sentence_count": sentences,
+        "word_count": words,
+        "syllable_count": syllables,
+        "average_words_per_sentence": words_per_sentence,
+        "average_syllables_per_word": syllables_per_word,
+    }
+    return MetricsBatch(columns)
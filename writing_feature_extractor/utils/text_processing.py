@@ -1,9 +1,17 @@
-from typing import List
+import os
+from enum import Enum
+from glob import glob
+from typing import Iterable, Iterator, List
 from writing_feature_extractor.core.custom_exceptions import FileOperationError
 from writing_feature_extractor.utils.logger_config import get_logger
-from writing_feature_extractor.utils.text_metrics import combine_short_strings
+from writing_feature_extractor.utils.text_metrics import (
+    combine_short_strings,
+    iter_combine_short_strings,
+)
 
 SECTION_DELIMITER = "***"
+READ_CHUNK_SIZE = 64 * 1024
+TEXT_FILE_PATTERN = "*.txt"
 logger = get_logger(__name__)
 
 
@@ -41,6 +49,56 @@ def split_into_sections(text: str) -> List[str]:
     return text.split(SECTION_DELIMITER)
 
 
+def iter_sections(file_path: str, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Lazily read the sections of a text file.
+
+    The file is read in chunks, so only the current section is held in memory.
+    The sections are the same as those of split_into_sections(load_text(file_path)).
+
+    Args:
+        file_path (str): The path to the file to be read.
+        chunk_size (int): Number of characters read at a time.
+
+    Yields:
+        str: The sections of the text.
+
+    Raises:
+        FileOperationError: If there's an error reading the file.
+    """
+    try:
+        with open(file_path) as f:
+            remainder = ""
+            while chunk := f.read(chunk_size):
+                *sections, remainder = (remainder + chunk).split(SECTION_DELIMITER)
+                yield from sections
+            yield remainder
+    except (OSError, ValueError) as e:
+        # ValueError covers a file which cannot be decoded (UnicodeDecodeError)
+        logger.error(f"Error loading text from {file_path}: {e}")
+        raise FileOperationError("Could not load text from the given file/path.") from e
+
+
+def iter_lines(text: str) -> Iterator[str]:
+    """
+    Lazily split a text into lines.
+
+    Yields the same lines as splitting the text on newlines, without building a
+    list, so a section can feed iter_combine_short_strings one line at a time.
+
+    Args:
+        text (str): The text to split.
+
+    Yields:
+        str: The lines of the text, without the newline characters.
+    """
+    start = 0
+    while (end := text.find("\n", start)) != -1:
+        yield text[start:end]
+        start = end + 1
+    yield text[start:]
+
+
 def split_into_paragraphs(section: str) -> List[str]:
     """
     Split a section of text into paragraphs and combine short strings.
@@ -53,3 +111,84 @@ def split_into_paragraphs(section: str) -> List[str]:
     """
     paragraphs = section.split("\n")
     return combine_short_strings(paragraphs)
+
+
+class ExtractionMode(Enum):
+    PARAGRAPH = "paragraph"
+    SECTION = "section"
+
+
+def get_extraction_mode(mode: ExtractionMode | str) -> ExtractionMode:
+    """
+    Convert a mode name to an ExtractionMode.
+
+    Raises:
+        ValueError: If an invalid extraction mode is provided.
+    """
+    try:
+        return ExtractionMode(mode)
+    except ValueError:
+        raise ValueError(f"Invalid mode: {mode}. Must be a valid ExtractionMode.")
+
+
+def split_into_text_units(sections: list[str], mode: ExtractionMode | str) -> list[str]:
+    """
+    Split the sections into the text units processed in the given mode.
+
+    Args:
+        sections (list[str]): List of text sections.
+        mode (ExtractionMode | str): The extraction mode (PARAGRAPH or SECTION).
+
+    Returns:
+        list[str]: The paragraphs or the (combined) sections of the text.
+    """
+    if get_extraction_mode(mode) == ExtractionMode.PARAGRAPH:
+        return [
+            paragraph
+            for section in sections
+            for paragraph in combine_short_strings(section.split("\n"))
+        ]
+    return combine_short_strings(sections, 50)
+
+
+def iter_text_units(
+    sections: Iterable[str], mode: ExtractionMode | str
+) -> Iterator[str]:
+    """
+    Lazily split the sections into the text units processed in the given mode.
+
+    Streaming counterpart of split_into_text_units: sections are consumed one
+    at a time, so the sections may come from a lazy reader such as iter_sections.
+
+    Args:
+        sections (Iterable[str]): The text sections.
+        mode (ExtractionMode | str): The extraction mode (PARAGRAPH or SECTION).
+
+    Yields:
+        str: The paragraphs or the (combined) sections of the text.
+    """
+    if get_extraction_mode(mode) == ExtractionMode.PARAGRAPH:
+        for section in sections:
+            yield from iter_combine_short_strings(iter_lines(section))
+    else:
+        yield from iter_combine_short_strings(sections, 50)
+
+
+def find_text_files(path: str) -> List[str]:
+    """
+    Find the input text files of a multi-file run.
+
+    Args:
+        path (str): A directory, whose .txt files are used, or a glob pattern.
+
+    Returns:
+        List[str]: The matching files, sorted by path.
+    """
+    pattern = os.path.join(path, TEXT_FILE_PATTERN) if os.path.isdir(path) else path
+    return sorted(file for file in glob(pattern) if os.path.isfile(file))
+
+
+def get_output_csv_file(file_path: str, output_dir: str) -> str:
+    """Return the path of the CSV file with the results of an input file."""
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    return os.path.join(output_dir, f"{name}.csv")